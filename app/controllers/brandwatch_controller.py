@@ -1,22 +1,228 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import math
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
 from datetime import datetime
 from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from app.interfaces.base import IController
-from app.presenters.brandwatch_presenter import BrandwatchPresenter
+from app.presenters.brandwatch_presenter import BrandwatchPresenter, MENTION_FIELDS, StreamInterrupted
 from app.core.brandwatch_service import BrandwatchService
+from app.core.rate_limiter import RateLimitTimeout
+from app.core.resilience import BrandwatchAPIError
+from app.core.aggregation import BUCKETS, aggregate_batch
+from app.core.config import get_settings
+from app.core.mention_store import to_naive_utc
+from app.models.brandwatch import AggregateParams, MentionParams, NoParams, ProjectParams, SearchParams
+from app.models.mention_batch import MentionBatch
+from app.core.scheduler import PrefetchScheduler
+from app.core.subscriptions import Subscriber, SubscriptionHub
+
+logger = logging.getLogger(__name__)
+
+# Read-only actions that may be combined in one batch request, with their parameters
+BATCH_ACTIONS: Dict[str, Type[BaseModel]] = {
+    "get_projects": NoParams,
+    "get_project": ProjectParams,
+    "get_queries": ProjectParams,
+    "get_mentions": MentionParams,
+    "get_aggregates": AggregateParams,
+    "search_mentions": SearchParams
+}
+
+async def _iterate(items: List[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+def _parse_mention_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated fields= value and return it in output order"""
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - MENTION_FIELDS.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mention fields: {', '.join(sorted(unknown))}; allowed: {', '.join(MENTION_FIELDS)}"
+        )
+    return [field for field in MENTION_FIELDS if field in requested]
+
+def _parse_date_range(
+    start_date: Optional[str],
+    end_date: Optional[str],
+    required: bool = False
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Parse optional ISO start/end dates, rejecting a missing (if required) or reversed range"""
+    if required and (not start_date or not end_date):
+        raise HTTPException(status_code=400, detail="Start date and end date are required")
+    start = datetime.fromisoformat(start_date) if start_date else None
+    end = datetime.fromisoformat(end_date) if end_date else None
+    if start is not None and end is not None and to_naive_utc(start) >= to_naive_utc(end):
+        raise HTTPException(status_code=400, detail="Start date must be before end date")
+    return start, end
+
+def _parse_batch_params(model: Type[BaseModel], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate one batch operation's params against its action's model; keys
+    the action does not take are rejected. Returns request_data values, with
+    dates as ISO strings like the routes pass them
+    """
+    names = getattr(model, "model_fields", None) or model.__fields__
+    unknown = set(params) - set(names)
+    if unknown:
+        raise ValueError(f"Unknown params: {', '.join(sorted(unknown))}; allowed: {', '.join(names) or 'none'}")
+    try:
+        parsed = model(**params)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        ))
+    values = {name: getattr(parsed, name) for name in names}
+    return {name: value.isoformat() if isinstance(value, datetime) else value for name, value in values.items()}
+
+async def _prefetch(items: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """
+    Await the first item before the response starts, so upstream errors
+    still map to a status code; a later failure ends the iterator with a
+    StreamInterrupted item instead of raising mid-response
+    """
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        return _iterate([])
+
+    async def rest() -> AsyncIterator[Any]:
+        yield first
+        try:
+            async for item in items:
+                yield item
+        except (BrandwatchAPIError, RateLimitTimeout) as e:
+            logger.warning("Mention stream ended early: %s", e)
+            yield StreamInterrupted(str(e))
+
+    return rest()
 
 class BrandwatchController(IController):
     def __init__(self, presenter: BrandwatchPresenter):
+        settings = get_settings()
         self.presenter = presenter
         self.service = BrandwatchService()
+        self.scheduler = PrefetchScheduler(self.service)
+        self.subscriptions = SubscriptionHub(self.service)
+        self.batch_max_operations = settings.brandwatch_batch_max_operations
+        self.batch_max_parallel = settings.brandwatch_batch_max_parallel
+        self.mention_batches = settings.brandwatch_mention_batches
 
     async def handle_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle request for Brandwatch operations
         """
+        try:
+            return await self._dispatch(request_data)
+        except RateLimitTimeout as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        except BrandwatchAPIError as e:
+            # Pass through statuses the client can act on; anything else is a bad gateway
+            status = e.status if e.status in (404, 429, 503, 504) else 502
+            headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after is not None else None
+            raise HTTPException(status_code=status, detail=str(e), headers=headers)
+        except SQLAlchemyError as e:
+            # Reads fall back to Brandwatch; syncs and sync state need the store itself
+            logger.warning("Mention store unavailable: %s", e)
+            raise HTTPException(status_code=503, detail="Local mention store is unavailable")
+
+    async def handle_batch(
+        self,
+        operations: List[Dict[str, Any]],
+        max_parallel: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several read actions concurrently and return one result per operation
+        """
+        if len(operations) > self.batch_max_operations:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {self.batch_max_operations} operations are allowed per batch"
+            )
+        semaphore = asyncio.Semaphore(min(max_parallel or self.batch_max_parallel, self.batch_max_parallel))
+
+        async def run(operation: Dict[str, Any]) -> Dict[str, Any]:
+            action = operation.get("action")
+            if action not in BATCH_ACTIONS:
+                return {"action": action, "status": 400, "error": "Invalid action"}
+            try:
+                params = _parse_batch_params(BATCH_ACTIONS[action], operation.get("params") or {})
+            except ValueError as e:
+                return {"action": action, "status": 400, "error": str(e)}
+            async with semaphore:
+                try:
+                    data = await self.handle_request({**params, "action": action})
+                except HTTPException as e:
+                    return {"action": action, "status": e.status_code, "error": e.detail}
+                except ValueError as e:
+                    return {"action": action, "status": 400, "error": str(e)}
+                except Exception as e:
+                    return {"action": action, "status": 502, "error": str(e)}
+            return {"action": action, "status": 200, "data": data}
+
+        return await asyncio.gather(*(run(operation) for operation in operations))
+
+    def _encode_columns(
+        self,
+        mentions: List[Any],
+        columnar_format: str,
+        fields: Optional[List[str]] = None
+    ) -> bytes:
+        """Mentions as one columnar body in the negotiated binary format"""
+        return self.presenter.encode_columns(MentionBatch.from_mentions(mentions), columnar_format, fields)
+
+    async def _stream_events(self, subscriber: Subscriber, fields: Optional[List[str]]) -> AsyncIterator[bytes]:
+        """Server-sent events for one subscriber until the client disconnects"""
+        try:
+            yield self.presenter.sse_event("subscribed", {
+                "project_id": subscriber.key[0],
+                "query_id": subscriber.key[1],
+                "poll_interval_seconds": self.subscriptions.poll_interval
+            })
+            while True:
+                batch = await subscriber.next_batch(self.subscriptions.heartbeat)
+                if batch is None:
+                    yield b": keepalive\n\n"
+                    continue
+                if batch["mentions"] or batch["dropped"]:
+                    yield self.presenter.sse_event("mentions", {
+                        "mentions": self.presenter.transform_list(batch["mentions"], fields),
+                        "dropped": batch["dropped"]
+                    })
+                if batch["error"]:
+                    yield self.presenter.sse_event("upstream_error", {"error": batch["error"]})
+        finally:
+            await self.subscriptions.unsubscribe(subscriber)
+
+    async def _dispatch(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         action = request_data.get("action")
         
-        if action == "get_projects":
+        if action == "get_rate_limit_status":
+            return await self.service.get_rate_limit_status()
+
+        elif action == "get_scheduler_status":
+            return self.scheduler.status()
+
+        elif action == "get_subscription_status":
+            return self.subscriptions.status()
+
+        elif action == "get_upstream_status":
+            return self.service.get_upstream_status()
+
+        elif action == "get_cache_stats":
+            return self.service.get_cache_stats()
+
+        elif action == "invalidate_cache":
+            removed = self.service.invalidate_cache(request_data.get("project_id"))
+            return {"invalidated": removed}
+
+        elif action == "get_projects":
             projects = await self.service.get_projects()
             return self.presenter.transform_list(projects)
             
@@ -40,17 +246,166 @@ class BrandwatchController(IController):
                 raise HTTPException(status_code=400, detail="Project ID is required")
                 
             query_id = request_data.get("query_id")
-            start_date = request_data.get("start_date")
-            end_date = request_data.get("end_date")
+            start_date, end_date = _parse_date_range(request_data.get("start_date"), request_data.get("end_date"))
             limit = request_data.get("limit", 100)
-            
+            if limit > 1000:
+                raise HTTPException(status_code=400, detail="Limit must not exceed 1000")
+            fields = _parse_mention_fields(request_data.get("fields"))
+            columnar_format = request_data.get("columnar_format")
+            batches = request_data.get("batches")
+
+            if batches if batches is not None else self.mention_batches:
+                batch = await self.service.get_mention_batch(
+                    project_id=project_id,
+                    query_id=query_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    limit=limit
+                )
+                if columnar_format:
+                    return self.presenter.encode_columns(batch, columnar_format, fields)
+                return self.presenter.transform_batch(batch, fields)
+
             mentions = await self.service.get_mentions(
                 project_id=project_id,
                 query_id=query_id,
-                start_date=datetime.fromisoformat(start_date) if start_date else None,
-                end_date=datetime.fromisoformat(end_date) if end_date else None,
-                limit=limit
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+                # Columnar output needs whole models; its fields are picked per column instead
+                fields=[MENTION_FIELDS[field][1] for field in fields] if fields and not columnar_format else None
+            )
+            if columnar_format:
+                return self._encode_columns(mentions, columnar_format, fields)
+            return self.presenter.transform_list(mentions, fields)
+
+        elif action == "stream_mentions":
+            project_id = request_data.get("project_id")
+            if not project_id:
+                raise HTTPException(status_code=400, detail="Project ID is required")
+
+            start_date, end_date = _parse_date_range(request_data.get("start_date"), request_data.get("end_date"))
+            mentions = await _prefetch(self.service.iter_mentions(
+                project_id=project_id,
+                query_id=request_data.get("query_id"),
+                start_date=start_date,
+                end_date=end_date,
+                page_size=request_data.get("page_size", 1000),
+                max_results=request_data.get("max_results")
+            ))
+            if request_data.get("format") == "json":
+                return self.presenter.stream_json_array(mentions)
+            return self.presenter.stream_ndjson(mentions)
+
+        elif action == "subscribe_mentions":
+            project_id = request_data.get("project_id")
+            query_id = request_data.get("query_id")
+            if not project_id or not query_id:
+                raise HTTPException(status_code=400, detail="Project ID and query ID are required")
+            if not self.subscriptions.enabled:
+                raise HTTPException(status_code=409, detail="Mention subscriptions are disabled")
+            fields = _parse_mention_fields(request_data.get("fields"))
+            try:
+                subscriber = self.subscriptions.subscribe(project_id, query_id)
+            except RuntimeError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            return self._stream_events(subscriber, fields)
+
+        elif action == "export_mentions":
+            project_id = request_data.get("project_id")
+            if not project_id:
+                raise HTTPException(status_code=400, detail="Project ID is required")
+            start_date, end_date = _parse_date_range(
+                request_data.get("start_date"), request_data.get("end_date"), required=True
+            )
+
+            mentions = await self.service.fetch_mentions_sharded(
+                project_id=project_id,
+                query_id=request_data.get("query_id"),
+                start_date=start_date,
+                end_date=end_date,
+                shards=request_data.get("shards", 4),
+                max_parallel=request_data.get("max_parallel")
+            )
+            columnar_format = request_data.get("columnar_format")
+            if columnar_format:
+                return await asyncio.to_thread(self._encode_columns, mentions, columnar_format)
+            if request_data.get("format") == "json":
+                return self.presenter.stream_json_array(_iterate(mentions))
+            return self.presenter.stream_ndjson(_iterate(mentions))
+
+        elif action == "get_aggregates":
+            project_id = request_data.get("project_id")
+            if not project_id:
+                raise HTTPException(status_code=400, detail="Project ID is required")
+            start_date, end_date = _parse_date_range(
+                request_data.get("start_date"), request_data.get("end_date"), required=True
+            )
+            bucket = request_data.get("bucket", "day")
+            if bucket not in BUCKETS:
+                raise HTTPException(status_code=400, detail="Invalid bucket")
+
+            batch = await self.service.get_mention_window(
+                project_id=project_id,
+                query_id=request_data.get("query_id"),
+                start_date=start_date,
+                end_date=end_date
+            )
+            return await asyncio.to_thread(aggregate_batch, batch, bucket)
+
+        elif action == "search_mentions":
+            project_id = request_data.get("project_id")
+            if not project_id:
+                raise HTTPException(status_code=400, detail="Project ID is required")
+            if self.service.search_index is None:
+                raise HTTPException(status_code=409, detail="Search index is disabled")
+            limit = request_data.get("limit", 50)
+            if limit > 1000:
+                raise HTTPException(status_code=400, detail="Limit must not exceed 1000")
+            fields = _parse_mention_fields(request_data.get("fields"))
+            filters = {
+                name: request_data[name]
+                for name in ("query_id", "source", "language", "sentiment", "author")
+                if request_data.get(name) is not None
+            }
+            if filters.get("sentiment") == "unknown":
+                filters["sentiment"] = None
+            start_date, end_date = _parse_date_range(request_data.get("start_date"), request_data.get("end_date"))
+            result = await asyncio.to_thread(
+                self.service.search_mentions,
+                project_id,
+                request_data.get("q"),
+                filters,
+                start_date,
+                end_date,
+                request_data.get("offset", 0),
+                limit
+            )
+            result["results"] = self.presenter.transform_list(result["results"], fields)
+            return result
+
+        elif action == "sync_mentions":
+            project_id = request_data.get("project_id")
+            query_id = request_data.get("query_id")
+            if not project_id or not query_id:
+                raise HTTPException(status_code=400, detail="Project ID and query ID are required")
+            if self.service.store is None:
+                raise HTTPException(status_code=409, detail="Mention store is disabled")
+            start_date = request_data.get("start_date")
+            return await self.service.sync_mentions(
+                project_id=project_id,
+                query_id=query_id,
+                start_date=datetime.fromisoformat(start_date) if start_date else None
             )
-            return self.presenter.transform_list(mentions)
+
+        elif action == "get_sync_state":
+            project_id = request_data.get("project_id")
+            query_id = request_data.get("query_id")
+            if not project_id or not query_id:
+                raise HTTPException(status_code=400, detail="Project ID and query ID are required")
+            state = await self.service.get_sync_state(project_id, query_id)
+            if state is None:
+                raise HTTPException(status_code=404, detail="Query has not been synced")
+            return state
             
         raise HTTPException(status_code=400, detail="Invalid action") 
\ No newline at end of file
@@ -1,9 +1,7 @@
 from typing import Any, Dict
-from fastapi import Depends, HTTPException
+from fastapi import HTTPException
 from app.interfaces.base import IController
 from app.presenters.user_presenter import UserPresenter
-from app.models.user import User
-from app.core.security import get_current_user
 
 class UserController(IController):
     def __init__(self, presenter: UserPresenter):
@@ -16,7 +14,9 @@ class UserController(IController):
         action = request_data.get("action")
         
         if action == "get_current_user":
-            current_user = await get_current_user()
+            current_user = request_data.get("current_user")
+            if current_user is None:
+                raise HTTPException(status_code=401, detail="Not authenticated")
             return self.presenter.transform_data(current_user)
         
         raise HTTPException(status_code=400, detail="Invalid action") 
\ No newline at end of file
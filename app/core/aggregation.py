@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+import numpy as np
+from app.models.mention_batch import MentionBatch
+
+# Bucket width and offset (seconds) so buckets start at midnight UTC, weeks on Monday
+BUCKETS = {
+    "hour": (3600, 0),
+    "day": (86400, 0),
+    "week": (7 * 86400, 3 * 86400)
+}
+PERCENTILES = (50, 90, 99)
+
+def _metric_summary(values: np.ndarray) -> Dict[str, Any]:
+    present = values[~np.isnan(values)]
+    if present.size == 0:
+        return {"sum": 0, "mean": None, **{f"p{p}": None for p in PERCENTILES}}
+    quantiles = np.percentile(present, PERCENTILES)
+    return {
+        "sum": int(present.sum()),
+        "mean": float(present.mean()),
+        **{f"p{p}": float(q) for p, q in zip(PERCENTILES, quantiles)}
+    }
+
+def _labels(batch: MentionBatch, name: str, missing: str):
+    """Sorted labels of an encoded column and each row's index into them"""
+    categories = np.array([value if value is not None else missing for value in batch.categories[name]], dtype=str)
+    labels, remap = np.unique(categories, return_inverse=True)
+    return labels, remap[batch.codes[name]]
+
+def aggregate_batch(batch: MentionBatch, bucket: str = "day") -> Dict[str, Any]:
+    """Time-bucketed counts, sentiment breakdowns and reach/engagement stats"""
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unsupported bucket: {bucket}")
+    size, offset = BUCKETS[bucket]
+    timestamps = batch.timestamps // 1_000_000
+    if timestamps.size == 0:
+        return {
+            "bucket": bucket,
+            "total": 0,
+            "buckets": [],
+            "sentiment": {},
+            "sources": {},
+            "reach": _metric_summary(batch.reach),
+            "engagement": _metric_summary(batch.engagement)
+        }
+
+    bucket_ids = (timestamps + offset) // size
+    bucket_keys, bucket_index, bucket_counts = np.unique(bucket_ids, return_inverse=True, return_counts=True)
+    sentiment_labels, sentiment_index = _labels(batch, "sentiment", "unknown")
+    source_labels, source_index = _labels(batch, "source", "unknown")
+
+    # Bucket x sentiment contingency table in one bincount
+    n_buckets, n_labels = len(bucket_keys), len(sentiment_labels)
+    by_sentiment = np.bincount(
+        bucket_index * n_labels + sentiment_index,
+        minlength=n_buckets * n_labels
+    ).reshape(n_buckets, n_labels)
+    reach = np.nan_to_num(batch.reach)
+    engagement = np.nan_to_num(batch.engagement)
+    reach_sums = np.bincount(bucket_index, weights=reach, minlength=n_buckets)
+    engagement_sums = np.bincount(bucket_index, weights=engagement, minlength=n_buckets)
+
+    starts = bucket_keys * size - offset
+    buckets: List[Dict[str, Any]] = [
+        {
+            "start": datetime.fromtimestamp(int(starts[i]), tz=timezone.utc).isoformat(),
+            "count": int(bucket_counts[i]),
+            "sentiment": {
+                str(sentiment_labels[j]): int(by_sentiment[i, j])
+                for j in range(n_labels) if by_sentiment[i, j]
+            },
+            "reach": int(reach_sums[i]),
+            "engagement": int(engagement_sums[i])
+        }
+        for i in range(n_buckets)
+    ]
+    return {
+        "bucket": bucket,
+        "total": int(timestamps.size),
+        "buckets": buckets,
+        "sentiment": {
+            str(label): int(count)
+            for label, count in zip(sentiment_labels, by_sentiment.sum(axis=0))
+            if count
+        },
+        "sources": {
+            str(label): int(count)
+            for label, count in zip(source_labels, np.bincount(source_index, minlength=len(source_labels)))
+            if count
+        },
+        "reach": _metric_summary(batch.reach),
+        "engagement": _metric_summary(batch.engagement)
+    }
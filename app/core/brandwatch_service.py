@@ -1,76 +1,447 @@
-import os
+import json
+import asyncio
+import heapq
+import logging
 import time
-from typing import List, Optional
+from collections import Counter, OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlencode
 import aiohttp
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import SQLAlchemyError
 from app.models.brandwatch import BrandwatchProject, BrandwatchQuery, BrandwatchMention
+from app.models.mention_batch import MentionBatch, parse_timestamp
+from app.models.validation import parse_models, validate_rows
+from app.core.rate_limiter import AsyncRateLimiter
+from app.core.config import get_settings
+from app.core.resilience import (
+    BrandwatchAPIError, CircuitBreaker, backoff_delay, endpoint_group, parse_retry_after
+)
+from app.core.rate_limit_backends import create_rate_limit_backend
+from app.core.cache import AsyncTTLCache, Loader
+from app.core.metrics import (
+    MODEL_BUILD_SECONDS, RATE_LIMIT_WAIT_SECONDS, UPSTREAM_IN_FLIGHT, UPSTREAM_RESPONSE_BYTES,
+    UPSTREAM_RETRIES, UPSTREAM_SECONDS
+)
+from app.core.singleflight import SingleFlight
+from app.core.mention_store import MentionStore, to_naive_utc
+from app.core.search_index import MentionSearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Cache kinds whose responses are worth revalidating with ETag/Last-Modified
+CONDITIONAL_KINDS = ("projects", "queries")
 
 class BrandwatchService:
     def __init__(self):
-        self.api_url = os.getenv("BRANDWATCH_API_URL", "https://api.brandwatch.com")
-        self.api_key = os.getenv("BRANDWATCH_API_KEY")
+        settings = get_settings()
+        self.api_url = settings.brandwatch_api_url
+        self.api_key = settings.brandwatch_api_key
         self.rate_limit = 30  # calls per 10 minutes
         self.rate_window = 600  # 10 minutes in seconds
-        self.calls = []
-        
-    def _check_rate_limit(self):
-        """Check and enforce rate limiting"""
-        now = time.time()
-        # Remove calls older than the rate window
-        self.calls = [call for call in self.calls if now - call < self.rate_window]
-        
-        if len(self.calls) >= self.rate_limit:
-            sleep_time = self.calls[0] + self.rate_window - now
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        
-        self.calls.append(now)
+        self.rate_limit_timeout = settings.brandwatch_rate_limit_timeout or None  # max seconds to wait for a slot
+        self.rate_limiter = AsyncRateLimiter(
+            self.rate_limit,
+            self.rate_window,
+            backend=create_rate_limit_backend()
+        )
+        # Shared HTTP connection pool settings
+        self.http_limit = settings.brandwatch_http_limit
+        self.http_limit_per_host = settings.brandwatch_http_limit_per_host
+        self.http_keepalive_timeout = settings.brandwatch_http_keepalive_timeout
+        self.http_dns_cache_ttl = settings.brandwatch_http_dns_cache_ttl
+        self.http_timeout = settings.brandwatch_http_timeout
+        self.http_connect_timeout = settings.brandwatch_http_connect_timeout
+        self.http_read_timeout = settings.brandwatch_http_read_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Response cache; TTLs are per endpoint kind, in seconds
+        self.cache = AsyncTTLCache(
+            max_entries=settings.brandwatch_cache_max_entries,
+            max_bytes=settings.brandwatch_cache_max_bytes,
+            fallback_ttl=settings.brandwatch_cache_fallback_ttl
+        )
+        self.cache_ttls = {
+            "projects": settings.brandwatch_cache_ttl_projects,
+            "queries": settings.brandwatch_cache_ttl_queries,
+            "mentions": settings.brandwatch_cache_ttl_mentions
+        }
+        self.cache_stale_ttl = settings.brandwatch_cache_stale_ttl
+        self._inflight = SingleFlight()
+        # HTTP validators (ETag/Last-Modified) per GET endpoint and params, with the body they validate
+        # Only the slow-changing kinds are revalidated; mention pages and shards rarely repeat
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], dict, int]]" = OrderedDict()
+        self._validator_bytes = 0
+        self.validator_max_entries = settings.brandwatch_validator_max_entries
+        self.validator_max_bytes = settings.brandwatch_validator_max_bytes
+        # Only refund the rate-limit slot for a 304 if upstream does not count it either
+        self.not_modified_free = settings.brandwatch_not_modified_free
+        self.conditional_stats = {"sent": 0, "not_modified": 0, "refunded": 0}
+        # Retries (GET only) and per-endpoint circuit breakers
+        self.retry_attempts = settings.brandwatch_retry_attempts  # total tries per GET
+        self.retry_backoff_base = settings.brandwatch_retry_backoff_base
+        self.retry_backoff_max = settings.brandwatch_retry_backoff_max
+        self.retry_max_delay = settings.brandwatch_retry_max_delay  # longest Retry-After honoured
+        self.circuit_failure_threshold = settings.brandwatch_circuit_failure_threshold
+        self.circuit_reset_timeout = settings.brandwatch_circuit_reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        # Validate upstream rows; false trusts Brandwatch and builds models with model_construct.
+        # parse_models (fields/validate) only runs with batches off; batches use validate_rows
+        self.validate_responses = settings.brandwatch_validate_responses
+        # Interactive demand per project and per (project, query), used to prioritise prefetching
+        self.project_hits: Counter = Counter()
+        self.query_hits: Counter = Counter()
+        # Sharded mention export planning
+        self.shard_target = settings.brandwatch_shard_target  # max mentions per shard
+        self.shard_max_parallel = settings.brandwatch_shard_max_parallel
+        self.shard_max_depth = settings.brandwatch_shard_max_depth
+        # Local mention store
+        store_enabled = settings.brandwatch_mention_store_enabled
+        self.store: Optional[MentionStore] = MentionStore() if store_enabled else None
+        self.sync_backfill_days = settings.brandwatch_sync_backfill_days
+        # Local search index over mention pages served by get_mentions and mentions synced into the store
+        search_enabled = settings.brandwatch_search_index_enabled
+        self.search_index: Optional[MentionSearchIndex] = MentionSearchIndex(
+            max_mentions=settings.brandwatch_search_max_mentions,
+            max_bytes=settings.brandwatch_search_max_bytes,
+            segment_size=settings.brandwatch_search_segment_size
+        ) if search_enabled else None
+        self._index_tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        """Open the shared HTTP session"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.http_limit,
+                limit_per_host=self.http_limit_per_host,
+                keepalive_timeout=self.http_keepalive_timeout,
+                ttl_dns_cache=self.http_dns_cache_ttl,
+                use_dns_cache=True
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=self.http_timeout,
+                connect=self.http_connect_timeout,
+                sock_read=self.http_read_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                headers={"Content-Type": "application/json"}
+            )
+
+    async def close(self):
+        """Close the shared HTTP session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
-    async def _make_request(self, endpoint: str, method: str = "GET", params: Optional[dict] = None) -> dict:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, opening it if the lifespan has not"""
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    async def _check_rate_limit(self, timeout: Optional[float] = None) -> Any:
+        """Wait on the event loop until the rate limit allows another call; returns the reservation"""
+        with RATE_LIMIT_WAIT_SECONDS.time():
+            return await self.rate_limiter.acquire(timeout if timeout is not None else self.rate_limit_timeout)
+
+    async def get_rate_limit_status(self) -> Dict[str, Any]:
+        """Get current rate limit budget and queue depth"""
+        return await self.rate_limiter.status()
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        group = endpoint_group(endpoint)
+        breaker = self._breakers.get(group)
+        if breaker is None:
+            breaker = CircuitBreaker(group, self.circuit_failure_threshold, self.circuit_reset_timeout)
+            self._breakers[group] = breaker
+        return breaker
+
+    def get_upstream_status(self) -> Dict[str, Any]:
+        """Get circuit breaker state per endpoint group and the retry count"""
+        return {
+            "retries": self.retries,
+            "circuits": [breaker.status() for breaker in self._breakers.values()]
+        }
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None
+    ) -> dict:
         """Make API request with rate limiting and error handling"""
-        self._check_rate_limit()
+        data, _ = await self._request(endpoint, method, params, timeout)
+        return data
+
+    async def _request(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        conditional: bool = False
+    ) -> Tuple[dict, int]:
+        """
+        Make API request and return the decoded body with its size in bytes.
+        conditional=True keeps the response's validators for the next refresh.
+        """
+        if method != "GET":
+            return await self._call(endpoint, method, params, timeout)
+        # Identical in-flight GETs share one upstream call and one rate-limit slot
+        key = f"{method} {self._cache_key(endpoint, params)}"
+        return await self._inflight.do(key, lambda: self._call(endpoint, method, params, timeout, conditional))
+
+    async def _call(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        conditional: bool = False
+    ) -> Tuple[dict, int]:
+        """Send through the endpoint's circuit breaker, retrying GETs on transient failures"""
+        breaker = self._breaker(endpoint)
+        attempts = max(self.retry_attempts, 1) if method == "GET" else 1
+        for attempt in range(attempts):
+            breaker.before_call()
+            try:
+                result = await self._send(endpoint, method, params, timeout, conditional)
+            except BrandwatchAPIError as e:
+                if e.retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()  # upstream is healthy, the request was not
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                status = 504 if isinstance(e, asyncio.TimeoutError) else 502
+                error = BrandwatchAPIError(status, str(e) or type(e).__name__)
+                error.__cause__ = e
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return result
+
+            if not error.retryable or attempt == attempts - 1:
+                raise error
+            delay = backoff_delay(attempt, self.retry_backoff_base, self.retry_backoff_max)
+            if error.retry_after is not None:
+                if error.retry_after > self.retry_max_delay:
+                    raise error
+                delay += error.retry_after
+            logger.warning(
+                "Brandwatch %s %s failed (%s), retry %d/%d in %.2fs",
+                method, endpoint, error.status, attempt + 1, attempts - 1, delay
+            )
+            self.retries += 1
+            UPSTREAM_RETRIES.inc(endpoint_group(endpoint))
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        conditional: bool = False
+    ) -> Tuple[dict, int]:
+        reservation = await self._check_rate_limit(timeout)
         
         headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+            "Authorization": f"Bearer {self.api_key}"
         }
+        key = self._cache_key(endpoint, params) if method == "GET" and conditional else None
+        validated = self._validators.get(key) if key is not None else None
+        if validated is not None:
+            etag, last_modified, _, _ = validated
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+            self.conditional_stats["sent"] += 1
         
-        async with aiohttp.ClientSession() as session:
+        session = await self._get_session()
+        group = endpoint_group(endpoint)
+        status: Any = "error"
+        UPSTREAM_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
             async with session.request(
                 method,
                 f"{self.api_url}/{endpoint}",
                 headers=headers,
                 params=params
             ) as response:
+                status = response.status
+                if response.status == 304 and validated is not None:
+                    self._validators.move_to_end(key)
+                    self.conditional_stats["not_modified"] += 1
+                    if self.not_modified_free:
+                        await self.rate_limiter.refund(reservation)
+                        self.conditional_stats["refunded"] += 1
+                    _, _, data, size = validated
+                    return data, size
                 if response.status != 200:
                     error_text = await response.text()
-                    raise Exception(f"Brandwatch API error: {error_text}")
-                return await response.json()
+                    raise BrandwatchAPIError(
+                        response.status,
+                        error_text,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                body = await response.read()
+                UPSTREAM_RESPONSE_BYTES.observe(len(body), group)
+                data = json.loads(body)
+                if key is not None:
+                    self._remember_validators(key, response.headers, data, len(body))
+                return data, len(body)
+        finally:
+            UPSTREAM_IN_FLIGHT.dec()
+            UPSTREAM_SECONDS.observe(time.perf_counter() - start, method, group, status)
+
+    def _remember_validators(self, key: str, headers: Any, data: dict, size: int):
+        """Keep the response's ETag/Last-Modified so the next refresh can be conditional"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        self._forget_validators(key)
+        if (not etag and not last_modified) or size > self.validator_max_bytes:
+            return
+        self._validators[key] = (etag, last_modified, data, size)
+        self._validator_bytes += size
+        while (
+            len(self._validators) > self.validator_max_entries
+            or self._validator_bytes > self.validator_max_bytes
+        ):
+            _, (_, _, _, evicted) = self._validators.popitem(last=False)
+            self._validator_bytes -= evicted
+
+    def _forget_validators(self, key: str):
+        entry = self._validators.pop(key, None)
+        if entry is not None:
+            self._validator_bytes -= entry[3]
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: Optional[dict] = None) -> str:
+        if not params:
+            return endpoint
+        return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+    async def _cached_request(
+        self,
+        endpoint: str,
+        kind: str,
+        params: Optional[dict] = None,
+        refresh: bool = False,
+        on_load: Optional[Callable[[dict], None]] = None
+    ) -> dict:
+        """
+        Make a GET request through the response cache; refresh=True reloads it
+        unconditionally. on_load sees each body actually fetched from upstream.
+        """
+        async def loader() -> Tuple[dict, int]:
+            data, size = await self._request(endpoint, params=params, conditional=kind in CONDITIONAL_KINDS)
+            if on_load is not None:
+                on_load(data)
+            return data, size
+
+        return await self._load_cached(self._cache_key(endpoint, params), kind, loader, refresh)
+
+    async def _load_cached(
+        self,
+        key: str,
+        kind: str,
+        loader: Loader,
+        refresh: bool = False
+    ) -> Any:
+        """Get a value through the response cache, serving an expired copy while upstream fails"""
+        load = self.cache.refresh if refresh else self.cache.get_or_load
+        try:
+            return await load(
+                key,
+                loader,
+                ttl=self.cache_ttls[kind],
+                stale_ttl=self.cache_stale_ttl
+            )
+        except BrandwatchAPIError as e:
+            # While upstream is failing, an expired copy beats an error
+            if e.status == 404:
+                raise
+            entry = self.cache.get_fallback(key)
+            if entry is None:
+                raise
+            logger.warning("Serving expired %s after Brandwatch error: %s", key, e)
+            return entry.value
+
+    def _index_rows(self, rows: List[dict]):
+        """Add raw mention rows to the search index in a worker thread, without delaying the caller"""
+        if self.search_index is None or not rows:
+            return
+        index = self.search_index
 
-    async def get_projects(self) -> List[BrandwatchProject]:
+        def build():
+            index.add(parse_models(BrandwatchMention, rows))
+
+        task = asyncio.create_task(asyncio.to_thread(build))
+        self._index_tasks.add(task)
+        task.add_done_callback(self._index_done)
+
+    def _index_done(self, task: asyncio.Task):
+        self._index_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Indexing mentions for search failed: %s", task.exception())
+
+    def invalidate_cache(self, project_id: Optional[int] = None) -> int:
+        """Drop cached responses for one project, or everything"""
+        if project_id is None:
+            self._validators.clear()
+            self._validator_bytes = 0
+            return self.cache.clear()
+        for key in list(self._validators):
+            if key == f"projects/{project_id}" or key.startswith((f"projects/{project_id}/", f"projects/{project_id}?")):
+                self._forget_validators(key)
+        removed = int(self.cache.invalidate(f"projects/{project_id}"))
+        removed += self.cache.invalidate_prefix(f"projects/{project_id}/")
+        removed += self.cache.invalidate_prefix(f"projects/{project_id}?")
+        return removed
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss counters and request coalescing counters"""
+        stats = self.cache.stats()
+        stats["coalescing"] = self._inflight.stats()
+        stats["conditional"] = dict(self.conditional_stats, validators=len(self._validators), validator_bytes=self._validator_bytes)
+        return stats
+
+    async def get_projects(self, refresh: bool = False) -> List[BrandwatchProject]:
         """Get list of projects"""
-        data = await self._make_request("projects/summary")
-        return [BrandwatchProject(**project) for project in data["results"]]
+        data = await self._cached_request("projects/summary", "projects", refresh=refresh)
+        with MODEL_BUILD_SECONDS.time("BrandwatchProject"):
+            return parse_models(BrandwatchProject, data["results"], validate=self.validate_responses)
 
     async def get_project(self, project_id: int) -> BrandwatchProject:
         """Get specific project details"""
-        data = await self._make_request(f"projects/{project_id}")
-        return BrandwatchProject(**data["results"][0])
+        self.project_hits[project_id] += 1
+        data = await self._cached_request(f"projects/{project_id}", "projects")
+        return parse_models(BrandwatchProject, data["results"][:1], validate=self.validate_responses)[0]
 
-    async def get_queries(self, project_id: int) -> List[BrandwatchQuery]:
+    async def get_queries(self, project_id: int, refresh: bool = False) -> List[BrandwatchQuery]:
         """Get list of queries for a project"""
-        data = await self._make_request(f"projects/{project_id}/queries/summary")
-        return [BrandwatchQuery(**query) for query in data["results"]]
+        if not refresh:
+            self.project_hits[project_id] += 1
+        data = await self._cached_request(f"projects/{project_id}/queries/summary", "queries", refresh=refresh)
+        with MODEL_BUILD_SECONDS.time("BrandwatchQuery"):
+            return parse_models(BrandwatchQuery, data["results"], validate=self.validate_responses)
 
-    async def get_mentions(
-        self,
-        project_id: int,
-        query_id: Optional[int] = None,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        limit: int = 100
-    ) -> List[BrandwatchMention]:
-        """Get mentions with optional filtering"""
+    @staticmethod
+    def _mention_params(
+        query_id: Optional[int],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int
+    ) -> dict:
         params = {
             "limit": limit
         }
@@ -81,6 +452,383 @@ class BrandwatchService:
             params["startDate"] = start_date.isoformat()
         if end_date:
             params["endDate"] = end_date.isoformat()
-            
-        data = await self._make_request(f"projects/{project_id}/mentions", params=params)
-        return [BrandwatchMention(**mention) for mention in data["results"]] 
\ No newline at end of file
+        return params
+
+    def _count_demand(self, project_id: int, query_id: Optional[int]):
+        self.project_hits[project_id] += 1
+        if query_id:
+            self.query_hits[(project_id, query_id)] += 1
+
+    async def _from_store(
+        self,
+        project_id: int,
+        query_id: Optional[int],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: Optional[int] = None,
+        batch: bool = False
+    ) -> Any:
+        """
+        Stored mentions (a MentionBatch if batch, else models) when the store
+        covers the range; None when it does not or the lookup fails
+        """
+        if not (self.store and query_id and start_date and end_date):
+            return None
+        read = self.store.get_mention_batch if batch else self.store.get_mentions
+        try:
+            if await self.store.covers(project_id, query_id, start_date, end_date):
+                return await read(project_id, query_id, start_date, end_date, limit)
+        except (SQLAlchemyError, ImportError):  # ImportError: no database driver installed
+            logger.exception("Mention store lookup failed, falling back to Brandwatch")
+        return None
+
+    async def _mention_page(
+        self,
+        project_id: int,
+        query_id: Optional[int],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int,
+        refresh: bool = False
+    ) -> dict:
+        """One cached page of raw mention rows"""
+        params = self._mention_params(query_id, start_date, end_date, limit)
+        return await self._cached_request(
+            f"projects/{project_id}/mentions", "mentions", params=params, refresh=refresh,
+            on_load=lambda body: self._index_rows(body.get("results", []))
+        )
+
+    async def get_mentions(
+        self,
+        project_id: int,
+        query_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        refresh: bool = False,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[BrandwatchMention]:
+        """
+        Get mentions with optional filtering.
+
+        fields limits parsing to those BrandwatchMention attributes; the
+        returned models are then only partially populated.
+        """
+        if not refresh:
+            self._count_demand(project_id, query_id)
+        stored = await self._from_store(project_id, query_id, start_date, end_date, limit)
+        if stored is not None:
+            return stored
+        data = await self._mention_page(project_id, query_id, start_date, end_date, limit, refresh)
+        with MODEL_BUILD_SECONDS.time("BrandwatchMention"):
+            return parse_models(BrandwatchMention, data["results"], fields, validate=self.validate_responses)
+
+    async def get_mention_batch(
+        self,
+        project_id: int,
+        query_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100
+    ) -> MentionBatch:
+        """Same page as get_mentions, as a columnar batch built without a model per mention"""
+        self._count_demand(project_id, query_id)
+        stored = await self._from_store(project_id, query_id, start_date, end_date, limit, batch=True)
+        if stored is not None:
+            return stored
+        data = await self._mention_page(project_id, query_id, start_date, end_date, limit)
+        with MODEL_BUILD_SECONDS.time("MentionBatch"):
+            return self._build_batch(data["results"])
+
+    def _build_batch(self, rows: List[dict]) -> MentionBatch:
+        """Columnar batch of upstream rows, validated first unless validate_responses is off"""
+        if self.validate_responses:
+            rows = validate_rows(BrandwatchMention, rows)
+        return MentionBatch.from_records(rows)
+
+    async def _iter_pages(
+        self,
+        project_id: int,
+        params: dict,
+        first_page: Optional[dict] = None
+    ) -> AsyncIterator[List[dict]]:
+        """Yield raw mention pages, following nextCursor until exhausted"""
+        data = first_page
+        while True:
+            if data is None:
+                # The next page is only requested once the consumer has drained this one
+                data = await self._make_request(f"projects/{project_id}/mentions", params=params)
+            results = data.get("results", [])
+            if results:
+                yield results
+            cursor = data.get("nextCursor")
+            if not cursor or not results:
+                return
+            params = {**params, "cursor": cursor}
+            data = None
+
+    async def iter_mentions(
+        self,
+        project_id: int,
+        query_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        page_size: int = 1000,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[BrandwatchMention]:
+        """Lazily yield mentions, following page cursors until exhausted"""
+        params = self._mention_params(query_id, start_date, end_date, page_size)
+        fetched = 0
+        async for page in self._iter_pages(project_id, params):
+            if max_results is not None:
+                page = page[:max_results - fetched]
+            for mention in parse_models(BrandwatchMention, page, validate=self.validate_responses):
+                yield mention
+                fetched += 1
+                if max_results is not None and fetched >= max_results:
+                    return
+
+    async def fetch_new_mention_rows(
+        self,
+        project_id: int,
+        query_id: int,
+        since: datetime,
+        page_size: int = 1000,
+        max_pages: int = 5
+    ) -> List[dict]:
+        """
+        Raw mention rows of a query from since until now, bypassing the cache.
+        At most max_pages pages are read, so one poll has a bounded cost.
+        """
+        params = self._mention_params(query_id, since, datetime.utcnow(), page_size)
+        rows = []
+        pages = 0
+        async for page in self._iter_pages(project_id, params):
+            rows.extend(page)
+            pages += 1
+            if pages >= max_pages:
+                break
+        return rows
+
+    async def fetch_mentions_sharded(
+        self,
+        project_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        query_id: Optional[int] = None,
+        shards: int = 4,
+        max_parallel: Optional[int] = None,
+        page_size: int = 1000
+    ) -> List[BrandwatchMention]:
+        """
+        Fetch every mention in a window by splitting it into time shards.
+
+        Each shard's first page doubles as a volume probe: shards reporting more
+        than shard_target results are split in half again. Shards are fetched
+        concurrently under the rate limiter and merged in timestamp order with
+        duplicates (mentions on shard boundaries) removed by id.
+        """
+        records = await self._fetch_records_sharded(
+            project_id, start_date, end_date, query_id, shards, max_parallel, page_size
+        )
+        return parse_models(BrandwatchMention, records, validate=self.validate_responses)
+
+    async def _fetch_records_sharded(
+        self,
+        project_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        query_id: Optional[int] = None,
+        shards: int = 4,
+        max_parallel: Optional[int] = None,
+        page_size: int = 1000
+    ) -> List[dict]:
+        """Raw-record version of fetch_mentions_sharded"""
+        semaphore = asyncio.Semaphore(max_parallel or self.shard_max_parallel)
+
+        def sort_key(record: dict) -> datetime:
+            return to_naive_utc(parse_timestamp(record["timestamp"]))
+
+        async def fetch_shard(start: datetime, end: datetime, depth: int) -> List[dict]:
+            # Oldest first, so a probe page is every mention from start up to its last timestamp
+            params = {
+                **self._mention_params(query_id, start, end, page_size),
+                "orderBy": "date",
+                "orderDirection": "asc"
+            }
+            async with semaphore:
+                first_page = await self._make_request(f"projects/{project_id}/mentions", params=params)
+            total = first_page.get("resultsTotal")
+            if (
+                total is not None
+                and total > self.shard_target
+                and first_page.get("nextCursor")
+                and depth < self.shard_max_depth
+                and end - start > timedelta(minutes=1)
+            ):
+                middle = start + (end - start) / 2
+                known: List[dict] = []
+                first_start = start
+                covered_until = self._ascending_until(first_page.get("results", []))
+                if covered_until is not None and start.tzinfo is not None:
+                    covered_until = covered_until.replace(tzinfo=timezone.utc)
+                if covered_until is not None and covered_until > start:
+                    # The probe holds every mention from start to covered_until, so only the rest
+                    # of the first half is fetched; rows on covered_until are deduplicated on merge
+                    known = [row for row in first_page["results"] if sort_key(row) <= to_naive_utc(middle)]
+                    first_start = covered_until
+                bounds = [(first_start, middle), (middle, end)] if first_start < middle else [(middle, end)]
+                halves = await asyncio.gather(*(fetch_shard(lo, hi, depth + 1) for lo, hi in bounds))
+                return list(heapq.merge(known, *halves, key=sort_key))
+            rows = []
+            async with semaphore:
+                async for page in self._iter_pages(project_id, params, first_page):
+                    rows.extend(page)
+            rows.sort(key=sort_key)
+            return rows
+
+        step = (end_date - start_date) / max(shards, 1)
+        bounds = [start_date + step * i for i in range(shards)] + [end_date]
+        results = await asyncio.gather(*(
+            fetch_shard(bounds[i], bounds[i + 1], 0) for i in range(len(bounds) - 1)
+        ))
+
+        merged = []
+        seen = set()
+        for record in heapq.merge(*results, key=sort_key):
+            if record["id"] not in seen:
+                seen.add(record["id"])
+                merged.append(record)
+        return merged
+
+    @staticmethod
+    def _ascending_until(rows: List[dict]) -> Optional[datetime]:
+        """Newest timestamp (naive UTC) of rows if they are in ascending time order, else None"""
+        timestamps = [to_naive_utc(parse_timestamp(row["timestamp"])) for row in rows]
+        if not timestamps or any(a > b for a, b in zip(timestamps, timestamps[1:])):
+            return None
+        return timestamps[-1]
+
+    async def get_mention_window(
+        self,
+        project_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        query_id: Optional[int] = None
+    ) -> MentionBatch:
+        """Get every mention in a window as a columnar batch, from the local store when it covers the range"""
+        stored = await self._from_store(project_id, query_id, start_date, end_date, batch=True)
+        if stored is not None:
+            return stored
+        params = {"startDate": start_date.isoformat(), "endDate": end_date.isoformat()}
+        if query_id:
+            params["queryId"] = query_id
+        key = self._cache_key(f"projects/{project_id}/mentions/window", params)
+
+        async def fetch() -> Tuple[MentionBatch, int]:
+            records = await self._fetch_records_sharded(
+                project_id=project_id,
+                start_date=start_date,
+                end_date=end_date,
+                query_id=query_id
+            )
+            batch = await asyncio.to_thread(self._build_batch, records)
+            return batch, batch.nbytes
+
+        # Cached as a batch like any mention page; concurrent identical windows share one fetch
+        return await self._load_cached(key, "mentions", lambda: self._inflight.do(f"window {key}", fetch))
+
+    async def _sync_range(
+        self,
+        project_id: int,
+        query_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Tuple[int, Optional[datetime]]:
+        """Copy every mention in a range into the store; return (count, newest timestamp)"""
+        count = 0
+        newest = None
+        params = self._mention_params(query_id, start_date, end_date, 1000)
+        async for page in self._iter_pages(project_id, params):
+            mentions = parse_models(BrandwatchMention, page)
+            count += await self.store.save_mentions(project_id, query_id, mentions)
+            if self.search_index is not None:
+                await asyncio.to_thread(self.search_index.add, mentions)
+            page_newest = max(to_naive_utc(mention.timestamp) for mention in mentions)
+            newest = page_newest if newest is None else max(newest, page_newest)
+        return count, newest
+
+    async def sync_mentions(
+        self,
+        project_id: int,
+        query_id: int,
+        start_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Bring the local store up to date for a query.
+
+        Only mentions newer than the stored high-water mark are fetched. A
+        start_date older than the stored range backfills the gap first.
+        """
+        if self.store is None:
+            raise RuntimeError("Mention store is disabled")
+
+        now = datetime.utcnow()
+        state = await self.store.get_sync_state(project_id, query_id)
+        fetched = 0
+        if state is None:
+            synced_from = to_naive_utc(start_date) if start_date else now - timedelta(days=self.sync_backfill_days)
+            since = synced_from
+            high_water_mark = None
+        else:
+            synced_from = state["synced_from"]
+            high_water_mark = state["high_water_mark"]
+            since = high_water_mark or state["synced_until"]
+            if start_date and to_naive_utc(start_date) < synced_from:
+                count, _ = await self._sync_range(project_id, query_id, to_naive_utc(start_date), synced_from)
+                fetched += count
+                synced_from = to_naive_utc(start_date)
+
+        count, newest = await self._sync_range(project_id, query_id, since, now)
+        fetched += count
+        if newest and (high_water_mark is None or newest > high_water_mark):
+            high_water_mark = newest
+
+        await self.store.record_sync(project_id, query_id, synced_from, now, high_water_mark)
+        return {
+            "project_id": project_id,
+            "query_id": query_id,
+            "fetched": fetched,
+            "synced_from": synced_from.isoformat(),
+            "synced_until": now.isoformat(),
+            "high_water_mark": high_water_mark.isoformat() if high_water_mark else None
+        }
+
+    def search_mentions(
+        self,
+        project_id: int,
+        text: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """Search the local index; never calls Brandwatch. Blocking, run it in a thread"""
+        if self.search_index is None:
+            raise RuntimeError("Search index is disabled")
+        result = self.search_index.search(project_id, text, filters, start_date, end_date, offset, limit)
+        result["index"] = self.search_index.stats()
+        return result
+
+    async def get_sync_state(self, project_id: int, query_id: int) -> Optional[Dict[str, Any]]:
+        """Get the stored range and high-water mark for a query"""
+        if self.store is None:
+            return None
+        state = await self.store.get_sync_state(project_id, query_id)
+        if state is None:
+            return None
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in state.items()
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Tuple[Any, int]]]
+
+
+class CacheEntry:
+    __slots__ = ("value", "size", "fresh_until", "stale_until", "refreshing")
+
+    def __init__(self, value: Any, size: int, fresh_until: float, stale_until: float):
+        self.value = value
+        self.size = size
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.refreshing = False
+
+
+class AsyncTTLCache:
+    """
+    In-process LRU cache with per-entry TTLs and stale-while-revalidate.
+
+    Entries are bounded by count and by their approximate size in bytes.
+    An entry past its TTL but inside its stale window is still served while
+    a single background task reloads it. Past the stale window it is kept
+    for fallback_ttl more seconds, only for get_fallback() when a reload fails.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, fallback_ttl: float = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.fallback_ttl = fallback_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fallback_hits = 0
+        self.evictions = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def set(self, key: str, value: Any, size: int, ttl: float, stale_ttl: float = 0) -> None:
+        """Store a value for ttl seconds, then serve it stale for stale_ttl more"""
+        if size > self.max_bytes:
+            self._remove(key)
+            return
+        now = time.monotonic()
+        self._remove(key)
+        self._entries[key] = CacheEntry(value, size, now + ttl, now + ttl + stale_ttl)
+        self._bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an unexpired entry (fresh or stale) and mark it recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now >= entry.stale_until:
+            if now >= entry.stale_until + self.fallback_ttl:
+                self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_fallback(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry even if expired, as long as it is inside its fallback window"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.stale_until + self.fallback_ttl:
+            self._remove(key)
+            return None
+        self.fallback_hits += 1
+        return entry
+
+    async def get_or_load(self, key: str, loader: Loader, ttl: float, stale_ttl: float = 0) -> Any:
+        """Return the cached value for key, loading it with loader on a miss"""
+        entry = self.get(key)
+        if entry is not None:
+            if time.monotonic() < entry.fresh_until:
+                self.hits += 1
+                return entry.value
+            self.stale_hits += 1
+            if not entry.refreshing:
+                entry.refreshing = True
+                task = asyncio.create_task(self._revalidate(key, entry, loader, ttl, stale_ttl))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return entry.value
+        self.misses += 1
+        return await self.refresh(key, loader, ttl, stale_ttl)
+
+    async def refresh(self, key: str, loader: Loader, ttl: float, stale_ttl: float = 0) -> Any:
+        """Load a value unconditionally and store it"""
+        value, size = await loader()
+        self.set(key, value, size, ttl, stale_ttl)
+        return value
+
+    async def _revalidate(self, key: str, entry: CacheEntry, loader: Loader, ttl: float, stale_ttl: float) -> None:
+        try:
+            await self.refresh(key, loader, ttl, stale_ttl)
+        except Exception:
+            logger.exception("Background refresh failed for %s", key)
+        finally:
+            entry.refreshing = False
+
+    def invalidate(self, key: str) -> bool:
+        """Drop a single entry"""
+        existed = key in self._entries
+        self._remove(key)
+        return existed
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every entry whose key starts with prefix"""
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> int:
+        """Drop every entry"""
+        count = len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fallback_hits": self.fallback_hits,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
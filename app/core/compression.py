@@ -0,0 +1,212 @@
+import time
+import zlib
+from typing import Dict, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import get_settings
+from app.core.metrics import COMPRESSION_BYTES, COMPRESSION_SECONDS
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+# Bodies worth compressing; text/event-stream is left alone so events are not held back
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/vnd.apache.arrow.stream",
+    "text/plain",
+    "text/html",
+    "text/csv"
+)
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings() -> Dict[str, type]:
+    """Installed content codings, in server preference order"""
+    encodings = {}
+    if zstandard is not None:
+        encodings["zstd"] = _ZstdStream
+    if brotli is not None:
+        encodings["br"] = _BrotliStream
+    encodings["gzip"] = _GzipStream
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, offered: List[str]) -> Optional[str]:
+    """
+    Best coding for an Accept-Encoding header among offered (preference
+    order), or None for identity. Highest q wins; ties go to the earlier
+    offered coding; "*" covers codings not listed.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.lower()] = q
+    best, best_q = None, 0.0
+    for coding in offered:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with zstd, brotli or gzip,
+    whichever the client accepts and is installed, preferred in that order.
+
+    Each body chunk goes through a streaming compressor as it is sent, so
+    nothing is buffered beyond the chunk itself; streamed responses are
+    flushed per chunk so clients keep receiving data as it is produced. A
+    single-chunk body under min_size, or a Content-Length under it, is sent
+    as is, as are bodies already encoded and types not worth compressing.
+    """
+
+    def __init__(
+        self,
+        app,
+        min_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+        zstd_level: Optional[int] = None
+    ):
+        self.app = app
+        settings = get_settings()
+        self.min_size = min_size if min_size is not None else settings.compression_min_size
+        levels = {
+            "gzip": gzip_level if gzip_level is not None else settings.compression_gzip_level,
+            "br": brotli_quality if brotli_quality is not None else settings.compression_brotli_quality,
+            "zstd": zstd_level if zstd_level is not None else settings.compression_zstd_level
+        }
+        self.encoders = {name: (factory, levels[name]) for name, factory in available_encodings().items()}
+        self.offered = list(self.encoders)
+
+    def _compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return False
+        length = headers.get("content-length")
+        return length is None or int(length) >= self.min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.offered)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        compressor = None
+        passthrough = False
+        # bytes in, bytes out, seconds spent compressing
+        totals: List[float] = [0, 0, 0.0]
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if (
+                    start_message["status"] in (204, 304)
+                    or not self._compressible(headers)
+                    or (not more_body and len(body) < self.min_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                factory, level = self.encoders[encoding]
+                compressor = factory(level)
+                del headers["content-length"]
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                start_message = None
+
+            started = time.perf_counter()
+            data = compressor.compress(body) + (compressor.flush() if more_body else compressor.finish())
+            totals[0] += len(body)
+            totals[1] += len(data)
+            totals[2] += time.perf_counter() - started
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+        if start_message is not None:
+            # The app never sent a body
+            await send(start_message)
+        if compressor is not None:
+            COMPRESSION_SECONDS.observe(totals[2], encoding)
+            COMPRESSION_BYTES.inc(encoding, "in", amount=totals[0])
+            COMPRESSION_BYTES.inc(encoding, "out", amount=totals[1])
@@ -0,0 +1,141 @@
+import os
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+
+
+class Settings(BaseModel):
+    """
+    Application configuration, validated once at first use.
+
+    Every field is read from the environment variable of the same name in
+    upper case (brandwatch_api_url <- BRANDWATCH_API_URL), after .env has
+    been loaded; unset or empty variables keep the default. See .env.example.
+    """
+
+    # Database
+    db_username: Optional[str] = None
+    db_password: Optional[str] = None
+    db_host: str = "localhost"
+    db_port: int = Field(default=3306, ge=1, le=65535)
+    db_name: str = "mcp_brandwatch"
+    async_database_url: Optional[str] = None  # e.g. sqlite+aiosqlite for tests
+
+    # Auth
+    secret_key: Optional[str] = None
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = Field(default=30, gt=0)
+    password_hash_workers: int = Field(default=4, ge=1)
+    token_cache_size: int = Field(default=10000, ge=0)
+    user_cache_ttl: float = Field(default=30, ge=0)
+
+    # Brandwatch API and shared HTTP connection pool
+    brandwatch_api_url: str = "https://api.brandwatch.com"
+    brandwatch_api_key: Optional[str] = None
+    brandwatch_http_limit: int = Field(default=100, ge=0)
+    brandwatch_http_limit_per_host: int = Field(default=20, ge=0)
+    brandwatch_http_keepalive_timeout: float = Field(default=60, ge=0)
+    brandwatch_http_dns_cache_ttl: int = Field(default=300, ge=0)
+    brandwatch_http_timeout: float = Field(default=30, gt=0)
+    brandwatch_http_connect_timeout: float = Field(default=10, gt=0)
+    brandwatch_http_read_timeout: float = Field(default=20, gt=0)
+
+    # Rate limiting
+    brandwatch_rate_limit_timeout: Optional[float] = Field(default=None, ge=0)  # max seconds to wait for a slot
+    brandwatch_rate_limit_backend: str = "memory"
+    brandwatch_rate_limit_sqlite_path: str = "/tmp/brandwatch_rate_limit.db"
+    brandwatch_rate_limit_redis_url: str = "redis://localhost:6379/0"
+
+    # Response cache (seconds)
+    brandwatch_cache_max_entries: int = Field(default=1024, ge=1)
+    brandwatch_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=1)
+    brandwatch_cache_ttl_projects: float = Field(default=300, ge=0)
+    brandwatch_cache_ttl_queries: float = Field(default=300, ge=0)
+    brandwatch_cache_ttl_mentions: float = Field(default=60, ge=0)
+    brandwatch_cache_stale_ttl: float = Field(default=600, ge=0)
+    brandwatch_cache_fallback_ttl: float = Field(default=3600, ge=0)
+
+    # Conditional requests
+    brandwatch_validator_max_entries: int = Field(default=1024, ge=0)
+    brandwatch_validator_max_bytes: int = Field(default=8 * 1024 * 1024, ge=0)
+    brandwatch_not_modified_free: bool = False
+
+    # Retries and circuit breakers
+    brandwatch_retry_attempts: int = Field(default=3, ge=1)
+    brandwatch_retry_backoff_base: float = Field(default=0.5, ge=0)
+    brandwatch_retry_backoff_max: float = Field(default=10, ge=0)
+    brandwatch_retry_max_delay: float = Field(default=30, ge=0)
+    brandwatch_circuit_failure_threshold: int = Field(default=5, ge=1)
+    brandwatch_circuit_reset_timeout: float = Field(default=30, ge=0)
+
+    brandwatch_validate_responses: bool = True
+    # Serve mention pages and stored windows as columnar MentionBatch; false builds a model per mention
+    brandwatch_mention_batches: bool = True
+
+    # Sharded mention exports
+    brandwatch_shard_target: int = Field(default=10000, ge=1)
+    brandwatch_shard_max_parallel: int = Field(default=4, ge=1)
+    brandwatch_shard_max_depth: int = Field(default=4, ge=0)
+
+    # Local mention store and search index
+    brandwatch_mention_store_enabled: bool = True
+    brandwatch_sync_backfill_days: int = Field(default=30, ge=0)
+    brandwatch_search_index_enabled: bool = True
+    brandwatch_search_max_mentions: int = Field(default=200000, ge=1)
+    brandwatch_search_max_bytes: int = Field(default=256 * 1024 * 1024, ge=1)
+    brandwatch_search_segment_size: int = Field(default=10000, ge=1)
+
+    # Batch endpoint
+    brandwatch_batch_max_operations: int = Field(default=100, ge=1)
+    brandwatch_batch_max_parallel: int = Field(default=8, ge=1)
+
+    # Background cache warming
+    brandwatch_prefetch_enabled: bool = True
+    brandwatch_prefetch_interval: float = Field(default=300, gt=0)
+    brandwatch_prefetch_budget_share: float = Field(default=0.25, ge=0, le=1)
+    brandwatch_prefetch_hot_queries: int = Field(default=5, ge=0)
+    brandwatch_prefetch_mention_limit: int = Field(default=100, ge=1, le=1000)
+
+    # Server-sent mention subscriptions
+    brandwatch_subscribe_enabled: bool = True
+    brandwatch_subscribe_poll_interval: float = Field(default=300, gt=0)
+    brandwatch_subscribe_lookback: float = Field(default=300, ge=0)
+    brandwatch_subscribe_max_pollers: int = Field(default=2, ge=1)
+    brandwatch_subscribe_max_pages: int = Field(default=1, ge=1)  # upstream calls per poll
+    brandwatch_subscribe_budget_share: float = Field(default=0.25, ge=0, le=1)
+    brandwatch_subscribe_max_pending: int = Field(default=1000, ge=1)  # mentions per client
+    brandwatch_subscribe_heartbeat: float = Field(default=15, gt=0)
+
+    # Metrics and response compression
+    metrics_enabled: bool = False
+    compression_enabled: bool = True
+    compression_min_size: int = Field(default=1024, ge=0)
+    compression_gzip_level: int = Field(default=6, ge=1, le=9)
+    compression_brotli_quality: int = Field(default=4, ge=0, le=11)
+    compression_zstd_level: int = Field(default=3, ge=1, le=22)
+
+    @property
+    def database_url(self) -> str:
+        return f"mysql://{self.db_username}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from os.environ"""
+        fields = getattr(cls, "model_fields", None) or cls.__fields__
+        values = {}
+        for name in fields:
+            value = os.environ.get(name.upper())
+            if value:
+                values[name] = value
+        return cls(**values)
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    The process-wide settings; loads .env and validates on the first call.
+    Scripts that change the environment afterwards call get_settings.cache_clear()
+    """
+    load_dotenv()
+    return Settings.from_env()
@@ -0,0 +1,183 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Base, AsyncSessionLocal
+from app.models.brandwatch import BrandwatchMention
+from app.models.mention_batch import MentionBatch
+from app.models.mention import StoredMention, MentionSyncState
+
+# Stored columns read back as a mention, labelled with the Brandwatch field names
+_MENTION_COLUMNS = (
+    StoredMention.id,
+    StoredMention.content,
+    StoredMention.author,
+    StoredMention.source,
+    StoredMention.timestamp,
+    StoredMention.query_id.label("queryId"),
+    StoredMention.project_id.label("projectId"),
+    StoredMention.language,
+    StoredMention.sentiment,
+    StoredMention.reach,
+    StoredMention.engagement
+)
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalise a datetime to naive UTC, the form stored in the database"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class MentionStore:
+    """
+    Local copy of Brandwatch mentions with a per-query sync record.
+
+    Runs on the async engine, like the rest of the request path. The tables
+    are created on first use, so the database is only touched once
+    something actually reads or writes the store.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self._tables_ready = False
+        self._lock = asyncio.Lock()
+
+    async def create_tables(self):
+        """Create the mention tables if they do not exist"""
+        async with self.session_factory() as db:
+            connection = await db.connection()
+            await connection.run_sync(
+                lambda sync_connection: Base.metadata.create_all(
+                    sync_connection, tables=[StoredMention.__table__, MentionSyncState.__table__]
+                )
+            )
+            await db.commit()
+        self._tables_ready = True
+
+    async def _session(self) -> AsyncSession:
+        """Open a session, creating the tables first if this is the first use"""
+        if not self._tables_ready:
+            async with self._lock:
+                if not self._tables_ready:
+                    await self.create_tables()
+        return self.session_factory()
+
+    async def save_mentions(self, project_id: int, query_id: int, mentions: Iterable[BrandwatchMention]) -> int:
+        """Insert or update mentions for a query"""
+        mentions = list(mentions)
+        if not mentions:
+            return 0
+        async with await self._session() as db:
+            # Load the rows that already exist in one query instead of one per mention
+            result = await db.execute(select(StoredMention).where(
+                StoredMention.project_id == project_id,
+                StoredMention.query_id == query_id,
+                StoredMention.id.in_([mention.id for mention in mentions])
+            ))
+            existing = {row.id: row for row in result.scalars()}
+            for mention in mentions:
+                row = existing.get(mention.id)
+                if row is None:
+                    row = StoredMention(project_id=project_id, query_id=query_id, id=mention.id)
+                    db.add(row)
+                    existing[mention.id] = row
+                row.content = mention.content
+                row.author = mention.author
+                row.source = mention.source
+                row.timestamp = to_naive_utc(mention.timestamp)
+                row.language = mention.language
+                row.sentiment = mention.sentiment
+                row.reach = mention.reach
+                row.engagement = mention.engagement
+            await db.commit()
+        return len(mentions)
+
+    async def get_sync_state(self, project_id: int, query_id: int) -> Optional[Dict[str, Any]]:
+        """Get the synced range and high-water mark for a query"""
+        async with await self._session() as db:
+            state = await db.get(MentionSyncState, (project_id, query_id))
+            if state is None:
+                return None
+            return {
+                "project_id": state.project_id,
+                "query_id": state.query_id,
+                "synced_from": state.synced_from,
+                "synced_until": state.synced_until,
+                "high_water_mark": state.high_water_mark
+            }
+
+    async def record_sync(
+        self,
+        project_id: int,
+        query_id: int,
+        synced_from: datetime,
+        synced_until: datetime,
+        high_water_mark: Optional[datetime]
+    ):
+        """Store the outcome of a completed sync"""
+        async with await self._session() as db:
+            await db.merge(MentionSyncState(
+                project_id=project_id,
+                query_id=query_id,
+                synced_from=to_naive_utc(synced_from),
+                synced_until=to_naive_utc(synced_until),
+                high_water_mark=to_naive_utc(high_water_mark) if high_water_mark else None
+            ))
+            await db.commit()
+
+    async def covers(self, project_id: int, query_id: int, start_date: datetime, end_date: datetime) -> bool:
+        """Whether every mention between start_date and end_date is stored"""
+        state = await self.get_sync_state(project_id, query_id)
+        if state is None:
+            return False
+        return state["synced_from"] <= to_naive_utc(start_date) and to_naive_utc(end_date) <= state["synced_until"]
+
+    async def _read_range(
+        self,
+        project_id: int,
+        query_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Stored mentions in a date range, newest first, as Brandwatch-shaped rows"""
+        query = (
+            select(*_MENTION_COLUMNS)
+            .where(
+                StoredMention.project_id == project_id,
+                StoredMention.query_id == query_id,
+                StoredMention.timestamp >= to_naive_utc(start_date),
+                StoredMention.timestamp <= to_naive_utc(end_date)
+            )
+            .order_by(StoredMention.timestamp.desc())
+        )
+        if limit:
+            query = query.limit(limit)
+        async with await self._session() as db:
+            result = await db.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+    async def get_mentions(
+        self,
+        project_id: int,
+        query_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None
+    ) -> List[BrandwatchMention]:
+        """Read stored mentions for a query in a date range, newest first"""
+        rows = await self._read_range(project_id, query_id, start_date, end_date, limit)
+        return [BrandwatchMention(**row) for row in rows]
+
+    async def get_mention_batch(
+        self,
+        project_id: int,
+        query_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None
+    ) -> MentionBatch:
+        """get_mentions as a columnar batch, without a model per row"""
+        rows = await self._read_range(project_id, query_id, start_date, end_date, limit)
+        return await asyncio.to_thread(MentionBatch.from_records, rows)
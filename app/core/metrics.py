@@ -0,0 +1,315 @@
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+WAIT_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+_NULL_TIMER = nullcontext()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[Any, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[Any, ...], float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        if not self.registry.enabled:
+            return
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[Any, ...], float] = {}
+
+    def set(self, value: float, *labels: Any) -> None:
+        if not self.registry.enabled:
+            return
+        self._values[labels] = value
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        if not self.registry.enabled:
+            return
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: Any, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class CallbackGauge(Metric):
+    """Gauge whose value is read from a callable at scrape time"""
+    kind = "gauge"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, fn: Callable[[], float]):
+        super().__init__(registry, name, help)
+        self.fn = fn
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_format_value(self.fn())}"]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: "Histogram", labels: Tuple[Any, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        # per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[Any, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        if not self.registry.enabled:
+            return
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def time(self, *labels: Any):
+        """Context manager observing the elapsed seconds of its block"""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return _Timer(self, labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry rendered in the Prometheus text format.
+
+    Metrics are plain dicts updated from the event loop, so no locking is
+    needed. While disabled, updates return immediately and timers are a
+    shared nullcontext.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: Dict[str, Metric] = {}
+
+    def _add(self, metric: Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(self, name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(self, name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(self, name, help, labelnames, buckets=buckets))
+
+    def gauge_callback(self, name: str, help: str, fn: Callable[[], float]) -> CallbackGauge:
+        """Register (or replace) a gauge computed at scrape time"""
+        return self._add(CallbackGauge(self, name, help, fn))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Off by default: every instrumentation call then returns before touching any state
+registry = MetricsRegistry(enabled=get_settings().metrics_enabled)
+
+# HTTP server
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time to serve a request, by route template", ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge("http_requests_in_progress", "Requests currently being served")
+HTTP_RESPONSE_BYTES = registry.histogram(
+    "http_response_size_bytes", "Response body size, by route template", ("method", "route"), buckets=SIZE_BUCKETS
+)
+
+# Brandwatch upstream
+UPSTREAM_SECONDS = registry.histogram(
+    "brandwatch_upstream_duration_seconds", "Brandwatch call latency, by endpoint group", ("method", "endpoint", "status")
+)
+UPSTREAM_IN_FLIGHT = registry.gauge("brandwatch_upstream_in_flight", "Brandwatch calls currently in flight")
+UPSTREAM_RESPONSE_BYTES = registry.histogram(
+    "brandwatch_upstream_response_size_bytes", "Brandwatch response body size", ("endpoint",), buckets=SIZE_BUCKETS
+)
+UPSTREAM_RETRIES = registry.counter(
+    "brandwatch_upstream_retries_total", "Brandwatch calls retried after a transient failure", ("endpoint",)
+)
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    "brandwatch_rate_limit_wait_seconds", "Time spent waiting for a rate-limit slot", buckets=WAIT_BUCKETS
+)
+
+# Hot-path CPU work
+MODEL_BUILD_SECONDS = registry.histogram(
+    "brandwatch_model_build_seconds", "Time to build models from a Brandwatch response", ("model",)
+)
+PRESENTER_SECONDS = registry.histogram(
+    "brandwatch_presenter_seconds", "Time spent in presenter transforms", ("transform",)
+)
+SERIALIZATION_SECONDS = registry.histogram("response_serialization_seconds", "Time to encode a JSON response body")
+COMPRESSION_SECONDS = registry.histogram(
+    "response_compression_seconds", "Time spent compressing a response body", ("encoding",)
+)
+COMPRESSION_BYTES = registry.counter(
+    "response_compression_bytes_total", "Response bytes before (in) and after (out) compression", ("encoding", "stage")
+)
+
+
+def observe_service(service: Any) -> None:
+    """Expose a BrandwatchService's queue depth and cache counters as scrape-time gauges"""
+    registry.gauge_callback(
+        "brandwatch_rate_limit_queue_depth", "Callers waiting for a rate-limit slot",
+        lambda: service.rate_limiter.queue_depth
+    )
+    registry.gauge_callback(
+        "brandwatch_cache_hit_ratio", "Response cache hit ratio, stale hits included",
+        lambda: service.cache.stats()["hit_ratio"]
+    )
+    registry.gauge_callback(
+        "brandwatch_cache_entries", "Entries in the response cache", lambda: service.cache.stats()["entries"]
+    )
+    registry.gauge_callback(
+        "brandwatch_cache_bytes", "Approximate size of the response cache", lambda: service.cache.stats()["bytes"]
+    )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, response size and in-flight count
+    per route template. Only installed when metrics are enabled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _route_template(scope) -> str:
+        """The matched route's path template, e.g. /projects/{project_id}, to keep label cardinality bounded"""
+        route = scope.get("route")
+        template = getattr(route, "path", None)
+        if template is None:
+            return "unmatched"
+        # Routes of an included router may carry only their own path; put the
+        # prefix the request matched in front of it
+        path = scope["path"]
+        for index, char in enumerate(path):
+            if char == "/" and route.path_regex.match(path[index:]):
+                return path[:index] + template
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = {"code": 500}
+        size = {"bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                size["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            template = self._route_template(scope)
+            method = scope["method"]
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, template, status["code"])
+            HTTP_RESPONSE_BYTES.observe(size["bytes"], method, template)
+
+
+def render_latest() -> Optional[str]:
+    """Exposition text, or None while metrics are disabled"""
+    if not registry.enabled:
+        return None
+    return registry.render()
@@ -0,0 +1,223 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from app.core.config import get_settings
+from typing import Any, Deque, Optional, Tuple
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for the calls made inside the rate-limit window.
+
+    Implementations must make reserve() atomic across every process that
+    shares the backend so all workers draw from one budget.
+    """
+
+    @abstractmethod
+    async def reserve(self, limit: int, window: float) -> Tuple[float, Any]:
+        """
+        Record a call if the budget allows it and return (0, reservation token);
+        otherwise return (seconds until a slot may free up, None)
+        """
+        pass
+
+    @abstractmethod
+    async def refund(self, token: Any) -> None:
+        """Give back a reservation that did not count against the upstream limit"""
+        pass
+
+    @abstractmethod
+    async def usage(self, limit: int, window: float) -> Tuple[int, float]:
+        """Return (calls in window, seconds until the oldest call expires)"""
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process backend backed by a deque of call timestamps"""
+
+    def __init__(self):
+        self._calls: Deque[float] = deque()
+
+    def _evict(self, now: float, window: float) -> None:
+        while self._calls and now - self._calls[0] >= window:
+            self._calls.popleft()
+
+    async def reserve(self, limit: int, window: float) -> Tuple[float, Any]:
+        now = time.monotonic()
+        self._evict(now, window)
+        if len(self._calls) < limit:
+            self._calls.append(now)
+            return 0.0, now
+        return max(self._calls[0] + window - now, 0.0), None
+
+    async def refund(self, token: Any) -> None:
+        try:
+            self._calls.remove(token)
+        except ValueError:
+            pass  # already expired out of the window
+
+    async def usage(self, limit: int, window: float) -> Tuple[int, float]:
+        now = time.monotonic()
+        self._evict(now, window)
+        reset_in = self._calls[0] + window - now if self._calls else 0.0
+        return len(self._calls), max(reset_in, 0.0)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Single-host backend shared through a SQLite file.
+
+    Every reservation runs in a BEGIN IMMEDIATE transaction, which takes the
+    database write lock, so uvicorn workers and containers that mount the
+    same file never over-spend the budget.
+    """
+
+    def __init__(self, path: str, key: str = "brandwatch"):
+        self.path = path
+        self.key = key
+        self._lock = threading.Lock()
+        self.last_reserved_at: Optional[float] = None
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_calls (key TEXT NOT NULL, ts REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_calls_key_ts ON rate_limit_calls (key, ts)"
+        )
+
+    def _reserve(self, limit: int, window: float) -> Tuple[float, Any]:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                # Read the clock only once the write lock is held so timestamps
+                # stay ordered across processes.
+                now = time.time()
+                cur.execute("DELETE FROM rate_limit_calls WHERE key = ? AND ts <= ?", (self.key, now - window))
+                count, oldest = cur.execute(
+                    "SELECT COUNT(*), MIN(ts) FROM rate_limit_calls WHERE key = ?", (self.key,)
+                ).fetchone()
+                if count < limit:
+                    cur.execute("INSERT INTO rate_limit_calls (key, ts) VALUES (?, ?)", (self.key, now))
+                    self.last_reserved_at = now
+                    result = (0.0, cur.lastrowid)
+                else:
+                    result = (max(oldest + window - now, 0.0), None)
+                cur.execute("COMMIT")
+                return result
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def _usage(self, window: float) -> Tuple[int, float]:
+        with self._lock:
+            now = time.time()
+            count, oldest = self._conn.execute(
+                "SELECT COUNT(*), MIN(ts) FROM rate_limit_calls WHERE key = ? AND ts > ?",
+                (self.key, now - window)
+            ).fetchone()
+            reset_in = oldest + window - now if oldest is not None else 0.0
+            return count, max(reset_in, 0.0)
+
+    def _refund(self, token: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limit_calls WHERE rowid = ?", (token,))
+
+    async def reserve(self, limit: int, window: float) -> Tuple[float, Any]:
+        return await asyncio.to_thread(self._reserve, limit, window)
+
+    async def refund(self, token: Any) -> None:
+        await asyncio.to_thread(self._refund, token)
+
+    async def usage(self, limit: int, window: float) -> Tuple[int, float]:
+        return await asyncio.to_thread(self._usage, window)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_REDIS_RESERVE_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, math.ceil(window * 1000))
+    return '0'
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return tostring(tonumber(oldest[2]) + window - now)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Multi-host backend using a Redis sorted set.
+
+    The client only needs the async eval/zrem/zremrangebyscore/zcard/zrange calls
+    of redis.asyncio, so any Redis-compatible server can be used, or the
+    in-memory LocalRedis stand-in from benchmarks/local_redis.py.
+    """
+
+    def __init__(self, client: Any, key: str = "brandwatch:rate_limit"):
+        self.client = client
+        self.key = key
+        self.last_reserved_at: Optional[float] = None
+
+    async def reserve(self, limit: int, window: float) -> Tuple[float, Any]:
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex}"
+        wait = await self.client.eval(_REDIS_RESERVE_SCRIPT, 1, self.key, now, window, limit, member)
+        if isinstance(wait, bytes):
+            wait = wait.decode()
+        wait = max(float(wait), 0.0)
+        if wait > 0:
+            return wait, None
+        self.last_reserved_at = now
+        return 0.0, member
+
+    async def refund(self, token: Any) -> None:
+        await self.client.zrem(self.key, token)
+
+    async def usage(self, limit: int, window: float) -> Tuple[int, float]:
+        now = time.time()
+        await self.client.zremrangebyscore(self.key, "-inf", now - window)
+        count = await self.client.zcard(self.key)
+        oldest = await self.client.zrange(self.key, 0, 0, withscores=True)
+        reset_in = oldest[0][1] + window - now if oldest else 0.0
+        return int(count), max(reset_in, 0.0)
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close is not None:
+            await close()
+
+
+def create_rate_limit_backend(name: Optional[str] = None) -> RateLimitBackend:
+    """Build the backend selected by BRANDWATCH_RATE_LIMIT_BACKEND (memory, sqlite or redis)"""
+    settings = get_settings()
+    name = (name or settings.brandwatch_rate_limit_backend).lower()
+    if name == "memory":
+        return MemoryRateLimitBackend()
+    if name == "sqlite":
+        return SQLiteRateLimitBackend(settings.brandwatch_rate_limit_sqlite_path)
+    if name == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("The redis rate-limit backend requires the 'redis' package")
+        client = redis.from_url(settings.brandwatch_rate_limit_redis_url)
+        return RedisRateLimitBackend(client)
+    raise ValueError(f"Unknown rate limit backend: {name}")
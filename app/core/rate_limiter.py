@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from app.core.rate_limit_backends import RateLimitBackend, MemoryRateLimitBackend
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a rate-limit slot cannot be obtained before the caller's deadline"""
+
+
+class AsyncRateLimiter:
+    """
+    Sliding-window rate limiter that waits on the event loop.
+
+    Call accounting lives in a RateLimitBackend: the default keeps a deque
+    in this process, shared backends let several workers draw from one
+    budget. Waiters inside a process are served in FIFO order through an
+    asyncio.Lock, and each caller may pass a timeout after which it gives up
+    with RateLimitTimeout.
+    """
+
+    def __init__(self, limit: int, window: float, backend: Optional[RateLimitBackend] = None):
+        self.limit = limit
+        self.window = window
+        self.backend = backend or MemoryRateLimitBackend()
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+
+    async def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Wait for a free slot, record a call against it and return its reservation token"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        self._waiting += 1
+        try:
+            if deadline is None:
+                return await self._acquire(None)
+            return await asyncio.wait_for(self._acquire(deadline), timeout)
+        except asyncio.TimeoutError:
+            raise RateLimitTimeout("Timed out waiting for Brandwatch rate limit")
+        finally:
+            self._waiting -= 1
+
+    async def _acquire(self, deadline: Optional[float]) -> Any:
+        async with self._lock:
+            while True:
+                wait, token = await self.backend.reserve(self.limit, self.window)
+                if wait <= 0:
+                    return token
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise RateLimitTimeout("Brandwatch rate limit would not free up before the deadline")
+                await asyncio.sleep(wait)
+
+    async def refund(self, token: Any) -> None:
+        """Return a slot whose call did not count against the upstream limit"""
+        if token is not None:
+            await self.backend.refund(token)
+
+    async def remaining(self) -> int:
+        """Number of calls that can be made right now without waiting"""
+        used, _ = await self.backend.usage(self.limit, self.window)
+        return max(self.limit - used, 0)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers in this process currently waiting for a slot"""
+        return self._waiting
+
+    async def status(self) -> Dict[str, Any]:
+        """Current budget and queue depth"""
+        used, reset_in = await self.backend.usage(self.limit, self.window)
+        return {
+            "backend": type(self.backend).__name__,
+            "limit": self.limit,
+            "window_seconds": self.window,
+            "used": used,
+            "remaining": max(self.limit - used, 0),
+            "queue_depth": self._waiting,
+            "reset_in_seconds": round(reset_in, 3)
+        }
+
+    async def close(self) -> None:
+        await self.backend.close()
@@ -0,0 +1,123 @@
+import random
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+# Upstream statuses worth retrying for idempotent requests
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class BrandwatchAPIError(Exception):
+    """Raised when Brandwatch answers with an error status or cannot be reached"""
+
+    def __init__(self, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"Brandwatch API error: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in RETRYABLE_STATUSES
+
+
+class CircuitOpenError(BrandwatchAPIError):
+    """Raised without calling upstream while an endpoint's circuit is open"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(503, f"{endpoint} is unavailable, circuit open", retry_after=retry_after)
+
+    @property
+    def retryable(self) -> bool:
+        return False
+
+
+def endpoint_group(endpoint: str) -> str:
+    """Collapse ids so one breaker covers e.g. every projects/{id}/queries/summary call"""
+    return re.sub(r"\d+", "{id}", endpoint)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given as seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream endpoint group.
+
+    After failure_threshold failures in a row the circuit opens and calls
+    fail fast with CircuitOpenError for reset_timeout seconds. Then a single
+    probe call is let through (half-open): success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go upstream now"""
+        if self.state == "open":
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.name, remaining)
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                raise CircuitOpenError(self.name, self.reset_timeout)
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Forget a probe that ended without an upstream verdict (cancelled, rate-limit timeout)"""
+        self._probing = False
+
+    def status(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == "open":
+            retry_in = round(max(self.opened_at + self.reset_timeout - time.monotonic(), 0.0), 3)
+        return {
+            "endpoint": self.name,
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "retry_in_seconds": retry_in
+        }
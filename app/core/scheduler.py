@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """
+    Background task that keeps the response cache warm.
+
+    Each cycle refreshes projects/summary, then queries/summary for every
+    project ordered by recent interactive demand, then the newest mention
+    page of the hottest queries. A job only runs while more than
+    (1 - budget_share) of the rate-limit budget is left, so interactive
+    requests always keep that headroom.
+    """
+
+    def __init__(self, service: Any):
+        settings = get_settings()
+        self.service = service
+        self.enabled = settings.brandwatch_prefetch_enabled
+        self.interval = settings.brandwatch_prefetch_interval
+        self.budget_share = settings.brandwatch_prefetch_budget_share
+        self.hot_queries = settings.brandwatch_prefetch_hot_queries
+        self.mention_page_size = settings.brandwatch_prefetch_mention_limit
+        self._task: Optional[asyncio.Task] = None
+        self.cycles = 0
+        self.last_started: Optional[datetime] = None
+        self.last_finished: Optional[datetime] = None
+        self.next_run: Optional[datetime] = None
+        self.last_status: Optional[str] = None
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background loop if prefetching is enabled"""
+        if self.enabled and not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background loop and wait for it to finish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.next_run = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_cycle()
+            except Exception:
+                logger.exception("Prefetch cycle failed")
+                self.last_status = "error"
+            self.next_run = datetime.utcnow() + timedelta(seconds=self.interval)
+            await asyncio.sleep(self.interval)
+
+    async def _has_budget(self) -> bool:
+        limiter = self.service.rate_limiter
+        reserve = limiter.limit * (1 - self.budget_share)
+        return await limiter.remaining() > reserve
+
+    async def _run_job(self, name: str, job: Callable[[], Awaitable[Any]]) -> bool:
+        """Run one job if the budget allows; return False once the budget is spent"""
+        record = self.jobs.setdefault(name, {"name": name, "runs": 0})
+        if not await self._has_budget():
+            record["status"] = "skipped: budget reserved for interactive requests"
+            return False
+        try:
+            await job()
+            record["status"] = "ok"
+            record.pop("error", None)
+        except Exception as e:
+            logger.warning("Prefetch job %s failed: %s", name, e)
+            record["status"] = "error"
+            record["error"] = str(e)
+        record["runs"] += 1
+        record["last_run"] = datetime.utcnow().isoformat()
+        return True
+
+    def _plan(self, project_ids: List[int]) -> List[Tuple[str, Callable[[], Awaitable[Any]]]]:
+        """Jobs after projects/summary, highest priority first"""
+        service = self.service
+        ranked = sorted(project_ids, key=lambda pid: service.project_hits.get(pid, 0), reverse=True)
+        plan = [
+            (f"projects/{pid}/queries/summary", lambda pid=pid: service.get_queries(pid, refresh=True))
+            for pid in ranked
+        ]
+        for (pid, qid), _ in service.query_hits.most_common(self.hot_queries):
+            plan.append((
+                f"projects/{pid}/mentions?queryId={qid}",
+                lambda pid=pid, qid=qid: service.get_mentions(
+                    pid, query_id=qid, limit=self.mention_page_size, refresh=True
+                )
+            ))
+        return plan
+
+    async def run_cycle(self):
+        """Refresh everything in priority order until the budget share is used"""
+        self.last_started = datetime.utcnow()
+        projects: List[Any] = []
+
+        async def refresh_projects():
+            projects.extend(await self.service.get_projects(refresh=True))
+
+        completed = await self._run_job("projects/summary", refresh_projects)
+        if completed:
+            for name, job in self._plan([project.id for project in projects]):
+                if not await self._run_job(name, job):
+                    completed = False
+                    break
+
+        # Decay demand so priorities follow recent traffic
+        for counter in (self.service.project_hits, self.service.query_hits):
+            for key in list(counter):
+                counter[key] //= 2
+                if counter[key] == 0:
+                    del counter[key]
+
+        self.cycles += 1
+        self.last_finished = datetime.utcnow()
+        self.last_status = "completed" if completed else "budget limited"
+
+    def status(self) -> Dict[str, Any]:
+        """Schedule and last-run status"""
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "budget_share": self.budget_share,
+            "cycles": self.cycles,
+            "last_started": self.last_started.isoformat() if self.last_started else None,
+            "last_finished": self.last_finished.isoformat() if self.last_finished else None,
+            "last_status": self.last_status,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "jobs": list(self.jobs.values())
+        }
@@ -0,0 +1,235 @@
+import heapq
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from app.models.brandwatch import BrandwatchMention
+from app.core.mention_store import to_naive_utc
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Exact-match filter fields -> BrandwatchMention attribute
+FACET_FIELDS = {
+    "project_id": "projectId",
+    "query_id": "queryId",
+    "source": "source",
+    "language": "language",
+    "sentiment": "sentiment",
+    "author": "author"
+}
+# Facets counted over the matches of every search
+COUNTED_FACETS = ("source", "language", "sentiment")
+# Rough per-document cost in bytes of the model, its timestamp and its facet entries
+DOC_OVERHEAD = 1024
+# Rough cost in bytes of one posting entry (list slot, amortised growth)
+POSTING_BYTES = 16
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    """Lower-cased word tokens of text"""
+    return set(TOKEN_PATTERN.findall(text.lower())) if text else set()
+
+
+def estimate_size(mention: BrandwatchMention, tokens: int) -> int:
+    """Approximate memory held by one indexed mention, in bytes"""
+    return DOC_OVERHEAD + len(mention.content) + len(mention.author) + tokens * POSTING_BYTES
+
+
+class _Segment:
+    """
+    A block of indexed mentions with its own postings.
+
+    Documents are only appended; a re-indexed or evicted mention is marked
+    deleted. The timestamp order is built lazily on the first range query
+    after a change.
+    """
+
+    __slots__ = (
+        "docs", "timestamps", "postings", "facets", "values", "deleted", "nbytes", "_order", "_sorted_timestamps"
+    )
+
+    def __init__(self):
+        self.docs: List[BrandwatchMention] = []
+        self.timestamps: List[datetime] = []  # naive UTC, by doc number
+        self.postings: Dict[str, List[int]] = {}
+        self.facets: Dict[str, Dict[Any, List[int]]] = {field: {} for field in FACET_FIELDS}
+        self.values: Dict[str, List[Any]] = {field: [] for field in COUNTED_FACETS}  # by doc number
+        self.deleted: Set[int] = set()
+        self.nbytes = 0
+        self._order: Optional[List[int]] = None
+        self._sorted_timestamps: Optional[List[datetime]] = None
+
+    def add(self, mention: BrandwatchMention) -> int:
+        doc = len(self.docs)
+        self.docs.append(mention)
+        self.timestamps.append(to_naive_utc(mention.timestamp))
+        tokens = tokenize(mention.content)
+        for token in tokens:
+            self.postings.setdefault(token, []).append(doc)
+        self.nbytes += estimate_size(mention, len(tokens))
+        for field, attribute in FACET_FIELDS.items():
+            value = getattr(mention, attribute)
+            self.facets[field].setdefault(value, []).append(doc)
+            if field in self.values:
+                self.values[field].append(value)
+        self._order = None
+        return doc
+
+    def in_range(self, start: Optional[datetime], end: Optional[datetime]) -> List[int]:
+        """Doc numbers with start <= timestamp <= end"""
+        if self._order is None:
+            self._order = sorted(range(len(self.docs)), key=self.timestamps.__getitem__)
+            self._sorted_timestamps = [self.timestamps[doc] for doc in self._order]
+        lo = bisect_left(self._sorted_timestamps, start) if start is not None else 0
+        hi = bisect_right(self._sorted_timestamps, end) if end is not None else len(self._order)
+        return self._order[lo:hi]
+
+    def match(
+        self,
+        terms: Set[str],
+        filters: Dict[str, Any],
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> Set[int]:
+        """Live doc numbers matching every term, every filter and the date range"""
+        lists: List[Sequence[int]] = []
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                return set()
+            lists.append(posting)
+        for field, value in filters.items():
+            posting = self.facets[field].get(value)
+            if not posting:
+                return set()
+            if len(posting) < len(self.docs):  # a value every doc has (often the project) filters nothing
+                lists.append(posting)
+        if start is not None or end is not None or not lists:
+            lists.append(self.in_range(start, end))
+        lists.sort(key=len)
+        docs = set(lists[0])
+        for posting in lists[1:]:
+            if not docs:
+                break
+            docs.intersection_update(posting)
+        docs.difference_update(self.deleted)
+        return docs
+
+
+class MentionSearchIndex:
+    """
+    In-process inverted index over mentions the service has already seen.
+
+    Content is tokenised into postings; project, query, source, language,
+    sentiment and author are exact-match facets; each segment keeps a sorted
+    timestamp order for range queries. Mentions are added to the newest
+    segment and replace any earlier copy (same project, query and id). Once
+    segments hold more than max_mentions documents or an estimated
+    max_bytes, replaced copies included, whole segments are dropped oldest
+    first.
+    All methods are thread-safe so indexing can run off the event loop.
+    """
+
+    def __init__(self, max_mentions: int = 200_000, segment_size: int = 10_000, max_bytes: int = 256 * 1024 * 1024):
+        self.max_mentions = max_mentions
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self._segments: List[_Segment] = [_Segment()]
+        self._locations: Dict[Tuple[int, int, int], Tuple[_Segment, int]] = {}
+        self._docs = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.indexed = 0
+        self.evicted_segments = 0
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def add(self, mentions: Iterable[BrandwatchMention]) -> int:
+        """Index (or re-index) mentions; returns how many were added"""
+        count = 0
+        with self._lock:
+            for mention in mentions:
+                key = (mention.projectId, mention.queryId, mention.id)
+                previous = self._locations.get(key)
+                if previous is not None:
+                    segment, doc = previous
+                    segment.deleted.add(doc)
+                active = self._segments[-1]
+                if len(active.docs) >= self.segment_size:
+                    active = _Segment()
+                    self._segments.append(active)
+                before = active.nbytes
+                self._locations[key] = (active, active.add(mention))
+                self._bytes += active.nbytes - before
+                count += 1
+            self._docs += count
+            self.indexed += count
+            self._evict()
+        return count
+
+    def _evict(self) -> None:
+        while (self._docs > self.max_mentions or self._bytes > self.max_bytes) and len(self._segments) > 1:
+            segment = self._segments.pop(0)
+            for doc, mention in enumerate(segment.docs):
+                if doc not in segment.deleted:
+                    del self._locations[(mention.projectId, mention.queryId, mention.id)]
+            self._docs -= len(segment.docs)
+            self._bytes -= segment.nbytes
+            self.evicted_segments += 1
+
+    def search(
+        self,
+        project_id: int,
+        text: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Mentions of a project containing every word of text and matching the
+        facet filters and date range, newest first, with facet counts over
+        all matches
+        """
+        terms = tokenize(text)
+        filters = {"project_id": project_id, **(filters or {})}
+        start = to_naive_utc(start_date) if start_date else None
+        end = to_naive_utc(end_date) if end_date else None
+        total = 0
+        counts = {field: Counter() for field in COUNTED_FACETS}
+        candidates = []
+        with self._lock:
+            for segment in self._segments:
+                docs = segment.match(terms, filters, start, end)
+                if not docs:
+                    continue
+                total += len(docs)
+                for field, counter in counts.items():
+                    counter.update(map(segment.values[field].__getitem__, docs))
+                # Only a segment's newest offset + limit matches can make the page
+                newest = heapq.nlargest(offset + limit, docs, key=segment.timestamps.__getitem__)
+                candidates.extend((segment.timestamps[doc], id(segment), segment.docs[doc]) for doc in newest)
+        page = heapq.nlargest(offset + limit, candidates, key=lambda item: item[:2])[offset:]
+        facets = {
+            field: {("unknown" if value is None else value): n for value, n in counter.most_common()}
+            for field, counter in counts.items()
+        }
+        return {"total": total, "results": [mention for _, _, mention in page], "facets": facets}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mentions": len(self._locations),
+                "segments": len(self._segments),
+                "max_mentions": self.max_mentions,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "segment_size": self.segment_size,
+                "terms": sum(len(segment.postings) for segment in self._segments),
+                "indexed": self.indexed,
+                "evicted_segments": self.evicted_segments
+            }
@@ -1,20 +1,123 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import HTTPException, status
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
-import os
-from dotenv import load_dotenv
+from sqlalchemy import event, inspect, select
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.user import User
 
-load_dotenv()
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
-# Konfigurasi
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+@lru_cache(maxsize=None)
+def get_password_context() -> "CryptContext":
+    """bcrypt context, built on the first password check rather than at import"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _secret_key() -> str:
+    if not settings.secret_key:
+        raise RuntimeError("SECRET_KEY is not set")
+    return settings.secret_key
+
+# bcrypt is CPU-bound (~250ms per check); run it off the event loop on a bounded pool
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash"
+)
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+class TokenCache:
+    """
+    Bounded LRU of verified token -> claims.
+
+    Entries are dropped once the token's exp claim has passed, so a cached
+    token is never accepted for longer than a fresh decode would accept it.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return claims
+
+    def set(self, token: str, claims: Dict[str, Any]):
+        expires_at = claims.get("exp")
+        if expires_at is None:
+            return
+        self._entries[token] = (claims, float(expires_at))
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+class UserCache:
+    """
+    Short-TTL cache of username -> User row.
+
+    Updates and deletes made through the ORM in this process invalidate the
+    entry immediately; changes made elsewhere are picked up after the TTL.
+    """
+
+    def __init__(self, ttl: float = 30, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+
+    def get(self, username: str) -> Optional[User]:
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[username]
+            return None
+        return user
+
+    def set(self, username: str, user: User):
+        self._entries[username] = (user, time.monotonic() + self.ttl)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, username: Optional[str]):
+        if username is not None:
+            self._entries.pop(username, None)
+
+    def clear(self):
+        self._entries.clear()
+
+token_cache = TokenCache(settings.token_cache_size)
+user_cache = UserCache(ttl=settings.user_cache_ttl)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User):
+    user_cache.invalidate(target.username)
+    # A renamed user must also drop the entry under the old name
+    for username in inspect(target).attrs.username.history.deleted or ():
+        user_cache.invalidate(username)
 
 class Token(BaseModel):
     access_token: str
@@ -24,28 +127,65 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _secret_key(), algorithm=settings.algorithm)
     return encoded_jwt
 
 def verify_token(token: str) -> dict:
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    from jose import JWTError, jwt
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _secret_key(), algorithms=[settings.algorithm])
+        token_cache.set(token, payload)
         return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token tidak valid",
             headers={"WWW-Authenticate": "Bearer"},
-        ) 
\ No newline at end of file
+        )
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    """
+    Resolve the bearer token to an active user, using the token and user caches
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token tidak valid",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    payload = verify_token(token)
+    username = payload.get("sub")
+    if username is None:
+        raise credentials_exception
+
+    user = user_cache.get(username)
+    if user is None:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(User).where(User.username == username))
+            user = result.scalars().first()
+        if user is None:
+            raise credentials_exception
+        user_cache.set(username, user)
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return user
@@ -0,0 +1,92 @@
+import json
+from typing import Any, Dict, Optional
+from fastapi.responses import Response
+from app.core.metrics import SERIALIZATION_SECONDS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    msgpack = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pyarrow = None
+
+# Binary formats for columnar mention responses -> media type
+COLUMNAR_MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "msgpack": "application/msgpack"
+}
+_COLUMNAR_ALIASES = {
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack"
+}
+
+def dumps(data: Any) -> bytes:
+    """Encode JSON-ready data to bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+class JSONBytesResponse(Response):
+    """
+    JSON response for presenter output.
+
+    Returning it from a route skips FastAPI's jsonable_encoder pass; content
+    must already be JSON-ready (or pre-encoded bytes).
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        with SERIALIZATION_SECONDS.time():
+            return dumps(content)
+
+def dumps_msgpack(data: Any) -> bytes:
+    """Encode data as MessagePack; requires the optional msgpack package"""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(data, use_bin_type=True)
+
+def available_columnar_formats() -> Dict[str, str]:
+    """Columnar formats whose encoder is installed -> media type"""
+    installed = {"arrow": pyarrow is not None, "msgpack": msgpack is not None}
+    return {name: media_type for name, media_type in COLUMNAR_MEDIA_TYPES.items() if installed[name]}
+
+def negotiate_columnar(accept: Optional[str]) -> Optional[str]:
+    """
+    Columnar format ("arrow" or "msgpack") the Accept header ranks at least
+    as high as JSON, or None to answer with JSON. Only installed formats are
+    offered and wildcards count for JSON only, so a client gets a binary
+    body only when it names the media type.
+    """
+    if not accept:
+        return None
+    available = available_columnar_formats()
+    best, best_q, json_q = None, 0.0, 0.0
+    for item in accept.split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        media_type = media_type.lower()
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        name = _COLUMNAR_ALIASES.get(media_type)
+        if name in available and q > best_q:
+            best, best_q = name, q
+        elif media_type in ("application/json", "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return best if best is not None and best_q >= json_q else None
@@ -0,0 +1,256 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from app.models.brandwatch import BrandwatchMention
+from app.models.validation import parse_models
+from app.core.config import get_settings
+from app.core.mention_store import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """
+    One client's bounded view of a poller's output.
+
+    New mentions accumulate in a single pending buffer, so a client that
+    falls behind receives everything since its last read as one coalesced
+    batch. Past max_pending the oldest mentions are dropped and counted;
+    the count is reported with the next batch so the client can backfill.
+    """
+
+    def __init__(self, key: Tuple[int, int], max_pending: int):
+        self.key = key
+        self.max_pending = max_pending
+        self._pending: Deque[BrandwatchMention] = deque()
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.delivered = 0
+        self.error: Optional[str] = None
+
+    def publish(self, mentions: List[BrandwatchMention]):
+        self._pending.extend(mentions)
+        overflow = len(self._pending) - self.max_pending
+        for _ in range(max(overflow, 0)):
+            self._pending.popleft()
+        self.dropped += max(overflow, 0)
+        self._ready.set()
+
+    def fail(self, message: str):
+        """Report an upstream problem; cleared once mentions flow again"""
+        self.error = message
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait up to timeout seconds for new mentions or an error; None on timeout.
+        Returns {"mentions", "dropped", "error"} with everything pending since the last call.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        mentions = list(self._pending)
+        self._pending.clear()
+        batch = {"mentions": mentions, "dropped": self.dropped, "error": self.error}
+        self.delivered += len(mentions)
+        self.dropped = 0
+        self.error = None
+        return batch
+
+
+class MentionPoller:
+    """
+    Background task polling Brandwatch for new mentions of one (project, query).
+
+    Each poll asks for mentions from the newest timestamp seen (minus a
+    lookback for late-indexed mentions) up to now. Ids already delivered are
+    remembered in a bounded set, so the overlapping window never repeats a
+    mention. The first poll only records what already exists; every later
+    batch of new mentions is handed to all subscribers. A poll reads at most
+    max_pages pages. Like prefetching, a tick is skipped unless more than
+    (1 - budget_share) of the rate-limit budget is left.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        project_id: int,
+        query_id: int,
+        interval: float,
+        lookback: float,
+        budget_share: float = 1.0,
+        max_pages: int = 1
+    ):
+        self.service = service
+        self.project_id = project_id
+        self.query_id = query_id
+        self.interval = interval
+        self.lookback = timedelta(seconds=lookback)
+        self.budget_share = budget_share
+        self.max_pages = max_pages
+        self.subscribers: Set[Subscriber] = set()
+        self.newest: datetime = datetime.utcnow()
+        self._seen: "OrderedDict[int, None]" = OrderedDict()
+        self.max_seen = 10_000
+        self._primed = False
+        self.polls = 0
+        self.skipped = 0
+        self.published = 0
+        self.last_poll: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                if await self._has_budget():
+                    await self.poll()
+                else:
+                    self.skipped += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Polling mentions of project %s query %s failed: %s", self.project_id, self.query_id, e)
+                self.last_error = str(e)
+                for subscriber in self.subscribers:
+                    subscriber.fail(str(e))
+            await asyncio.sleep(self.interval)
+
+    async def _has_budget(self) -> bool:
+        limiter = self.service.rate_limiter
+        reserve = limiter.limit * (1 - self.budget_share)
+        return await limiter.remaining() > reserve
+
+    async def poll(self) -> int:
+        """Fetch and publish mentions newer than the last poll; returns how many were new"""
+        rows = await self.service.fetch_new_mention_rows(
+            self.project_id, self.query_id, self.newest - self.lookback, max_pages=self.max_pages
+        )
+        self.polls += 1
+        self.last_poll = datetime.utcnow()
+        self.last_error = None
+        fresh = [row for row in rows if row["id"] not in self._seen]
+        if not fresh:
+            self._primed = True
+            return 0
+        mentions = parse_models(BrandwatchMention, fresh)
+        mentions.sort(key=lambda mention: to_naive_utc(mention.timestamp))
+        for mention in mentions:
+            self._seen[mention.id] = None
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        self.newest = max(self.newest, to_naive_utc(mentions[-1].timestamp))
+        if not self._primed:
+            self._primed = True
+            return 0
+        for subscriber in self.subscribers:
+            subscriber.publish(mentions)
+        self.published += len(mentions)
+        return len(mentions)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "project_id": self.project_id,
+            "query_id": self.query_id,
+            "subscribers": len(self.subscribers),
+            "polls": self.polls,
+            "skipped": self.skipped,
+            "published": self.published,
+            "newest": self.newest.isoformat(),
+            "last_poll": self.last_poll.isoformat() if self.last_poll else None,
+            "last_error": self.last_error
+        }
+
+
+class SubscriptionHub:
+    """
+    Shares one MentionPoller per (project, query) between all subscribers.
+
+    The poller starts with the first subscriber and stops with the last, so
+    upstream calls scale with the number of distinct queries watched, not
+    with the number of connected clients. The poll interval is stretched
+    where needed so that max_pollers pollers, each reading up to max_pages
+    pages per poll, together make at most budget_share of the calls the
+    rate limit allows.
+    """
+
+    def __init__(self, service: Any):
+        settings = get_settings()
+        self.service = service
+        self.enabled = settings.brandwatch_subscribe_enabled
+        self.lookback = settings.brandwatch_subscribe_lookback
+        self.max_pollers = settings.brandwatch_subscribe_max_pollers
+        self.budget_share = settings.brandwatch_subscribe_budget_share
+        self.max_pages = settings.brandwatch_subscribe_max_pages
+        self.poll_interval = self._budgeted_interval(settings.brandwatch_subscribe_poll_interval)
+        self.max_pending = settings.brandwatch_subscribe_max_pending  # mentions per client
+        self.heartbeat = settings.brandwatch_subscribe_heartbeat
+        self._pollers: Dict[Tuple[int, int], MentionPoller] = {}
+
+    def _budgeted_interval(self, interval: float) -> float:
+        """The configured interval, or the shortest one that keeps every poller inside the budget share"""
+        limiter = self.service.rate_limiter
+        calls = limiter.limit * self.budget_share  # per window, for all pollers together
+        if calls <= 0:
+            return interval
+        return max(interval, limiter.window * self.max_pollers * self.max_pages / calls)
+
+    def subscribe(self, project_id: int, query_id: int) -> Subscriber:
+        """Attach a new subscriber, starting the query's poller if needed"""
+        key = (project_id, query_id)
+        poller = self._pollers.get(key)
+        if poller is None:
+            if len(self._pollers) >= self.max_pollers:
+                raise RuntimeError(f"At most {self.max_pollers} queries can be watched at once")
+            poller = MentionPoller(
+                self.service, project_id, query_id, self.poll_interval, self.lookback, self.budget_share,
+                self.max_pages
+            )
+            self._pollers[key] = poller
+            poller.start()
+        subscriber = Subscriber(key, self.max_pending)
+        poller.subscribers.add(subscriber)
+        return subscriber
+
+    async def unsubscribe(self, subscriber: Subscriber):
+        """Detach a subscriber, stopping its poller once nobody is left"""
+        poller = self._pollers.get(subscriber.key)
+        if poller is None:
+            return
+        poller.subscribers.discard(subscriber)
+        if not poller.subscribers:
+            del self._pollers[subscriber.key]
+            await poller.stop()
+
+    async def close(self):
+        """Stop every poller"""
+        pollers = list(self._pollers.values())
+        self._pollers.clear()
+        for poller in pollers:
+            await poller.stop()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "poll_interval_seconds": self.poll_interval,
+            "max_pollers": self.max_pollers,
+            "budget_share": self.budget_share,
+            "subscribers": sum(len(poller.subscribers) for poller in self._pollers.values()),
+            "pollers": [poller.status() for poller in self._pollers.values()]
+        }
@@ -1,31 +1,82 @@
+import threading
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import get_settings
 
-load_dotenv()
+Base = declarative_base()
 
-DB_USERNAME = os.getenv("DB_USERNAME")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "3306")
-DB_NAME = os.getenv("DB_NAME", "mcp_brandwatch")
+# Engines are created on first use, so workers that never touch a database
+# skip the driver import and pool setup
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[sessionmaker] = None
+_lock = threading.Lock()
 
-SQLALCHEMY_DATABASE_URL = f"mysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+def get_engine() -> Engine:
+    """MySQL engine for blocking code, created on first call"""
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                engine = create_engine(
+                    get_settings().database_url,
+                    pool_size=5,
+                    max_overflow=10,
+                    pool_timeout=30,
+                    pool_recycle=1800  # Recycle connections after 30 minutes
+                )
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _engine = engine
+    return _engine
 
-# MySQL engine configuration
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800  # Recycle connections after 30 minutes
-)
+def get_async_engine() -> AsyncEngine:
+    """Async engine for request handlers, created on first call"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _lock:
+            if _async_engine is None:
+                settings = get_settings()
+                # ASYNC_DATABASE_URL may point at e.g. sqlite+aiosqlite for tests
+                url = settings.async_database_url or settings.database_url.replace("mysql://", "mysql+aiomysql://", 1)
+                options = {}
+                if not url.startswith("sqlite"):
+                    options = {
+                        "pool_size": 5,
+                        "max_overflow": 10,
+                        "pool_timeout": 30,
+                        "pool_recycle": 1800
+                    }
+                engine = create_async_engine(url, **options)
+                _async_session_factory = sessionmaker(
+                    bind=engine,
+                    class_=AsyncSession,
+                    autoflush=False,
+                    expire_on_commit=False
+                )
+                _async_engine = engine
+    return _async_engine
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def SessionLocal() -> Session:
+    """Open a blocking session on the lazily created engine"""
+    get_engine()
+    return _session_factory()
 
-Base = declarative_base()
+def AsyncSessionLocal() -> AsyncSession:
+    """Open an async session on the lazily created async engine"""
+    get_async_engine()
+    return _async_session_factory()
+
+async def dispose_engines():
+    """Close the pools of whichever engines were created"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
 
 # Dependency
 def get_db():
@@ -33,4 +84,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
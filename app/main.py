@@ -1,11 +1,39 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.routers import auth, brandwatch
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.config import get_settings
+from app.core.security import get_current_user
+from app.database import dispose_engines
+
+settings = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Checked here rather than on the first login, so a misconfigured deploy fails to start
+    if not settings.secret_key:
+        raise RuntimeError("SECRET_KEY must be set to sign access tokens")
+    service = brandwatch.brandwatch_controller.service
+    scheduler = brandwatch.brandwatch_controller.scheduler
+    subscriptions = brandwatch.brandwatch_controller.subscriptions
+    try:
+        await service.start()
+        scheduler.start()
+        yield
+    finally:
+        await subscriptions.close()
+        await scheduler.stop()
+        await service.close()
+        await dispose_engines()
 
 app = FastAPI(
     title="MCP Brandwatch API",
     description="API for MCP integration with Brandwatch",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -17,10 +45,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added before metrics so response sizes are recorded as sent
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.observe_service(brandwatch.brandwatch_controller.service)
+
 # Include routers
 app.include_router(auth.router, tags=["authentication"])
-app.include_router(brandwatch.router, prefix="/api/brandwatch", tags=["brandwatch"])
+app.include_router(
+    brandwatch.router,
+    prefix="/api/brandwatch",
+    tags=["brandwatch"],
+    dependencies=[Depends(get_current_user)]
+)
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to MCP Brandwatch API"} 
\ No newline at end of file
+    return {"message": "Welcome to MCP Brandwatch API"} 
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint; 404 unless METRICS_ENABLED=true"""
+    body = metrics.render_latest()
+    if body is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
 
 class BrandwatchProject(BaseModel):
     id: int
@@ -40,4 +40,46 @@ class BrandwatchMention(BaseModel):
     language: str
     sentiment: Optional[str]
     reach: Optional[int]
-    engagement: Optional[int] 
\ No newline at end of file
+    engagement: Optional[int]
+
+class BatchOperation(BaseModel):
+    action: str
+    params: Dict[str, Any] = {}
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+    max_parallel: Optional[int] = Field(default=None, ge=1, le=100)
+
+# Parameters of each batch action, with the same constraints as the matching route
+class NoParams(BaseModel):
+    pass
+
+class ProjectParams(BaseModel):
+    project_id: int
+
+class MentionParams(ProjectParams):
+    query_id: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    limit: int = Field(default=100, le=1000)
+    fields: Optional[str] = None
+    batches: Optional[bool] = None
+
+class AggregateParams(ProjectParams):
+    start_date: datetime
+    end_date: datetime
+    query_id: Optional[int] = None
+    bucket: Literal["hour", "day", "week"] = "day"
+
+class SearchParams(ProjectParams):
+    q: Optional[str] = None
+    query_id: Optional[int] = None
+    source: Optional[str] = None
+    language: Optional[str] = None
+    sentiment: Optional[str] = None
+    author: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    offset: int = Field(default=0, ge=0)
+    limit: int = Field(default=50, ge=1, le=1000)
+    fields: Optional[str] = None
\ No newline at end of file
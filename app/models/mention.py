@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+class StoredMention(Base):
+    __tablename__ = "brandwatch_mentions"
+
+    project_id = Column(Integer, primary_key=True)
+    query_id = Column(Integer, primary_key=True)
+    id = Column(BigInteger, primary_key=True)
+    content = Column(Text)
+    author = Column(String(255))
+    source = Column(String(255))
+    timestamp = Column(DateTime, nullable=False)
+    language = Column(String(16))
+    sentiment = Column(String(32), nullable=True)
+    reach = Column(BigInteger, nullable=True)
+    engagement = Column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        Index("ix_brandwatch_mentions_project_query_timestamp", "project_id", "query_id", "timestamp"),
+    )
+
+class MentionSyncState(Base):
+    __tablename__ = "brandwatch_mention_sync"
+
+    project_id = Column(Integer, primary_key=True)
+    query_id = Column(Integer, primary_key=True)
+    synced_from = Column(DateTime, nullable=False)  # oldest timestamp fully stored
+    synced_until = Column(DateTime, nullable=False)  # end of the last completed sync
+    high_water_mark = Column(DateTime, nullable=True)  # newest mention timestamp stored
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
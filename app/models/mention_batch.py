@@ -0,0 +1,277 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.models.brandwatch import BrandwatchMention
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _encode(values: Iterable[Optional[str]], count: int) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Dictionary-encode strings into int32 codes and a category list"""
+    index: Dict[Optional[str], int] = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int32, count=count)
+    return codes, list(index)
+
+def _to_micros(value: datetime) -> Tuple[int, bool, int]:
+    """UTC microseconds since the epoch, whether value is aware, and its UTC offset in seconds"""
+    offset = value.utcoffset()
+    if offset is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return micros, offset is not None, int(offset.total_seconds()) if offset is not None else 0
+
+def _format_offset(seconds: int) -> str:
+    """A UTC offset as datetime.isoformat() writes it, e.g. +02:00"""
+    sign = "-" if seconds < 0 else "+"
+    hours, rest = divmod(abs(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}" + (f":{seconds:02d}" if seconds else "")
+
+def parse_timestamp(value: Any) -> datetime:
+    """Parse a Brandwatch ISO 8601 timestamp, accepting a trailing Z"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00") if value.endswith("Z") else value)
+
+class MentionBatch:
+    """
+    A page of mentions stored as columns.
+
+    Numeric fields are typed NumPy arrays (timestamps as UTC microseconds
+    with each row's original UTC offset kept beside them, missing
+    reach/engagement as NaN); source, language, sentiment and author are
+    dictionary-encoded as int32 codes into a list of categories.
+
+    equals/between give row masks and take selects rows, so callers filter
+    without leaving columns; to_mentions is the opt-out back to models.
+    """
+
+    ENCODED = ("source", "language", "sentiment", "author")
+    # Flat column names used by to_columns/to_arrow, in output order
+    COLUMNS = (
+        "id", "content", "author", "source", "timestamp", "query_id", "project_id",
+        "language", "sentiment", "reach", "engagement"
+    )
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        timestamps: np.ndarray,
+        tz_aware: np.ndarray,
+        utc_offsets: np.ndarray,
+        query_ids: np.ndarray,
+        project_ids: np.ndarray,
+        reach: np.ndarray,
+        engagement: np.ndarray,
+        content: List[str],
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[Optional[str]]]
+    ):
+        self.ids = ids
+        self.timestamps = timestamps
+        self.tz_aware = tz_aware
+        self.utc_offsets = utc_offsets  # seconds, 0 for naive timestamps
+        self.query_ids = query_ids
+        self.project_ids = project_ids
+        self.reach = reach
+        self.engagement = engagement
+        self.content = content
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def _build(cls, rows: Sequence[Any], get) -> "MentionBatch":
+        n = len(rows)
+        micros = np.empty(n, dtype=np.int64)
+        aware = np.empty(n, dtype=np.bool_)
+        offsets = np.empty(n, dtype=np.int32)
+        for i, row in enumerate(rows):
+            micros[i], aware[i], offsets[i] = _to_micros(parse_timestamp(get(row, "timestamp")))
+        codes = {}
+        categories = {}
+        for name in cls.ENCODED:
+            codes[name], categories[name] = _encode((get(row, name) for row in rows), n)
+        return cls(
+            ids=np.fromiter((get(row, "id") for row in rows), dtype=np.int64, count=n),
+            timestamps=micros,
+            tz_aware=aware,
+            utc_offsets=offsets,
+            query_ids=np.fromiter((get(row, "queryId") for row in rows), dtype=np.int64, count=n),
+            project_ids=np.fromiter((get(row, "projectId") for row in rows), dtype=np.int64, count=n),
+            reach=np.array([get(row, "reach") for row in rows], dtype=np.float64) if n else np.empty(0),
+            engagement=np.array([get(row, "engagement") for row in rows], dtype=np.float64) if n else np.empty(0),
+            content=[get(row, "content") for row in rows],
+            codes=codes,
+            categories=categories
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "MentionBatch":
+        """Build a batch straight from Brandwatch JSON rows without Pydantic models"""
+        return cls._build(records, lambda row, name: row.get(name))
+
+    @classmethod
+    def from_mentions(cls, mentions: Sequence[BrandwatchMention]) -> "MentionBatch":
+        """Build a batch from validated mention models"""
+        return cls._build(mentions, getattr)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch"""
+        arrays = [
+            self.ids, self.timestamps, self.tz_aware, self.utc_offsets,
+            self.query_ids, self.project_ids, self.reach, self.engagement
+        ]
+        total = sum(a.nbytes for a in arrays) + sum(c.nbytes for c in self.codes.values())
+        total += sum(len(text) for text in self.content if text)
+        total += sum(len(v) for cats in self.categories.values() for v in cats if v)
+        return total
+
+    def decode(self, name: str) -> List[Optional[str]]:
+        """Decode a dictionary-encoded column back to a list of strings"""
+        categories = self.categories[name]
+        return [categories[code] for code in self.codes[name].tolist()]
+
+    def equals(self, name: str, value: Optional[str]) -> np.ndarray:
+        """Boolean mask of rows whose encoded column equals value"""
+        try:
+            code = self.categories[name].index(value)
+        except ValueError:
+            return np.zeros(len(self), dtype=np.bool_)
+        return self.codes[name] == code
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> np.ndarray:
+        """Boolean mask of rows with start <= timestamp <= end (naive datetimes are UTC)"""
+        mask = np.ones(len(self), dtype=np.bool_)
+        if start is not None:
+            mask &= self.timestamps >= _to_micros(start)[0]
+        if end is not None:
+            mask &= self.timestamps <= _to_micros(end)[0]
+        return mask
+
+    def take(self, indices: np.ndarray) -> "MentionBatch":
+        """New batch with the selected rows (boolean mask or integer indices)"""
+        if indices.dtype == np.bool_:
+            indices = np.flatnonzero(indices)
+        return MentionBatch(
+            ids=self.ids[indices],
+            timestamps=self.timestamps[indices],
+            tz_aware=self.tz_aware[indices],
+            utc_offsets=self.utc_offsets[indices],
+            query_ids=self.query_ids[indices],
+            project_ids=self.project_ids[indices],
+            reach=self.reach[indices],
+            engagement=self.engagement[indices],
+            content=[self.content[i] for i in indices.tolist()],
+            codes={name: codes[indices] for name, codes in self.codes.items()},
+            categories=self.categories
+        )
+
+    def datetimes(self) -> List[datetime]:
+        """Timestamps as datetimes, aware ones in their original offset"""
+        values = []
+        for micros, aware, offset in zip(self.timestamps.tolist(), self.tz_aware.tolist(), self.utc_offsets.tolist()):
+            value = _EPOCH + timedelta(microseconds=micros)
+            values.append(value.astimezone(timezone(timedelta(seconds=offset))) if aware else value.replace(tzinfo=None))
+        return values
+
+    def to_mentions(self) -> List[BrandwatchMention]:
+        """Materialise the rows as BrandwatchMention models"""
+        timestamps = self.datetimes()
+        reach = [None if v != v else int(v) for v in self.reach.tolist()]
+        engagement = [None if v != v else int(v) for v in self.engagement.tolist()]
+        decoded = {name: self.decode(name) for name in self.ENCODED}
+        return [
+            BrandwatchMention(
+                id=mention_id,
+                content=self.content[i],
+                author=decoded["author"][i],
+                source=decoded["source"][i],
+                timestamp=timestamps[i],
+                queryId=query_id,
+                projectId=project_id,
+                language=decoded["language"][i],
+                sentiment=decoded["sentiment"][i],
+                reach=reach[i],
+                engagement=engagement[i]
+            )
+            for i, (mention_id, query_id, project_id) in enumerate(zip(
+                self.ids.tolist(), self.query_ids.tolist(), self.project_ids.tolist()
+            ))
+        ]
+
+    def isoformat_timestamps(self) -> List[str]:
+        """Timestamps as ISO 8601 strings in their original offset, matching datetime.isoformat()"""
+        local = self.timestamps + self.utc_offsets.astype(np.int64) * 1_000_000
+        values = local.astype("datetime64[us]")
+        strings = np.where(
+            local % 1_000_000 == 0,
+            np.datetime_as_string(values, unit="s"),
+            np.datetime_as_string(values, unit="us")
+        )
+        if self.tz_aware.any():
+            offsets, index = np.unique(self.utc_offsets, return_inverse=True)
+            suffixes = np.array([_format_offset(int(offset)) for offset in offsets])[index]
+            strings = np.where(self.tz_aware, np.char.add(strings, suffixes), strings)
+        return strings.tolist()
+
+    def to_columns(self, fields: Optional[Sequence[str]] = None) -> Dict[str, List[Any]]:
+        """
+        Columns as plain lists keyed by COLUMNS names, optionally only fields.
+        Timestamps are ISO 8601 strings and missing reach/engagement are None,
+        as in the JSON output.
+        """
+        getters = {
+            "id": lambda: self.ids.tolist(),
+            "content": lambda: self.content,
+            "timestamp": self.isoformat_timestamps,
+            "query_id": lambda: self.query_ids.tolist(),
+            "project_id": lambda: self.project_ids.tolist(),
+            "reach": lambda: [None if v != v else int(v) for v in self.reach.tolist()],
+            "engagement": lambda: [None if v != v else int(v) for v in self.engagement.tolist()]
+        }
+        columns = {}
+        for name in fields or self.COLUMNS:
+            columns[name] = self.decode(name) if name in self.codes else getters[name]()
+        return columns
+
+    def to_arrow(self, fields: Optional[Sequence[str]] = None) -> bytes:
+        """
+        The batch as an Arrow IPC stream, optionally only fields. Numeric
+        columns are handed over from NumPy, encoded columns stay
+        dictionary-encoded and timestamps are UTC microseconds.
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow is not installed")
+
+        def dictionary(name: str):
+            categories = self.categories[name]
+            codes = self.codes[name]
+            mask = codes == categories.index(None) if None in categories else None
+            return pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=mask), pa.array([c or "" for c in categories], pa.string())
+            )
+
+        builders = {
+            "id": lambda: pa.array(self.ids),
+            "content": lambda: pa.array(self.content, pa.string()),
+            "timestamp": lambda: pa.array(self.timestamps, pa.timestamp("us", tz="UTC")),
+            "query_id": lambda: pa.array(self.query_ids),
+            "project_id": lambda: pa.array(self.project_ids),
+            "reach": lambda: pa.array(self.reach, pa.float64(), from_pandas=True).cast(pa.int64()),
+            "engagement": lambda: pa.array(self.engagement, pa.float64(), from_pandas=True).cast(pa.int64())
+        }
+        names = list(fields or self.COLUMNS)
+        table = pa.table([dictionary(name) if name in self.codes else builders[name]() for name in names], names=names)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
@@ -0,0 +1,103 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Type, TypeVar, Union, get_args, get_origin, get_type_hints
+from pydantic import BaseModel, create_model
+from typing_extensions import TypedDict
+from app.models.mention_batch import parse_timestamp
+
+try:
+    from pydantic import TypeAdapter
+except ImportError:  # pydantic v1
+    from pydantic import parse_obj_as
+    TypeAdapter = None
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _construct(model: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+    """Build a model from field values without running validation"""
+    if TypeAdapter is None:
+        return model.construct(**values)
+    return model.model_construct(**values)
+
+
+@lru_cache(maxsize=None)
+def _row_keys(model: Type[BaseModel]) -> Dict[str, str]:
+    """Upstream row key (the alias, if any) for each field name"""
+    if TypeAdapter is None:
+        return {name: field.alias for name, field in model.__fields__.items()}
+    return {name: field.alias or name for name, field in model.model_fields.items()}
+
+
+@lru_cache(maxsize=None)
+def _list_validator(model: Type[BaseModel]):
+    """One validator for a whole list of rows (TypeAdapter on pydantic v2)"""
+    if TypeAdapter is not None:
+        return TypeAdapter(List[model]).validate_python
+    return lambda rows: parse_obj_as(List[model], rows)
+
+
+@lru_cache(maxsize=None)
+def _partial_validator(model: Type[BaseModel], fields: FrozenSet[str]):
+    """Validator for a list of rows checking only the given fields; yields one dict per row"""
+    hints = get_type_hints(model)
+    if TypeAdapter is not None:
+        # TypedDict validation returns plain dicts, skipping model instance creation
+        partial = TypedDict(f"{model.__name__}Partial", {name: hints[name] for name in fields})
+        return TypeAdapter(List[partial]).validate_python
+    partial = create_model(f"{model.__name__}Partial", **{name: (hints[name], ...) for name in fields})
+    return lambda rows: [item.__dict__ for item in parse_obj_as(List[partial], rows)]
+
+
+@lru_cache(maxsize=None)
+def _datetime_fields(model: Type[BaseModel]) -> FrozenSet[str]:
+    """Fields typed datetime or Optional[datetime]"""
+    names = set()
+    for name, hint in get_type_hints(model).items():
+        if hint is datetime or (get_origin(hint) is Union and datetime in get_args(hint)):
+            names.add(name)
+    return frozenset(names)
+
+
+def validate_rows(model: Type[BaseModel], rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Check rows against every field of model and return them as plain dicts
+    of the validated values, for callers that build columns rather than models
+    """
+    return _partial_validator(model, frozenset(_row_keys(model)))(rows)
+
+
+def parse_models(
+    model: Type[ModelT],
+    rows: Sequence[Dict[str, Any]],
+    fields: Optional[Sequence[str]] = None,
+    validate: bool = True
+) -> List[ModelT]:
+    """
+    Build models from upstream JSON rows.
+
+    With fields, only those fields are read from each row; the models are
+    partially populated and other attributes must not be accessed.
+
+    validate=False trusts the rows: values are copied as-is apart from
+    datetime fields, which are parsed, and the models are built with
+    construct (model_construct on pydantic v2).
+    """
+    names = frozenset(fields) if fields is not None else None
+    if validate:
+        if names is None:
+            return _list_validator(model)(rows)
+        return [_construct(model, values) for values in _partial_validator(model, names)(rows)]
+
+    timestamps = _datetime_fields(model)
+    keys = _row_keys(model)
+    wanted = names if names is not None else frozenset(keys)
+    parsed = wanted & timestamps
+    models = []
+    for row in rows:
+        values = {name: row.get(keys[name]) for name in wanted}
+        for name in parsed:
+            if values[name] is not None:
+                values[name] = parse_timestamp(values[name])
+        models.append(_construct(model, values))
+    return models
@@ -1,15 +1,39 @@
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 from app.interfaces.base import IPresenter
 from app.models.brandwatch import BrandwatchProject, BrandwatchQuery, BrandwatchMention
+from app.models.mention_batch import MentionBatch
+from app.core.serialization import dumps, dumps_msgpack
+from app.core.metrics import PRESENTER_SECONDS
+
+# Selectable mention output fields, in output order: name -> (enclosing keys, BrandwatchMention attribute)
+MENTION_FIELDS = {
+    "id": ((), "id"),
+    "content": ((), "content"),
+    "author": ((), "author"),
+    "source": ((), "source"),
+    "timestamp": ((), "timestamp"),
+    "query_id": (("metadata",), "queryId"),
+    "project_id": (("metadata",), "projectId"),
+    "language": (("metadata",), "language"),
+    "sentiment": (("metadata",), "sentiment"),
+    "reach": (("metadata", "metrics"), "reach"),
+    "engagement": (("metadata", "metrics"), "engagement")
+}
+
+class StreamInterrupted:
+    """Last item of a stream whose source failed after the response had started"""
+
+    def __init__(self, error: str):
+        self.error = error
 
 class BrandwatchPresenter(IPresenter):
-    def transform_data(self, data: Any) -> Dict[str, Any]:
+    def transform_data(self, data: Any, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         if isinstance(data, BrandwatchProject):
             return self.transform_project_data(data)
         elif isinstance(data, BrandwatchQuery):
             return self.transform_query_data(data)
         elif isinstance(data, BrandwatchMention):
-            return self.transform_mention_data(data)
+            return self.transform_mention_data(data, fields)
         raise ValueError("Unsupported data type")
 
     def transform_project_data(self, data: BrandwatchProject) -> Dict[str, Any]:
@@ -53,7 +77,13 @@ class BrandwatchPresenter(IPresenter):
             }
         }
 
-    def transform_mention_data(self, data: BrandwatchMention) -> Dict[str, Any]:
+    def transform_mention_data(self, data: BrandwatchMention, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Transform a mention; fields (names from MENTION_FIELDS) keeps only
+        those leaves of the usual nested shape
+        """
+        if fields is not None:
+            return self._project_mention(data, fields)
         return {
             "id": data.id,
             "content": data.content,
@@ -72,5 +102,129 @@ class BrandwatchPresenter(IPresenter):
             }
         }
 
-    def transform_list(self, items: List[Any]) -> List[Dict[str, Any]]:
-        return [self.transform_data(item) for item in items] 
\ No newline at end of file
+    def _project_mention(self, data: BrandwatchMention, fields: Sequence[str]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for field in fields:
+            path, attribute = MENTION_FIELDS[field]
+            value = getattr(data, attribute)
+            if attribute == "timestamp":
+                value = value.isoformat()
+            target = result
+            for key in path:
+                target = target.setdefault(key, {})
+            target[field] = value
+        return result
+
+    def transform_list(self, items: List[Any], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        with PRESENTER_SECONDS.time("transform_list"):
+            return [self.transform_data(item, fields) for item in items]
+
+    def transform_batch(self, batch: MentionBatch, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Transform a columnar mention batch, column by column, into the same
+        shape as transform_mention_data, optionally only fields
+        """
+        with PRESENTER_SECONDS.time("transform_batch"):
+            if fields is not None:
+                return self._project_batch(batch, fields)
+            return self._transform_batch(batch)
+
+    def _project_batch(self, batch: MentionBatch, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        columns = batch.to_columns(fields)
+        results = []
+        for i in range(len(batch)):
+            result: Dict[str, Any] = {}
+            for field in fields:
+                target = result
+                for key in MENTION_FIELDS[field][0]:
+                    target = target.setdefault(key, {})
+                target[field] = columns[field][i]
+            results.append(result)
+        return results
+
+    def _transform_batch(self, batch: MentionBatch) -> List[Dict[str, Any]]:
+        timestamps = batch.isoformat_timestamps()
+        authors = batch.decode("author")
+        sources = batch.decode("source")
+        languages = batch.decode("language")
+        sentiments = batch.decode("sentiment")
+        reach = [None if v != v else int(v) for v in batch.reach.tolist()]
+        engagement = [None if v != v else int(v) for v in batch.engagement.tolist()]
+        return [
+            {
+                "id": mention_id,
+                "content": batch.content[i],
+                "author": authors[i],
+                "source": sources[i],
+                "timestamp": timestamps[i],
+                "metadata": {
+                    "query_id": query_id,
+                    "project_id": project_id,
+                    "language": languages[i],
+                    "sentiment": sentiments[i],
+                    "metrics": {
+                        "reach": reach[i],
+                        "engagement": engagement[i]
+                    }
+                }
+            }
+            for i, (mention_id, query_id, project_id) in enumerate(zip(
+                batch.ids.tolist(), batch.query_ids.tolist(), batch.project_ids.tolist()
+            ))
+        ]
+
+    def encode_columns(self, batch: MentionBatch, columnar_format: str, fields: Optional[Sequence[str]] = None) -> bytes:
+        """
+        Encode a mention batch as columns ("arrow" IPC stream or "msgpack" map of lists)
+        """
+        with PRESENTER_SECONDS.time("encode_columns"):
+            if columnar_format == "arrow":
+                return batch.to_arrow(fields)
+            return dumps_msgpack(batch.to_columns(fields))
+
+    def sse_event(self, event: str, data: Any) -> bytes:
+        """
+        Encode one server-sent event; JSON never contains a raw newline, so data fits on one line
+        """
+        return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+    async def stream_ndjson(self, items: AsyncIterator[Any], chunk_size: int = 100) -> AsyncIterator[bytes]:
+        """
+        Transform items as they arrive and yield them as newline-delimited JSON.
+        A StreamInterrupted item ends the stream with an {"error": ...} line
+        """
+        chunk = []
+        async for item in items:
+            if isinstance(item, StreamInterrupted):
+                chunk.append(dumps({"error": item.error}))
+                break
+            chunk.append(dumps(self.transform_data(item)))
+            if len(chunk) >= chunk_size:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+
+    async def stream_json_array(self, items: AsyncIterator[Any], chunk_size: int = 100) -> AsyncIterator[bytes]:
+        """
+        Transform items as they arrive and yield them as one JSON array.
+        A StreamInterrupted item ends the body without the closing bracket,
+        so a cut-short array never parses as complete
+        """
+        yield b"["
+        chunk = []
+        first = True
+        interrupted = False
+        async for item in items:
+            if isinstance(item, StreamInterrupted):
+                interrupted = True
+                break
+            chunk.append(dumps(self.transform_data(item)))
+            if len(chunk) >= chunk_size:
+                yield (b"" if first else b",") + b",".join(chunk)
+                first = False
+                chunk = []
+        if chunk:
+            yield (b"" if first else b",") + b",".join(chunk)
+        if not interrupted:
+            yield b"]"
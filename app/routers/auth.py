@@ -1,48 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Any
 
 from app.core.security import (
-    verify_password,
+    verify_password_async,
     create_access_token,
-    ACCESS_TOKEN_EXPIRE_MINUTES,
     Token,
     get_current_user
 )
-from app.database import get_db
+from app.core.config import get_settings
+from app.database import get_async_db
 from app.models.user import User
 from app.controllers.user_controller import UserController
 from app.presenters.user_presenter import UserPresenter
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 user_presenter = UserPresenter()
 user_controller = UserController(user_presenter)
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.username == form_data.username))
+    user = result.scalars().first()
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token_expires = timedelta(minutes=get_settings().access_token_expire_minutes)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me")
-async def read_users_me():
+async def read_users_me(current_user: User = Depends(get_current_user)):
     """
     Get current user information
     """
-    request_data = {"action": "get_current_user"}
+    request_data = {
+        "action": "get_current_user",
+        "current_user": current_user
+    }
     return await user_controller.handle_request(request_data) 
\ No newline at end of file
@@ -1,20 +1,74 @@
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Literal, Optional
 from datetime import datetime
 from app.controllers.brandwatch_controller import BrandwatchController
 from app.presenters.brandwatch_presenter import BrandwatchPresenter
+from app.core.serialization import COLUMNAR_MEDIA_TYPES, JSONBytesResponse, negotiate_columnar
+from app.models.brandwatch import BatchRequest
 
 router = APIRouter()
 brandwatch_presenter = BrandwatchPresenter()
 brandwatch_controller = BrandwatchController(brandwatch_presenter)
 
+@router.get("/rate-limit")
+async def get_rate_limit_status():
+    """
+    Get remaining Brandwatch call budget and number of queued requests
+    """
+    request_data = {"action": "get_rate_limit_status"}
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.get("/scheduler")
+async def get_scheduler_status():
+    """
+    Get the cache-warming schedule and the status of its last run
+    """
+    request_data = {"action": "get_scheduler_status"}
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.get("/upstream")
+async def get_upstream_status():
+    """
+    Get circuit breaker state per Brandwatch endpoint and the retry count
+    """
+    request_data = {"action": "get_upstream_status"}
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.get("/subscriptions")
+async def get_subscription_status():
+    """
+    Get the shared mention pollers and their subscriber counts
+    """
+    request_data = {"action": "get_subscription_status"}
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.get("/cache")
+async def get_cache_stats():
+    """
+    Get response cache hit/miss counters
+    """
+    request_data = {"action": "get_cache_stats"}
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.delete("/cache")
+async def invalidate_cache(project_id: Optional[int] = None):
+    """
+    Drop cached Brandwatch responses for a project, or all of them
+    """
+    request_data = {
+        "action": "invalidate_cache",
+        "project_id": project_id
+    }
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
 @router.get("/projects")
 async def get_projects():
     """
     Get list of all projects
     """
     request_data = {"action": "get_projects"}
-    return await brandwatch_controller.handle_request(request_data)
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
 
 @router.get("/projects/{project_id}")
 async def get_project(project_id: int):
@@ -25,7 +79,7 @@ async def get_project(project_id: int):
         "action": "get_project",
         "project_id": project_id
     }
-    return await brandwatch_controller.handle_request(request_data)
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
 
 @router.get("/projects/{project_id}/queries")
 async def get_queries(project_id: int):
@@ -36,25 +90,210 @@ async def get_queries(project_id: int):
         "action": "get_queries",
         "project_id": project_id
     }
-    return await brandwatch_controller.handle_request(request_data)
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
 
 @router.get("/projects/{project_id}/mentions")
 async def get_mentions(
+    request: Request,
     project_id: int,
     query_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    limit: int = Query(default=100, le=1000)
+    limit: int = Query(default=100, le=1000),
+    fields: Optional[str] = Query(default=None, description="Comma-separated subset, e.g. id,timestamp,sentiment"),
+    batches: Optional[bool] = Query(
+        default=None, description="false builds Pydantic models for this request; default BRANDWATCH_MENTION_BATCHES"
+    )
 ):
     """
-    Get mentions with optional filtering
+    Get mentions with optional filtering; fields returns only the listed mention fields.
+    Accept: application/vnd.apache.arrow.stream or application/msgpack returns columns instead of JSON
     """
+    columnar_format = negotiate_columnar(request.headers.get("accept"))
     request_data = {
         "action": "get_mentions",
         "project_id": project_id,
         "query_id": query_id,
         "start_date": start_date.isoformat() if start_date else None,
         "end_date": end_date.isoformat() if end_date else None,
-        "limit": limit
+        "limit": limit,
+        "fields": fields,
+        "columnar_format": columnar_format,
+        "batches": batches
+    }
+    body = await brandwatch_controller.handle_request(request_data)
+    if columnar_format:
+        return Response(body, media_type=COLUMNAR_MEDIA_TYPES[columnar_format], headers={"Vary": "Accept"})
+    return JSONBytesResponse(body, headers={"Vary": "Accept"})
+
+@router.get("/projects/{project_id}/search")
+async def search_mentions(
+    project_id: int,
+    q: Optional[str] = None,
+    query_id: Optional[int] = None,
+    source: Optional[str] = None,
+    language: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    author: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=1000),
+    fields: Optional[str] = None
+):
+    """
+    Search mentions already fetched or synced, without calling Brandwatch.
+    q matches mentions containing every word; results are newest first with
+    source/language/sentiment counts over all matches
+    """
+    request_data = {
+        "action": "search_mentions",
+        "project_id": project_id,
+        "q": q,
+        "query_id": query_id,
+        "source": source,
+        "language": language,
+        "sentiment": sentiment,
+        "author": author,
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+        "offset": offset,
+        "limit": limit,
+        "fields": fields
+    }
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.get("/projects/{project_id}/mentions/stream")
+async def stream_mentions(
+    project_id: int,
+    query_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    page_size: int = Query(default=1000, le=1000),
+    max_results: Optional[int] = Query(default=None, ge=1),
+    format: Literal["ndjson", "json"] = "ndjson"
+):
+    """
+    Stream all mentions matching the filters, following Brandwatch page cursors
+    """
+    request_data = {
+        "action": "stream_mentions",
+        "project_id": project_id,
+        "query_id": query_id,
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+        "page_size": page_size,
+        "max_results": max_results,
+        "format": format
+    }
+    body = await brandwatch_controller.handle_request(request_data)
+    media_type = "application/json" if format == "json" else "application/x-ndjson"
+    return StreamingResponse(body, media_type=media_type)
+
+@router.get("/projects/{project_id}/mentions/export")
+async def export_mentions(
+    request: Request,
+    project_id: int,
+    start_date: datetime,
+    end_date: datetime,
+    query_id: Optional[int] = None,
+    shards: int = Query(default=4, ge=1, le=64),
+    max_parallel: Optional[int] = Query(default=None, ge=1, le=16),
+    format: Literal["ndjson", "json"] = "ndjson"
+):
+    """
+    Export every mention in a date range, fetched as parallel time shards.
+    Accept: application/vnd.apache.arrow.stream or application/msgpack returns columns instead of JSON
+    """
+    columnar_format = negotiate_columnar(request.headers.get("accept"))
+    request_data = {
+        "action": "export_mentions",
+        "project_id": project_id,
+        "query_id": query_id,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "shards": shards,
+        "max_parallel": max_parallel,
+        "format": format,
+        "columnar_format": columnar_format
     }
-    return await brandwatch_controller.handle_request(request_data) 
\ No newline at end of file
+    body = await brandwatch_controller.handle_request(request_data)
+    if columnar_format:
+        return Response(body, media_type=COLUMNAR_MEDIA_TYPES[columnar_format], headers={"Vary": "Accept"})
+    media_type = "application/json" if format == "json" else "application/x-ndjson"
+    return StreamingResponse(body, media_type=media_type)
+
+@router.post("/projects/{project_id}/queries/{query_id}/sync")
+async def sync_mentions(project_id: int, query_id: int, start_date: Optional[datetime] = None):
+    """
+    Fetch mentions newer than the stored high-water mark into the local store
+    """
+    request_data = {
+        "action": "sync_mentions",
+        "project_id": project_id,
+        "query_id": query_id,
+        "start_date": start_date.isoformat() if start_date else None
+    }
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.get("/projects/{project_id}/queries/{query_id}/subscribe")
+async def subscribe_mentions(
+    project_id: int,
+    query_id: int,
+    fields: Optional[str] = Query(default=None, description="Comma-separated subset, e.g. id,timestamp,sentiment")
+):
+    """
+    Server-sent events with each batch of new mentions for a query.
+    All subscribers of a query share one Brandwatch poller; a slow client
+    gets pending mentions coalesced and is told how many were dropped
+    """
+    request_data = {
+        "action": "subscribe_mentions",
+        "project_id": project_id,
+        "query_id": query_id,
+        "fields": fields
+    }
+    body = await brandwatch_controller.handle_request(request_data)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(body, media_type="text/event-stream", headers=headers)
+
+@router.get("/projects/{project_id}/queries/{query_id}/sync")
+async def get_sync_state(project_id: int, query_id: int):
+    """
+    Get the locally stored date range for a query
+    """
+    request_data = {
+        "action": "get_sync_state",
+        "project_id": project_id,
+        "query_id": query_id
+    }
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.get("/projects/{project_id}/aggregates")
+async def get_aggregates(
+    project_id: int,
+    start_date: datetime,
+    end_date: datetime,
+    query_id: Optional[int] = None,
+    bucket: Literal["hour", "day", "week"] = "day"
+):
+    """
+    Get mention counts, sentiment breakdown and reach/engagement stats per time bucket
+    """
+    request_data = {
+        "action": "get_aggregates",
+        "project_id": project_id,
+        "query_id": query_id,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "bucket": bucket
+    }
+    return JSONBytesResponse(await brandwatch_controller.handle_request(request_data))
+
+@router.post("/batch")
+async def run_batch(batch: BatchRequest):
+    """
+    Run several project, query, mention or aggregate lookups in one request
+    """
+    operations = [{"action": op.action, "params": op.params} for op in batch.operations]
+    return JSONBytesResponse(await brandwatch_controller.handle_batch(operations, batch.max_parallel))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare response encodings for a mention page: CPU cost against bytes saved.
+
+Encodes one page of mentions as JSON (the presenter output), MessagePack
+columns and an Arrow IPC stream, then compresses each with the content
+codings CompressionMiddleware can use (gzip always; brotli and zstd when
+installed) at a few levels. For every combination it reports encode and
+compress time, body size, and the estimated time to deliver the body over
+a link of --bandwidth Mbit/s with --rtt seconds of round trip, which is
+what a cross-region consumer actually waits for.
+
+Usage:
+    python benchmarks/bench_encoding.py --mentions 10000 --bandwidth 50 --rtt 0.15
+"""
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core import compression, serialization
+from app.models.brandwatch import BrandwatchMention
+from app.models.mention_batch import MentionBatch
+from app.presenters.brandwatch_presenter import BrandwatchPresenter
+from benchmarks.bench_mention_batch import make_records
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def compressors():
+    """(label, coding, level) for every installed coding at a few levels"""
+    yield "identity", None, None
+    for level in (1, 6, 9):
+        yield f"gzip-{level}", "gzip", level
+    if compression.brotli is not None:
+        for quality in (1, 4, 11):
+            yield f"br-{quality}", "br", quality
+    if compression.zstandard is not None:
+        for level in (1, 3, 9):
+            yield f"zstd-{level}", "zstd", level
+
+
+def compress(coding, level, body, chunk_size):
+    """Run body through the middleware's streaming compressor in chunk_size pieces, flushing each"""
+    stream = compression.available_encodings()[coding](level)
+    out = []
+    for offset in range(0, len(body), chunk_size):
+        piece = body[offset:offset + chunk_size]
+        last = offset + chunk_size >= len(body)
+        out.append(stream.compress(piece) + (stream.finish() if last else stream.flush()))
+    return b"".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mentions", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--bandwidth", type=float, default=50.0, help="client link in Mbit/s")
+    parser.add_argument("--rtt", type=float, default=0.15, help="round trip seconds (slow start ignored)")
+    parser.add_argument(
+        "--chunk-size", type=int, default=0,
+        help="compress in chunks of this many bytes with a flush after each, as for streamed bodies (0: one chunk)"
+    )
+    args = parser.parse_args()
+
+    presenter = BrandwatchPresenter()
+    mentions = [BrandwatchMention(**record) for record in make_records(args.mentions)]
+
+    formats = {"json": lambda: serialization.dumps(presenter.transform_list(mentions))}
+    if serialization.msgpack is not None:
+        formats["msgpack"] = lambda: presenter.encode_columns(MentionBatch.from_mentions(mentions), "msgpack")
+    if serialization.pyarrow is not None:
+        formats["arrow"] = lambda: presenter.encode_columns(MentionBatch.from_mentions(mentions), "arrow")
+    missing = [name for name, module in (("msgpack", serialization.msgpack), ("pyarrow", serialization.pyarrow),
+                                         ("brotli", compression.brotli), ("zstandard", compression.zstandard))
+               if module is None]
+    if missing:
+        print(f"not installed, skipped: {', '.join(missing)}")
+
+    bytes_per_second = args.bandwidth * 1e6 / 8
+    print(f"{args.mentions} mentions, {args.bandwidth:g} Mbit/s, rtt {args.rtt * 1000:g} ms, zlib {zlib.ZLIB_VERSION}")
+    print(f"{'format':<8} {'coding':<9} {'encode ms':>10} {'compress ms':>12} {'bytes':>10} {'ratio':>7} "
+          f"{'MB/s':>8} {'deliver ms':>11}")
+    json_size = None
+    for name, encode in formats.items():
+        encode_time, body = timed(encode, args.repeat)
+        if json_size is None:
+            json_size = len(body)
+        for label, coding, level in compressors():
+            if coding is None:
+                compress_time, wire = 0.0, body
+            else:
+                chunk_size = args.chunk_size or len(body)
+                compress_time, wire = timed(lambda: compress(coding, level, body, chunk_size), args.repeat)
+            deliver = encode_time + compress_time + args.rtt + len(wire) / bytes_per_second
+            throughput = f"{len(body) / compress_time / 1e6:>8.0f}" if compress_time else f"{'-':>8}"
+            print(f"{name:<8} {label:<9} {encode_time * 1000:>10.2f} {compress_time * 1000:>12.2f} {len(wire):>10} "
+                  f"{json_size / len(wire):>6.1f}x {throughput} {deliver * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compare the object path with the columnar MentionBatch path.
+
+Object path:   JSON rows -> BrandwatchMention models -> presenter dicts
+Columnar path: JSON rows -> MentionBatch -> presenter dicts
+
+Reports memory retained per batch (tracemalloc) and the time to build the
+batch and serialise it to JSON.
+
+Usage:
+    python benchmarks/bench_mention_batch.py --rows 100000
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.brandwatch import BrandwatchMention
+from app.models.mention_batch import MentionBatch
+from app.presenters.brandwatch_presenter import BrandwatchPresenter
+
+SOURCES = ["twitter", "facebook", "instagram", "news", "blogs", "reddit"]
+LANGUAGES = ["en", "id", "es", "fr", "de"]
+SENTIMENTS = ["positive", "neutral", "negative", None]
+
+
+def make_records(rows, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    authors = [f"author_{i}" for i in range(max(rows // 20, 1))]
+    return [
+        {
+            "id": 10_000_000 + i,
+            "content": f"Mention {i} about the brand with some text " * 2,
+            "author": rng.choice(authors),
+            "source": rng.choice(SOURCES),
+            "timestamp": (start + timedelta(seconds=rng.randint(0, 90 * 86400))).isoformat(),
+            "queryId": 1,
+            "projectId": 42,
+            "language": rng.choice(LANGUAGES),
+            "sentiment": rng.choice(SENTIMENTS),
+            "reach": rng.randint(0, 1_000_000) if rng.random() > 0.1 else None,
+            "engagement": rng.randint(0, 10_000)
+        }
+        for i in range(rows)
+    ]
+
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns, while its result is alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    presenter = BrandwatchPresenter()
+    records = make_records(args.rows)
+
+    models, model_bytes = retained_bytes(lambda: [BrandwatchMention(**r) for r in records])
+    batch, batch_bytes = retained_bytes(lambda: MentionBatch.from_records(records))
+    del models
+
+    scale = 100_000 / args.rows
+    print(f"rows={args.rows}")
+    print(f"{'path':<10} {'MB/100k rows':>14} {'build s':>10} {'serialise s':>12}")
+
+    build_objects = timed(lambda: [BrandwatchMention(**r) for r in records], args.repeat)
+    models = [BrandwatchMention(**r) for r in records]
+    dump_objects = timed(lambda: json.dumps(presenter.transform_list(models)), args.repeat)
+    print(f"{'objects':<10} {model_bytes * scale / 1e6:>14.1f} {build_objects:>10.3f} {dump_objects:>12.3f}")
+
+    build_batch = timed(lambda: MentionBatch.from_records(records), args.repeat)
+    dump_batch = timed(lambda: json.dumps(presenter.transform_batch(batch)), args.repeat)
+    print(f"{'columnar':<10} {batch_bytes * scale / 1e6:>14.1f} {build_batch:>10.3f} {dump_batch:>12.3f}")
+
+    assert presenter.transform_batch(batch) == presenter.transform_list(models)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark model parsing of Brandwatch response rows.
+
+For each model, compares per-row construction (Model(**row), the service's
+current path) with model_validate and one TypeAdapter(List[Model]) call over
+the whole page, and for mentions also MentionBatch.from_records and the
+parse_models projection (id, timestamp, sentiment). On pydantic v1 the
+equivalents parse_obj and parse_obj_as are timed instead, plus the
+trusted (validate=False) paths that only matter there.
+
+Usage:
+    python benchmarks/bench_models.py --rows 10000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    from pydantic import TypeAdapter
+except ImportError:  # pydantic v1
+    from pydantic import parse_obj_as
+    TypeAdapter = None
+
+from app.models.brandwatch import BrandwatchProject, BrandwatchQuery, BrandwatchMention
+from app.models.mention_batch import MentionBatch
+from app.models.validation import parse_models
+from benchmarks.bench_mention_batch import make_records
+from benchmarks.stub_brandwatch import make_project_records, make_query_records
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    datasets = [
+        (BrandwatchProject, make_project_records(args.rows)),
+        (BrandwatchQuery, make_query_records(args.rows)),
+        (BrandwatchMention, make_records(args.rows)),
+    ]
+    print(f"rows={args.rows}, best of {args.repeat}, microseconds per row")
+    print(f"{'model':<19} {'path':<22} {'us/row':>8}")
+    for model, rows in datasets:
+        validate = getattr(model, "model_validate", None) or model.parse_obj
+        if TypeAdapter is not None:
+            validate_list = TypeAdapter(List[model]).validate_python
+        else:
+            validate_list = lambda rows, model=model: parse_obj_as(List[model], rows)
+        paths = [
+            ("Model(**row)", lambda: [model(**row) for row in rows]),
+            ("model_validate", lambda: [validate(row) for row in rows]),
+            ("TypeAdapter(List)", lambda: validate_list(rows)),
+        ]
+        if model is BrandwatchMention:
+            projection = ["id", "timestamp", "sentiment"]
+            paths += [
+                ("MentionBatch", lambda: MentionBatch.from_records(rows)),
+                ("projected", lambda: parse_models(model, rows, projection)),
+            ]
+            if TypeAdapter is None:
+                paths += [
+                    ("projected, trusted", lambda: parse_models(model, rows, projection, validate=False)),
+                    ("trusted", lambda: parse_models(model, rows, validate=False)),
+                ]
+        for name, fn in paths:
+            elapsed = timed(fn, args.repeat)
+            print(f"{model.__name__:<19} {name:<22} {elapsed / len(rows) * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark BrandwatchPresenter transforms.
+
+Times transform_list for projects, queries and mentions, transform_batch for
+a columnar MentionBatch, and the NDJSON stream path, all on prebuilt models
+so only presenter work (and encoding, for the stream) is measured.
+
+Usage:
+    python benchmarks/bench_presenter.py --rows 10000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.brandwatch import BrandwatchProject, BrandwatchQuery, BrandwatchMention
+from app.models.mention_batch import MentionBatch
+from app.presenters.brandwatch_presenter import BrandwatchPresenter
+from benchmarks.bench_mention_batch import make_records
+from benchmarks.stub_brandwatch import make_project_records, make_query_records
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def drain(stream):
+    size = 0
+    async for chunk in stream:
+        size += len(chunk)
+    return size
+
+
+async def iterate(items):
+    for item in items:
+        yield item
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    presenter = BrandwatchPresenter()
+    projects = [BrandwatchProject(**r) for r in make_project_records(args.rows)]
+    queries = [BrandwatchQuery(**r) for r in make_query_records(args.rows)]
+    records = make_records(args.rows)
+    mentions = [BrandwatchMention(**r) for r in records]
+    batch = MentionBatch.from_records(records)
+
+    cases = [
+        ("transform_list projects", lambda: presenter.transform_list(projects)),
+        ("transform_list queries", lambda: presenter.transform_list(queries)),
+        ("transform_list mentions", lambda: presenter.transform_list(mentions)),
+        ("transform_batch mentions", lambda: presenter.transform_batch(batch)),
+        ("stream_ndjson mentions", lambda: asyncio.run(drain(presenter.stream_ndjson(iterate(mentions))))),
+    ]
+    print(f"rows={args.rows}, best of {args.repeat}")
+    print(f"{'case':<26} {'ms':>9} {'us/row':>8}")
+    for name, fn in cases:
+        elapsed = timed(fn, args.repeat)
+        print(f"{name:<26} {elapsed * 1000:>9.2f} {elapsed / args.rows * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
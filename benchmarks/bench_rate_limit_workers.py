@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared rate-limit backends across worker processes.
+
+Each worker runs its own AsyncRateLimiter against one shared backend and
+simulates an upstream call after every grant. With few workers throughput is
+bound by upstream latency; adding workers raises it until the global budget
+is reached, and it must never exceed that budget in any window.
+
+Usage:
+    python benchmarks/bench_rate_limit_workers.py --backend sqlite --workers 1 2 4 8
+    python benchmarks/bench_rate_limit_workers.py --backend redis  # local stand-in, no server needed
+    python benchmarks/bench_rate_limit_workers.py --backend redis --redis-url redis://localhost:6379/0
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.rate_limiter import AsyncRateLimiter
+from app.core.rate_limit_backends import SQLiteRateLimitBackend, RedisRateLimitBackend
+from benchmarks.local_redis import connect_local_redis, serve_local_redis
+
+
+def make_backend(args, key):
+    if args.backend == "sqlite":
+        return SQLiteRateLimitBackend(args.sqlite_path, key=key)
+    if args.redis_url is None:
+        return RedisRateLimitBackend(connect_local_redis(args.local_redis_address), key=key)
+    import redis.asyncio as redis
+    return RedisRateLimitBackend(redis.from_url(args.redis_url), key=key)
+
+
+async def run_worker(args, key, start_at, grants):
+    backend = make_backend(args, key)
+    limiter = AsyncRateLimiter(args.limit, args.window, backend=backend)
+    await asyncio.sleep(max(start_at - time.time(), 0))
+    stop_at = start_at + args.duration
+    while True:
+        remaining = stop_at - time.time()
+        if remaining <= 0:
+            break
+        try:
+            await limiter.acquire(timeout=remaining)
+        except Exception:
+            break
+        grants.append(backend.last_reserved_at)
+        await asyncio.sleep(args.latency)
+    await limiter.close()
+
+
+def worker_main(args, key, start_at, queue):
+    grants = []
+    asyncio.run(run_worker(args, key, start_at, grants))
+    queue.put(grants)
+
+
+def max_in_window(timestamps, window):
+    """Largest number of grants inside any sliding window"""
+    best = 0
+    left = 0
+    for right, ts in enumerate(timestamps):
+        while ts - timestamps[left] >= window:
+            left += 1
+        best = max(best, right - left + 1)
+    return best
+
+
+def run_scenario(args, workers):
+    key = f"bench:{workers}:{time.time()}"
+    queue = multiprocessing.Queue()
+    start_at = time.time() + 1.0
+    procs = [
+        multiprocessing.Process(target=worker_main, args=(args, key, start_at, queue))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    grants = []
+    for _ in procs:
+        grants.extend(queue.get())
+    for proc in procs:
+        proc.join()
+    grants.sort()
+    peak = max_in_window(grants, args.window)
+    return {
+        "workers": workers,
+        "grants": len(grants),
+        "throughput": len(grants) / args.duration,
+        "peak_in_window": peak,
+        "within_budget": peak <= args.limit
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["sqlite", "redis"], default="sqlite")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--limit", type=int, default=100, help="calls allowed per window")
+    parser.add_argument("--window", type=float, default=1.0, help="window length in seconds")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--latency", type=float, default=0.04, help="simulated upstream latency per call")
+    parser.add_argument("--sqlite-path", default=os.path.join(tempfile.gettempdir(), "bench_rate_limit.db"))
+    parser.add_argument("--redis-url", default=None, help="Redis server; without it a local stand-in is shared")
+    args = parser.parse_args()
+
+    local_redis = None
+    if args.backend == "redis" and args.redis_url is None:
+        local_redis = serve_local_redis()
+        args.local_redis_address = local_redis.address
+
+    print(f"backend={args.backend} budget={args.limit}/{args.window}s latency={args.latency}s")
+    print(f"{'workers':>8} {'grants':>8} {'calls/s':>10} {'peak/window':>12} {'ok':>4}")
+    failed = False
+    for workers in args.workers:
+        result = run_scenario(args, workers)
+        failed = failed or not result["within_budget"]
+        print(
+            f"{result['workers']:>8} {result['grants']:>8} {result['throughput']:>10.1f} "
+            f"{result['peak_in_window']:>12} {'yes' if result['within_budget'] else 'NO':>4}"
+        )
+    if local_redis is not None:
+        local_redis.shutdown()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compare response encoding paths for presenter output.
+
+old: FastAPI's default for a returned dict/list, jsonable_encoder + json.dumps
+new: app.core.serialization.dumps (orjson when installed, compact json otherwise)
+
+Usage:
+    python benchmarks/bench_serialization.py --mentions 10000
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core import serialization
+from app.models.brandwatch import BrandwatchProject, BrandwatchQuery, BrandwatchMention
+from app.presenters.brandwatch_presenter import BrandwatchPresenter
+from benchmarks.bench_mention_batch import make_records
+
+
+def make_projects(count):
+    return [
+        BrandwatchProject(
+            id=i, name=f"Project {i}", description="Brand monitoring", billableClientId=7,
+            billableClientName="Client", timezone="Asia/Jakarta", billableClientIsPitch=False
+        )
+        for i in range(count)
+    ]
+
+
+def make_queries(count):
+    now = datetime(2024, 1, 1)
+    return [
+        BrandwatchQuery(
+            id=i, name=f"Query {i}", type="monitor", creationDate=now, lastModificationDate=now + timedelta(days=1),
+            lastModifiedUsername="analyst", lockedQuery=False, lockedByUsername=None, languages=["en", "id"],
+            contentSources=["twitter", "news"], languageAgnostic=False, booleanQuery="brand AND (love OR hate)",
+            startDate=now, percentComplete=100.0, samplePercentage=None, sampled=False
+        )
+        for i in range(count)
+    ]
+
+
+def old_path(rows):
+    return json.dumps(jsonable_encoder(rows)).encode()
+
+
+def timed(fn, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--mentions", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    presenter = BrandwatchPresenter()
+    payloads = {
+        "projects": presenter.transform_list(make_projects(args.projects)),
+        "queries": presenter.transform_list(make_queries(args.queries)),
+        "mentions": presenter.transform_list([BrandwatchMention(**r) for r in make_records(args.mentions)])
+    }
+
+    encoder = "orjson" if serialization.orjson is not None else "stdlib json"
+    print(f"new path encoder: {encoder}")
+    print(f"{'payload':<10} {'rows':>7} {'old ms':>9} {'new ms':>9} {'speedup':>8} {'bytes':>10}")
+    for name, rows in payloads.items():
+        old, _ = timed(old_path, rows, args.repeat)
+        new, size = timed(serialization.dumps, rows, args.repeat)
+        assert json.loads(serialization.dumps(rows)) == json.loads(old_path(rows))
+        print(f"{name:<10} {len(rows):>7} {old * 1000:>9.2f} {new * 1000:>9.2f} {old / new:>7.1f}x {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Load-test app.main against the local Brandwatch stub.
+
+Starts benchmarks/stub_brandwatch.py and uvicorn (app.main:app) as
+subprocesses, seeds a user into a throwaway SQLite database, signs a JWT for
+it, then drives each scenario at a fixed concurrency and reports throughput,
+p50/p95/p99 latency, non-2xx responses and the server's peak RSS.
+
+The server is restarted for every scenario so each starts with a cold cache
+and a full Brandwatch rate-limit budget (30 calls per 10 minutes per
+process). Scenarios are sized to stay inside that budget; once it is spent
+requests wait BRANDWATCH_RATE_LIMIT_TIMEOUT and then count as non-2xx.
+
+The mention store and prefetching are disabled, so neither a MySQL server
+nor the MySQL driver is needed.
+
+Usage:
+    python benchmarks/load_app.py --scenario projects mentions mixed --concurrency 32 --duration 15
+    python benchmarks/load_app.py --workers 4 --latency 0.2 --error-rate 0.05 --env METRICS_ENABLED=true
+"""
+import argparse
+import asyncio
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.stub_brandwatch import add_stub_arguments
+
+USERNAME = "loadtest"
+PASSWORD = "loadtest-password"
+
+
+def scenario_urls(name, args):
+    """Return a function producing the next request path for a scenario"""
+    api = "/api/brandwatch"
+    rng = random.Random(args.seed)
+    fixed = {
+        "projects": lambda: f"{api}/projects",
+        "project": lambda: f"{api}/projects/{rng.randint(1, args.projects)}",
+        "queries": lambda: f"{api}/projects/{rng.randint(1, args.projects)}/queries",
+        "mentions": lambda: f"{api}/projects/1/mentions?query_id=1&limit=100",
+    }
+    if name == "mixed":
+        choices = [fixed["projects"], fixed["project"], fixed["queries"], fixed["mentions"]]
+        return lambda: rng.choice(choices)()
+    return fixed[name]
+
+
+def process_tree_rss(pid):
+    """Resident set size in bytes of pid and its descendants (Linux /proc), or None"""
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+            for task in Path(f"/proc/{current}/task").iterdir():
+                children = (task / "children").read_text().split()
+                pending.extend(int(child) for child in children)
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        return total or None
+    return total
+
+
+async def seed_user(env):
+    """Create the users table and a load-test user in the SQLite database; return a JWT for it"""
+    os.environ.update(env)
+    from app.core.config import get_settings
+    get_settings.cache_clear()  # imported modules may already have read the settings
+    from app.database import Base, AsyncSessionLocal, dispose_engines, get_async_engine
+    from app.models.user import User
+    from app.core.security import create_access_token, get_password_hash
+    from datetime import timedelta
+
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[User.__table__])
+    async with AsyncSessionLocal() as db:
+        db.add(User(
+            username=USERNAME, email=f"{USERNAME}@example.com",
+            hashed_password=get_password_hash(PASSWORD), is_active=True
+        ))
+        await db.commit()
+    await dispose_engines()
+    return create_access_token({"sub": USERNAME}, expires_delta=timedelta(hours=6))
+
+
+async def wait_until_up(url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as response:
+                    if response.status < 500:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+async def run_scenario(name, args, base_url, token, server_pid):
+    next_path = scenario_urls(name, args)
+    latencies = []
+    errors = 0
+    peak_rss = 0
+    headers = {"Authorization": f"Bearer {token}"}
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(base_url, connector=connector, headers=headers) as session:
+
+        async def worker(stop_at, record):
+            nonlocal errors
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                try:
+                    async with session.get(next_path()) as response:
+                        await response.read()
+                        ok = 200 <= response.status < 300
+                except aiohttp.ClientError:
+                    ok = False
+                if record:
+                    latencies.append(time.perf_counter() - start)
+                    errors += not ok
+
+        async def sample_rss(stop_at):
+            nonlocal peak_rss
+            while time.monotonic() < stop_at:
+                peak_rss = max(peak_rss, process_tree_rss(server_pid) or 0)
+                await asyncio.sleep(0.5)
+
+        if args.warmup:
+            stop_at = time.monotonic() + args.warmup
+            await asyncio.gather(*(worker(stop_at, False) for _ in range(args.concurrency)))
+        started = time.monotonic()
+        stop_at = started + args.duration
+        await asyncio.gather(sample_rss(stop_at), *(worker(stop_at, True) for _ in range(args.concurrency)))
+        elapsed = time.monotonic() - started
+
+    if len(latencies) < 2:
+        return {"scenario": name, "requests": len(latencies), "errors": errors}
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+        "errors": errors,
+        "rss_mb": peak_rss / 1e6 if peak_rss else None
+    }
+
+
+def start_server(args, env):
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=env
+    )
+
+
+def stop(process):
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def stub_command(args):
+    command = [sys.executable, str(ROOT / "benchmarks" / "stub_brandwatch.py"), "--port", str(args.stub_port)]
+    for option in ("latency", "jitter", "error_rate", "rate_limit", "rate_window", "projects", "queries",
+                   "mentions", "max_page_size", "seed"):
+        command += ["--" + option.replace("_", "-"), str(getattr(args, option))]
+    return command
+
+
+async def main_async(args):
+    workdir = tempfile.mkdtemp(prefix="brandwatch-load-")
+    env = {
+        "BRANDWATCH_API_URL": f"http://127.0.0.1:{args.stub_port}",
+        "BRANDWATCH_API_KEY": "load-test",
+        "ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{workdir}/app.db",
+        "BRANDWATCH_MENTION_STORE_ENABLED": "false",
+        "BRANDWATCH_PREFETCH_ENABLED": "false",
+        "BRANDWATCH_RATE_LIMIT_TIMEOUT": "5",
+        "SECRET_KEY": os.getenv("SECRET_KEY", "load-test-secret"),
+        "ALGORITHM": os.getenv("ALGORITHM", "HS256"),
+        "ACCESS_TOKEN_EXPIRE_MINUTES": os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"),
+    }
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    token = await seed_user(env)
+    server_env = {**os.environ, **env}
+
+    stub = subprocess.Popen(stub_command(args), cwd=ROOT, env=server_env, stdout=subprocess.DEVNULL)
+    try:
+        await wait_until_up(f"http://127.0.0.1:{args.stub_port}/_stats")
+        print(f"workers={args.workers} concurrency={args.concurrency} duration={args.duration}s "
+              f"stub latency={args.latency}s error_rate={args.error_rate}")
+        print(f"{'scenario':<11} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'non-2xx':>8} {'RSS MB':>8}")
+        for name in args.scenario:
+            server = start_server(args, server_env)
+            try:
+                await wait_until_up(f"http://127.0.0.1:{args.port}/")
+                row = await run_scenario(name, args, f"http://127.0.0.1:{args.port}", token, server.pid)
+            finally:
+                stop(server)
+            if "rps" not in row:
+                print(f"{name:<11} {row['requests']:>9}  (too few requests to report)")
+                continue
+            rss = f"{row['rss_mb']:>8.1f}" if row["rss_mb"] else f"{'n/a':>8}"
+            print(f"{name:<11} {row['requests']:>9} {row['rps']:>9.1f} {row['p50']:>8.2f} {row['p95']:>8.2f} "
+                  f"{row['p99']:>8.2f} {row['errors']:>8} {rss}")
+    finally:
+        stop(stub)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scenario", nargs="+", default=["projects", "queries", "mentions", "mixed"],
+        choices=["projects", "project", "queries", "mentions", "mixed"]
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--stub-port", type=int, default=8902)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra app environment")
+    add_stub_arguments(parser)
+    # project and queries scenarios make one upstream call per project; keep them inside the budget
+    parser.set_defaults(projects=10)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
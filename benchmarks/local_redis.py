@@ -0,0 +1,112 @@
+"""
+In-memory stand-in for the redis.asyncio client used by RedisRateLimitBackend.
+
+Only the sorted-set calls the backend makes are implemented, and eval only
+runs the backend's reserve script (as the equivalent Python). The sets live
+in a SortedSetStore; serve_local_redis() shares one store with other
+processes through a multiprocessing manager, so the worker benchmark can run
+the redis backend without a Redis server.
+"""
+import threading
+from multiprocessing.managers import BaseManager
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.rate_limit_backends import _REDIS_RESERVE_SCRIPT
+
+
+class SortedSetStore:
+    """Sorted sets keyed by name, each a member -> score dict guarded by one lock"""
+
+    def __init__(self):
+        self._sets: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: str, now: float, window: float, limit: int, member: str) -> str:
+        """The reserve script: drop expired calls, then record one or return the wait"""
+        with self._lock:
+            zset = self._sets.setdefault(key, {})
+            self._remove_until(zset, now - window)
+            if len(zset) < limit:
+                zset[member] = now
+                return "0"
+            return str(min(zset.values()) + window - now)
+
+    def zrem(self, key: str, member: str) -> int:
+        with self._lock:
+            return int(self._sets.get(key, {}).pop(member, None) is not None)
+
+    def zremrangebyscore(self, key: str, low: Any, high: float) -> int:
+        with self._lock:
+            return self._remove_until(self._sets.get(key, {}), float(high))
+
+    def zcard(self, key: str) -> int:
+        with self._lock:
+            return len(self._sets.get(key, {}))
+
+    def zrange(self, key: str, start: int, stop: int) -> List[Tuple[str, float]]:
+        with self._lock:
+            ordered = sorted(self._sets.get(key, {}).items(), key=lambda item: item[1])
+            return ordered[start:stop + 1 if stop >= 0 else None]
+
+    @staticmethod
+    def _remove_until(zset: Dict[str, float], high: float) -> int:
+        expired = [member for member, score in zset.items() if score <= high]
+        for member in expired:
+            del zset[member]
+        return len(expired)
+
+
+class LocalRedis:
+    """Async client over a SortedSetStore (or a manager proxy to one)"""
+
+    def __init__(self, store: Optional[Any] = None):
+        self.store = store if store is not None else SortedSetStore()
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> str:
+        if script != _REDIS_RESERVE_SCRIPT or numkeys != 1:
+            raise NotImplementedError("LocalRedis only runs the rate-limit reserve script")
+        key, now, window, limit, member = keys_and_args
+        return self.store.reserve(key, float(now), float(window), int(limit), member)
+
+    async def zrem(self, key: str, member: str) -> int:
+        return self.store.zrem(key, member)
+
+    async def zremrangebyscore(self, key: str, low: Any, high: float) -> int:
+        return self.store.zremrangebyscore(key, low, high)
+
+    async def zcard(self, key: str) -> int:
+        return self.store.zcard(key)
+
+    async def zrange(self, key: str, start: int, stop: int, withscores: bool = False) -> list:
+        items = self.store.zrange(key, start, stop)
+        return items if withscores else [member for member, _ in items]
+
+    async def aclose(self) -> None:
+        pass
+
+
+_shared_store = SortedSetStore()
+
+
+def _get_shared_store() -> SortedSetStore:
+    return _shared_store
+
+
+class _StoreManager(BaseManager):
+    pass
+
+
+_StoreManager.register("store", callable=_get_shared_store)
+
+
+def serve_local_redis(authkey: bytes = b"local-redis") -> _StoreManager:
+    """Start a manager process holding one shared store; pass manager.address to connect_local_redis"""
+    manager = _StoreManager(address=("127.0.0.1", 0), authkey=authkey)
+    manager.start()
+    return manager
+
+
+def connect_local_redis(address: Tuple[str, int], authkey: bytes = b"local-redis") -> LocalRedis:
+    """A client on the store served at address, usable from any process"""
+    manager = _StoreManager(address=address, authkey=authkey)
+    manager.connect()
+    return LocalRedis(manager.store())
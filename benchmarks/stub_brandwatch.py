@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Local Brandwatch API stub for offline benchmarks.
+
+Serves projects/summary, projects/{id}, projects/{id}/queries/summary and
+cursor-paginated projects/{id}/mentions from deterministic generated data.
+Latency, error rate and an upstream-style sliding-window rate limit are
+configurable, and summaries carry an ETag so conditional requests can be
+exercised.
+
+Usage:
+    python benchmarks/stub_brandwatch.py --port 8900 --latency 0.05 --error-rate 0.01
+    BRANDWATCH_API_URL=http://127.0.0.1:8900 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_mention_batch import make_records
+
+EPOCH = datetime(2024, 1, 1)
+
+
+def make_project_records(count):
+    return [
+        {
+            "id": i, "name": f"Project {i}", "description": "Brand monitoring", "billableClientId": 7,
+            "billableClientName": "Client", "timezone": "Asia/Jakarta", "billableClientIsPitch": False
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_query_records(count):
+    created = EPOCH.isoformat()
+    modified = (EPOCH + timedelta(days=1)).isoformat()
+    return [
+        {
+            "id": i, "name": f"Query {i}", "type": "monitor", "creationDate": created,
+            "lastModificationDate": modified, "lastModifiedUsername": "analyst", "lockedQuery": False,
+            "lockedByUsername": None, "languages": ["en", "id"], "contentSources": ["twitter", "news"],
+            "languageAgnostic": False, "booleanQuery": "brand AND (love OR hate)", "startDate": created,
+            "percentComplete": 100.0, "samplePercentage": None, "sampled": False
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+class StubState:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.calls = deque()
+        self.requests = 0
+        self.not_modified = 0
+        self.projects = make_project_records(args.projects)
+        self.queries = make_query_records(args.queries)
+        # One shared, timestamp-sorted mention set reused for every project and query
+        self.mentions = sorted(make_records(args.mentions, seed=args.seed), key=lambda m: m["timestamp"])
+        self.mention_times = [m["timestamp"] for m in self.mentions]
+
+
+@web.middleware
+async def fault_middleware(request, handler):
+    state = request.app["state"]
+    args = state.args
+    state.requests += 1
+    if args.rate_limit:
+        now = time.monotonic()
+        while state.calls and state.calls[0] <= now - args.rate_window:
+            state.calls.popleft()
+        if len(state.calls) >= args.rate_limit:
+            retry_after = state.calls[0] + args.rate_window - now
+            return web.json_response(
+                {"error": "rate limited"}, status=429, headers={"Retry-After": str(max(int(retry_after) + 1, 1))}
+            )
+        state.calls.append(now)
+    if args.latency or args.jitter:
+        await asyncio.sleep(max(args.latency + state.rng.uniform(-args.jitter, args.jitter), 0))
+    failing = args.fail_after and state.requests > args.fail_after
+    if failing or (args.error_rate and state.rng.random() < args.error_rate):
+        return web.json_response({"error": "injected failure"}, status=503, headers={"Retry-After": "1"})
+    return await handler(request)
+
+
+def json_response(request, payload, etag=False):
+    body = json.dumps(payload).encode()
+    if not etag:
+        return web.Response(body=body, content_type="application/json")
+    tag = '"' + hashlib.md5(body).hexdigest() + '"'
+    if request.headers.get("If-None-Match") == tag:
+        request.app["state"].not_modified += 1
+        return web.Response(status=304, headers={"ETag": tag})
+    return web.Response(body=body, content_type="application/json", headers={"ETag": tag})
+
+
+async def projects_summary(request):
+    return json_response(request, {"results": request.app["state"].projects}, etag=True)
+
+
+async def project(request):
+    state = request.app["state"]
+    project_id = int(request.match_info["project_id"])
+    if not 1 <= project_id <= len(state.projects):
+        return web.json_response({"error": "project not found"}, status=404)
+    return json_response(request, {"results": [state.projects[project_id - 1]]}, etag=True)
+
+
+async def queries_summary(request):
+    return json_response(request, {"results": request.app["state"].queries}, etag=True)
+
+
+async def mentions(request):
+    state = request.app["state"]
+    project_id = int(request.match_info["project_id"])
+    query = request.query
+    limit = min(int(query.get("limit", 100)), state.args.max_page_size)
+    lo = bisect_left(state.mention_times, query["startDate"]) if "startDate" in query else 0
+    hi = bisect_right(state.mention_times, query["endDate"]) if "endDate" in query else len(state.mentions)
+    offset = lo + int(query.get("cursor", 0))
+    page_end = min(offset + limit, hi)
+    query_id = int(query.get("queryId", 1))
+    results = [{**m, "projectId": project_id, "queryId": query_id} for m in state.mentions[offset:page_end]]
+    payload = {"resultsTotal": hi - lo, "resultsPage": len(results), "results": results}
+    if page_end < hi:
+        payload["nextCursor"] = str(page_end - lo)
+    return json_response(request, payload)
+
+
+async def stats(request):
+    state = request.app["state"]
+    return web.json_response({"requests": state.requests, "not_modified": state.not_modified})
+
+
+def make_app(args):
+    app = web.Application(middlewares=[fault_middleware])
+    app["state"] = StubState(args)
+    app.router.add_get("/projects/summary", projects_summary)
+    app.router.add_get("/projects/{project_id}", project)
+    app.router.add_get("/projects/{project_id}/queries/summary", queries_summary)
+    app.router.add_get("/projects/{project_id}/mentions", mentions)
+    app.router.add_get("/_stats", stats)
+    return app
+
+
+def add_stub_arguments(parser):
+    group = parser.add_argument_group("stub")
+    group.add_argument("--latency", type=float, default=0.02, help="seconds added to every response")
+    group.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of uniform latency jitter")
+    group.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    group.add_argument("--fail-after", type=int, default=0, help="answer every request after the first N with 503")
+    group.add_argument("--rate-limit", type=int, default=0, help="calls per --rate-window, 0 disables")
+    group.add_argument("--rate-window", type=float, default=600.0)
+    group.add_argument("--projects", type=int, default=20)
+    group.add_argument("--queries", type=int, default=50)
+    group.add_argument("--mentions", type=int, default=5000)
+    group.add_argument("--max-page-size", type=int, default=5000)
+    group.add_argument("--seed", type=int, default=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(make_app(args), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Summarise what importing the app costs, from Python's -X importtime report.
+
+Imports a module (app.main by default) in a fresh interpreter with
+-X importtime, optionally several times keeping each module's fastest run,
+and prints:
+
+  - wall time of the import process next to a bare interpreter start
+  - self time per top-level package (where the time actually goes)
+  - the slowest modules by self time
+  - app modules by cumulative time (what each of our imports drags in)
+
+Usage:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --module app.core.brandwatch_service --repeat 5 --top 15
+    python scripts/profile_imports.py --json > importtime.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+def run_interpreter(code, importtime=False):
+    """Run code in a fresh interpreter; return (wall seconds, stderr)"""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.getenv("PYTHONPATH")]))}
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        sys.exit(f"importing failed: {code}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(report):
+    """Module -> (self us, cumulative us, depth), for each line of an -X importtime report"""
+    modules = {}
+    for line in report.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return modules
+
+
+def profile(module, repeat):
+    """Fastest wall time and per-module timings over repeat runs"""
+    best_wall = float("inf")
+    merged = {}
+    for _ in range(repeat):
+        wall, report = run_interpreter(f"import {module}", importtime=True)
+        best_wall = min(best_wall, wall)
+        for name, (self_us, cumulative_us, depth) in parse_importtime(report).items():
+            if name in merged:
+                previous = merged[name]
+                self_us, cumulative_us = min(self_us, previous[0]), min(cumulative_us, previous[1])
+            merged[name] = (self_us, cumulative_us, depth)
+    baseline = min(run_interpreter("pass")[0] for _ in range(repeat))
+    return best_wall, baseline, merged
+
+
+def summarise(module, wall, baseline, modules, top):
+    packages = defaultdict(lambda: [0, 0])
+    for name, (self_us, _, _) in modules.items():
+        package = packages[name.split(".")[0]]
+        package[0] += self_us
+        package[1] += 1
+    return {
+        "module": module,
+        "wall_ms": wall * 1000,
+        "interpreter_ms": baseline * 1000,
+        "import_ms": modules.get(module, (0, 0, 0))[1] / 1000,
+        "modules": len(modules),
+        "packages": [
+            {"package": name, "self_ms": self_us / 1000, "modules": count}
+            for name, (self_us, count) in sorted(packages.items(), key=lambda item: -item[1][0])[:top]
+        ],
+        "slowest": [
+            {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+            for name, (self_us, cumulative_us, _) in sorted(modules.items(), key=lambda item: -item[1][0])[:top]
+        ],
+        "app": [
+            {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+            for name, (self_us, cumulative_us, _) in sorted(modules.items(), key=lambda item: -item[1][1])
+            if name == "app" or name.startswith("app.")
+        ][:top]
+    }
+
+
+def print_summary(summary):
+    print(f"import {summary['module']}: {summary['import_ms']:.1f} ms over {summary['modules']} modules; "
+          f"process wall {summary['wall_ms']:.1f} ms vs bare interpreter {summary['interpreter_ms']:.1f} ms")
+    print(f"\n{'package':<32} {'self ms':>9} {'modules':>8}")
+    for row in summary["packages"]:
+        print(f"{row['package']:<32} {row['self_ms']:>9.1f} {row['modules']:>8}")
+    print(f"\n{'slowest modules':<48} {'self ms':>9} {'cum ms':>9}")
+    for row in summary["slowest"]:
+        print(f"{row['module']:<48} {row['self_ms']:>9.1f} {row['cumulative_ms']:>9.1f}")
+    print(f"\n{'app modules':<48} {'self ms':>9} {'cum ms':>9}")
+    for row in summary["app"]:
+        print(f"{row['module']:<48} {row['self_ms']:>9.1f} {row['cumulative_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeat", type=int, default=3, help="runs; each module keeps its fastest time")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    wall, baseline, modules = profile(args.module, args.repeat)
+    summary = summarise(args.module, wall, baseline, modules, args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os
+
+# Settings are read once, at first import of the app; give the tests a
+# self-contained environment instead of whatever .env holds
+os.environ.update({
+    "SECRET_KEY": "test-secret",
+    "ASYNC_DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "BRANDWATCH_API_URL": "http://127.0.0.1:9",
+    "BRANDWATCH_RATE_LIMIT_BACKEND": "memory",
+    "BRANDWATCH_PREFETCH_ENABLED": "false",
+    "BRANDWATCH_SUBSCRIBE_ENABLED": "false"
+})
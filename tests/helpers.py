@@ -0,0 +1,63 @@
+import argparse
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Tuple
+import httpx
+from aiohttp import web
+from app.core.brandwatch_service import BrandwatchService
+from app.core.rate_limiter import AsyncRateLimiter
+from benchmarks.stub_brandwatch import StubState, add_stub_arguments, make_app
+
+
+@asynccontextmanager
+async def stub_brandwatch(*argv: str) -> AsyncIterator[Tuple[str, StubState]]:
+    """Run the benchmark stub on a free local port; yields (base url, stub state)"""
+    parser = argparse.ArgumentParser()
+    add_stub_arguments(parser)
+    app = make_app(parser.parse_args(["--latency", "0", *argv]))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        yield f"http://{host}:{port}", app["state"]
+    finally:
+        await runner.cleanup()
+
+
+def make_service(url: str) -> BrandwatchService:
+    """A BrandwatchService of its own, pointed at the stub, without the local store"""
+    service = BrandwatchService()
+    service.api_url = url
+    service.store = None
+    return service
+
+
+@asynccontextmanager
+async def brandwatch_api(*argv: str) -> AsyncIterator[Tuple[httpx.AsyncClient, StubState, Any]]:
+    """
+    The app's /api/brandwatch routes, as an authenticated user, backed by the
+    stub; yields (client, stub state, the controller's BrandwatchService)
+    """
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.routers.brandwatch import brandwatch_controller
+
+    service = brandwatch_controller.service
+    async with stub_brandwatch(*argv) as (url, stub):
+        saved = service.api_url, service.rate_limiter, service.store, service.retry_attempts
+        service.api_url = url
+        service.rate_limiter = AsyncRateLimiter(10_000, 1)
+        service.store = None
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(username="tester", disabled=False)
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test/api/brandwatch") as client:
+                yield client, stub, service
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
+            service.invalidate_cache()
+            service._breakers.clear()
+            service.api_url, service.rate_limiter, service.store, service.retry_attempts = saved
+            await service.close()
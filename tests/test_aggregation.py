@@ -0,0 +1,66 @@
+import pytest
+from app.core.aggregation import aggregate_batch
+from app.models.mention_batch import MentionBatch
+
+
+def row(mention_id: int, timestamp: str, sentiment, source: str = "twitter", reach=None, engagement=None) -> dict:
+    return {
+        "id": mention_id, "content": "", "author": "author", "source": source, "timestamp": timestamp,
+        "queryId": 7, "projectId": 1, "language": "en", "sentiment": sentiment,
+        "reach": reach, "engagement": engagement
+    }
+
+
+ROWS = [
+    row(1, "2024-01-01T09:15:00", "positive", reach=100, engagement=5),
+    row(2, "2024-01-01T09:45:00", "negative", reach=300, engagement=1),
+    row(3, "2024-01-01T23:30:00-02:00", "positive", source="news", reach=50),  # 01:30 UTC on Jan 2
+    row(4, "2024-01-07T12:00:00", None, reach=None, engagement=10),  # a Sunday
+    row(5, "2024-01-08T00:00:00", "neutral", source="news", reach=200, engagement=0)  # a Monday
+]
+
+
+def test_daily_buckets_count_sentiment_and_sum_metrics_per_utc_day():
+    result = aggregate_batch(MentionBatch.from_records(ROWS), "day")
+    assert result["total"] == 5
+    assert result["buckets"] == [
+        {"start": "2024-01-01T00:00:00+00:00", "count": 2, "sentiment": {"negative": 1, "positive": 1},
+         "reach": 400, "engagement": 6},
+        {"start": "2024-01-02T00:00:00+00:00", "count": 1, "sentiment": {"positive": 1}, "reach": 50, "engagement": 0},
+        {"start": "2024-01-07T00:00:00+00:00", "count": 1, "sentiment": {"unknown": 1}, "reach": 0, "engagement": 10},
+        {"start": "2024-01-08T00:00:00+00:00", "count": 1, "sentiment": {"neutral": 1}, "reach": 200, "engagement": 0}
+    ]
+    assert result["sentiment"] == {"negative": 1, "neutral": 1, "positive": 2, "unknown": 1}
+    assert result["sources"] == {"news": 2, "twitter": 3}
+
+
+def test_weeks_start_on_monday_and_hours_on_the_hour():
+    weekly = aggregate_batch(MentionBatch.from_records(ROWS), "week")
+    assert [(b["start"], b["count"]) for b in weekly["buckets"]] == [
+        ("2024-01-01T00:00:00+00:00", 4),
+        ("2024-01-08T00:00:00+00:00", 1)
+    ]
+    hourly = aggregate_batch(MentionBatch.from_records(ROWS[:3]), "hour")
+    assert [(b["start"], b["count"]) for b in hourly["buckets"]] == [
+        ("2024-01-01T09:00:00+00:00", 2),
+        ("2024-01-02T01:00:00+00:00", 1)
+    ]
+
+
+def test_metric_stats_skip_missing_values():
+    result = aggregate_batch(MentionBatch.from_records(ROWS), "day")
+    assert result["reach"]["sum"] == 650
+    assert result["reach"]["mean"] == 162.5
+    assert result["reach"]["p50"] == 150.0
+    engagement = result["engagement"]
+    assert (engagement["sum"], engagement["mean"], engagement["p50"], engagement["p90"]) == (16, 4.0, 3.0, 8.5)
+    assert engagement["p99"] == pytest.approx(9.85)
+
+
+def test_empty_windows_and_unknown_buckets():
+    empty = aggregate_batch(MentionBatch.from_records([]), "day")
+    assert empty["total"] == 0
+    assert empty["buckets"] == []
+    assert empty["reach"] == {"sum": 0, "mean": None, "p50": None, "p90": None, "p99": None}
+    with pytest.raises(ValueError):
+        aggregate_batch(MentionBatch.from_records(ROWS), "month")
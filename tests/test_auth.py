@@ -0,0 +1,96 @@
+import asyncio
+import time
+from datetime import timedelta
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from app.core import security
+from app.core.security import (
+    create_access_token, get_current_user, get_password_hash, token_cache, user_cache, verify_token
+)
+
+
+def test_token_login_reads_users_through_the_async_engine():
+    async def scenario():
+        from app.database import Base, AsyncSessionLocal, dispose_engines, get_async_engine
+        from app.main import app
+        from app.models.user import User
+
+        async with get_async_engine().begin() as connection:
+            await connection.run_sync(Base.metadata.create_all, tables=[User.__table__])
+        async with AsyncSessionLocal() as db:
+            db.add(User(username="analyst", email="analyst@example.com", hashed_password=get_password_hash("secret")))
+            await db.commit()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                wrong = await client.post("/token", data={"username": "analyst", "password": "nope"})
+                assert wrong.status_code == 401
+                token = (await client.post("/token", data={"username": "analyst", "password": "secret"})).json()
+                me = await client.get("/me", headers={"Authorization": f"Bearer {token['access_token']}"})
+                assert me.status_code == 200
+                assert me.json()["username"] == "analyst"
+        finally:
+            await dispose_engines()
+
+    asyncio.run(scenario())
+
+
+def test_cached_tokens_are_dropped_once_exp_passes():
+    token_cache.clear()
+    token = create_access_token({"sub": "analyst"}, expires_delta=timedelta(minutes=5))
+    claims = verify_token(token)
+    # The second check is served from the cache
+    assert verify_token(token) is claims
+
+    token_cache.set("short-lived", {"sub": "analyst", "exp": time.time() + 0.05})
+    assert token_cache.get("short-lived") is not None
+    time.sleep(0.1)
+    assert token_cache.get("short-lived") is None
+
+    expired = create_access_token({"sub": "analyst"}, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(HTTPException) as rejected:
+        verify_token(expired)
+    assert rejected.value.status_code == 401
+    assert token_cache.get(expired) is None
+
+
+def test_a_user_cache_hit_skips_the_database(monkeypatch):
+    async def scenario():
+        from app.database import Base, AsyncSessionLocal, dispose_engines, get_async_engine
+        from app.models.user import User
+
+        sessions = []
+
+        def counting_session():
+            sessions.append(1)
+            return AsyncSessionLocal()
+
+        monkeypatch.setattr(security, "AsyncSessionLocal", counting_session)
+        user_cache.clear()
+        async with get_async_engine().begin() as connection:
+            await connection.run_sync(Base.metadata.create_all, tables=[User.__table__])
+        async with AsyncSessionLocal() as db:
+            db.add(User(username="cached", email="cached@example.com", hashed_password="x"))
+            await db.commit()
+        try:
+            token = create_access_token({"sub": "cached"})
+            assert (await get_current_user(token)).username == "cached"
+            assert (await get_current_user(token)).username == "cached"
+            assert len(sessions) == 1
+
+            # An ORM update drops the entry, so the next lookup reads the row again
+            async with AsyncSessionLocal() as db:
+                user = (await db.execute(select(User).where(User.username == "cached"))).scalars().one()
+                user.is_active = False
+                await db.commit()
+            with pytest.raises(HTTPException) as inactive:
+                await get_current_user(token)
+            assert inactive.value.status_code == 403
+            assert len(sessions) == 2
+        finally:
+            user_cache.clear()
+            await dispose_engines()
+
+    asyncio.run(scenario())
@@ -0,0 +1,39 @@
+import asyncio
+from tests.helpers import brandwatch_api
+
+
+def test_each_operation_fails_on_its_own():
+    async def scenario():
+        async with brandwatch_api("--mentions", "20") as (client, stub, service):
+            response = await client.post("/batch", json={"operations": [
+                {"action": "get_projects"},
+                {"action": "get_project", "params": {"project_id": 999}},
+                {"action": "get_mentions", "params": {"project_id": 1, "limit": 5000}},
+                {"action": "get_mentions", "params": {"project_id": 1, "fields": "id,nope"}},
+                {"action": "drop_tables"},
+                {"action": "get_mentions", "params": {"project_id": 1, "query_id": 7, "limit": 3, "fields": "id"}}
+            ]})
+            assert response.status_code == 200
+            results = response.json()
+            assert [result["status"] for result in results] == [200, 404, 400, 400, 400, 200]
+            assert len(results[0]["data"]) == 20
+            assert "project not found" in results[1]["error"]
+            assert results[2]["error"].startswith("limit:")
+            assert results[3]["error"].startswith("Unknown mention fields: nope")
+            assert results[4] == {"action": "drop_tables", "status": 400, "error": "Invalid action"}
+            assert [list(mention) for mention in results[5]["data"]] == [["id"]] * 3
+            # Invalid operations never reach Brandwatch
+            assert stub.requests == 3
+
+    asyncio.run(scenario())
+
+
+def test_oversized_batches_are_rejected_whole():
+    async def scenario():
+        async with brandwatch_api() as (client, stub, service):
+            response = await client.post("/batch", json={"operations": [{"action": "get_projects"}] * 101})
+            assert response.status_code == 400
+            assert response.json()["detail"] == "At most 100 operations are allowed per batch"
+            assert stub.requests == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,269 @@
+import asyncio
+import time
+from datetime import datetime
+import aiohttp
+import pytest
+from app.core.resilience import BrandwatchAPIError, CircuitOpenError
+from tests.helpers import make_service, stub_brandwatch
+
+
+async def stub_stats(url: str) -> dict:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{url}/_stats") as response:
+            return await response.json()
+
+
+def test_refresh_revalidates_projects_with_if_none_match():
+    async def scenario():
+        async with stub_brandwatch() as (url, stub):
+            service = make_service(url)
+            try:
+                first = await service.get_projects()
+                refreshed = await service.get_projects(refresh=True)
+                stats = await stub_stats(url)
+                assert stats["not_modified"] == 1
+                assert service.conditional_stats["sent"] == 1
+                assert service.conditional_stats["not_modified"] == 1
+                assert refreshed == first
+                assert service.get_cache_stats()["conditional"]["validators"] == 1
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_validators_are_bounded_by_bytes():
+    async def scenario():
+        async with stub_brandwatch() as (url, stub):
+            service = make_service(url)
+            service.validator_max_bytes = 100
+            try:
+                await service.get_projects()
+                await service.get_projects(refresh=True)
+                assert stub.not_modified == 0
+                assert service.conditional_stats["sent"] == 0
+                assert service.get_cache_stats()["conditional"]["validator_bytes"] == 0
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_retries_open_the_circuit_and_a_probe_closes_it():
+    async def scenario():
+        async with stub_brandwatch("--error-rate", "1") as (url, stub):
+            service = make_service(url)
+            service.retry_attempts = 2
+            service.retry_backoff_base = 0.01
+            service.circuit_failure_threshold = 2
+            service.circuit_reset_timeout = 0.2
+            try:
+                with pytest.raises(BrandwatchAPIError) as failure:
+                    await service.get_projects()
+                assert failure.value.status == 503
+                assert stub.requests == 2
+                assert service.retries == 1
+                assert service.get_upstream_status()["circuits"][0]["state"] == "open"
+
+                # While open, calls fail fast without reaching the stub
+                with pytest.raises(CircuitOpenError):
+                    await service.get_projects()
+                assert stub.requests == 2
+
+                # After the reset timeout one probe goes through and closes the circuit
+                stub.args.error_rate = 0
+                await asyncio.sleep(0.25)
+                assert len(await service.get_projects()) == 20
+                assert stub.requests == 3
+                circuit = service.get_upstream_status()["circuits"][0]
+                assert circuit["state"] == "closed"
+                assert circuit["times_opened"] == 1
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_is_waited_out_or_surfaced():
+    async def scenario():
+        async with stub_brandwatch("--rate-limit", "1", "--rate-window", "1") as (url, stub):
+            service = make_service(url)
+            service.retry_backoff_base = 0.01
+            try:
+                await service.get_projects()
+                # The stub asks for a short wait, which the retry honours
+                started = time.monotonic()
+                await service.get_queries(1)
+                assert time.monotonic() - started >= 1
+                assert service.retries >= 1
+                assert stub.requests == 2 + service.retries
+            finally:
+                await service.close()
+
+        async with stub_brandwatch("--rate-limit", "1", "--rate-window", "600") as (url, stub):
+            service = make_service(url)
+            try:
+                await service.get_projects()
+                # A wait longer than retry_max_delay is passed on instead of retried
+                with pytest.raises(BrandwatchAPIError) as limited:
+                    await service.get_queries(1)
+                assert limited.value.status == 429
+                assert limited.value.retry_after > service.retry_max_delay
+                assert stub.requests == 2
+                assert service.retries == 0
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_only_get_mentions_pages_feed_the_search_index():
+    async def scenario():
+        async with stub_brandwatch("--mentions", "300") as (url, stub):
+            service = make_service(url)
+            try:
+                async for _ in service.iter_mentions(1, query_id=7, page_size=100):
+                    pass
+                await service.fetch_mentions_sharded(1, datetime(2024, 1, 1), datetime(2024, 4, 1), query_id=7)
+                await asyncio.gather(*service._index_tasks)
+                assert len(service.search_index) == 0
+
+                await service.get_mentions(1, query_id=7, limit=100)
+                await asyncio.gather(*service._index_tasks)
+                assert len(service.search_index) == 100
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_cached_responses_are_served_until_they_expire():
+    async def scenario():
+        async with stub_brandwatch() as (url, stub):
+            service = make_service(url)
+            service.cache_ttls["projects"] = 0.1
+            service.cache_stale_ttl = 0
+            try:
+                first = await service.get_projects()
+                assert await service.get_projects() == first
+                assert stub.requests == 1
+                assert service.get_cache_stats()["hits"] == 1
+
+                await asyncio.sleep(0.15)
+                await service.get_projects()
+                assert stub.requests == 2
+                assert service.get_cache_stats()["misses"] == 2
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_stale_responses_are_served_while_one_refresh_runs():
+    async def scenario():
+        async with stub_brandwatch() as (url, stub):
+            service = make_service(url)
+            service.cache_ttls["projects"] = 0.05
+            service.cache_stale_ttl = 60
+            try:
+                first = await service.get_projects()
+                await asyncio.sleep(0.1)
+                stale = await asyncio.gather(*(service.get_projects() for _ in range(5)))
+                assert all(projects == first for projects in stale)
+                await asyncio.gather(*service.cache._tasks)
+                assert stub.requests == 2
+                stats = service.get_cache_stats()
+                assert stats["stale_hits"] == 5
+
+                await service.get_projects()
+                assert service.get_cache_stats()["hits"] == 1
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_an_expired_copy_is_served_while_upstream_fails():
+    async def scenario():
+        async with stub_brandwatch() as (url, stub):
+            service = make_service(url)
+            service.cache_ttls["projects"] = 0
+            service.cache_stale_ttl = 0
+            service.retry_attempts = 1
+            try:
+                first = await service.get_projects()
+                stub.args.error_rate = 1
+                assert await service.get_projects() == first
+                assert service.get_cache_stats()["fallback_hits"] == 1
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_invalidating_a_project_drops_only_its_entries():
+    async def scenario():
+        async with stub_brandwatch() as (url, stub):
+            service = make_service(url)
+            try:
+                await service.get_projects()
+                await service.get_project(1)
+                await service.get_queries(1)
+                await service.get_queries(12)
+                assert stub.requests == 4
+
+                # projects/1 and projects/1/queries/summary, not projects/12/...
+                assert service.invalidate_cache(1) == 2
+                await service.get_projects()
+                await service.get_queries(12)
+                assert stub.requests == 4
+                await service.get_queries(1)
+                assert stub.requests == 5
+
+                assert service.invalidate_cache() == 3
+                assert service.get_cache_stats()["entries"] == 0
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_identical_requests_share_one_upstream_call():
+    async def scenario():
+        async with stub_brandwatch("--latency", "0.05") as (url, stub):
+            service = make_service(url)
+            try:
+                results = await asyncio.gather(
+                    *(service.get_mentions(1, query_id=7, limit=50) for _ in range(10)),
+                    *(service.get_mentions(1, query_id=8, limit=50) for _ in range(5))
+                )
+                assert all(mentions == results[0] for mentions in results[:10])
+                # One call per distinct request, plus the /_stats call itself
+                assert (await stub_stats(url))["requests"] == 3
+                coalescing = service.get_cache_stats()["coalescing"]
+                assert coalescing["started"] == 2
+                assert coalescing["shared"] == 13
+                assert coalescing["in_flight"] == 0
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_a_failed_shared_call_reaches_every_waiter_and_is_not_kept():
+    async def scenario():
+        async with stub_brandwatch("--latency", "0.05", "--error-rate", "1") as (url, stub):
+            service = make_service(url)
+            service.retry_attempts = 1
+            try:
+                results = await asyncio.gather(*(service.get_projects() for _ in range(5)), return_exceptions=True)
+                assert all(isinstance(result, BrandwatchAPIError) for result in results)
+                assert stub.requests == 1
+
+                stub.args.error_rate = 0
+                assert len(await service.get_projects()) == 20
+                assert stub.requests == 2
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,122 @@
+import asyncio
+import gzip
+from typing import Tuple
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from app.core import serialization
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.serialization import negotiate_columnar
+from tests.helpers import brandwatch_api
+
+BODY = b'{"mentions": [' + b",".join(b'{"id": %d, "content": "same words again"}' % i for i in range(200)) + b"]}"
+
+DECODERS = {
+    "gzip": lambda: gzip.decompress,
+    "br": lambda: pytest.importorskip("brotli").decompress,
+    "zstd": lambda: pytest.importorskip("zstandard").ZstdDecompressor().decompressobj().decompress
+}
+
+
+def make_app() -> CompressionMiddleware:
+    async def stream(request):
+        async def chunks():
+            for _ in range(3):
+                yield BODY
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    app = Starlette(routes=[
+        Route("/json", lambda request: Response(BODY, media_type="application/json")),
+        Route("/small", lambda request: Response(b'{"ok": true}', media_type="application/json")),
+        Route("/png", lambda request: Response(BODY, media_type="image/png")),
+        Route("/stream", stream)
+    ])
+    return CompressionMiddleware(app, min_size=500)
+
+
+async def fetch(path: str, accept_encoding: str) -> Tuple[httpx.Headers, bytes]:
+    """Response headers and the body as sent, before httpx decodes it"""
+    transport = httpx.ASGITransport(app=make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+            return response.headers, b"".join([chunk async for chunk in response.aiter_raw()])
+
+
+def test_choose_encoding_follows_q_values_then_server_preference():
+    offered = ["zstd", "br", "gzip"]
+    assert choose_encoding("gzip, br, zstd", offered) == "zstd"
+    assert choose_encoding("gzip;q=1, br;q=0.5", offered) == "gzip"
+    assert choose_encoding("br;q=0.8, *;q=0.5", offered) == "br"
+    assert choose_encoding("*", offered) == "zstd"
+    assert choose_encoding("gzip;q=0, identity", offered) is None
+    assert choose_encoding("", offered) is None
+    assert choose_encoding("br", ["gzip"]) is None
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+def test_bodies_are_compressed_with_the_accepted_coding(encoding):
+    decompress = DECODERS[encoding]()
+    headers, body = asyncio.run(fetch("/json", encoding))
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert decompress(body) == BODY
+
+
+def test_streamed_bodies_are_compressed_per_chunk():
+    headers, body = asyncio.run(fetch("/stream", "gzip"))
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == BODY * 3
+
+
+def test_small_unaccepted_and_binary_bodies_pass_through():
+    for path, accept_encoding, expected in (
+        ("/small", "gzip", b'{"ok": true}'), ("/json", "identity", BODY), ("/png", "gzip", BODY)
+    ):
+        headers, body = asyncio.run(fetch(path, accept_encoding))
+        assert "content-encoding" not in headers
+        assert "vary" not in headers
+        assert body == expected
+
+
+def test_columnar_formats_need_to_be_named_and_rank_with_json(monkeypatch):
+    monkeypatch.setattr(serialization, "available_columnar_formats", lambda: dict(serialization.COLUMNAR_MEDIA_TYPES))
+    assert negotiate_columnar("application/vnd.apache.arrow.stream") == "arrow"
+    assert negotiate_columnar("application/x-msgpack, application/json;q=0.5") == "msgpack"
+    assert negotiate_columnar("application/msgpack;q=0.5, application/vnd.apache.arrow.stream;q=0.9") == "arrow"
+    # JSON wins ties it ranks higher, and wildcards only ever mean JSON
+    assert negotiate_columnar("application/msgpack;q=0.5, application/json") is None
+    assert negotiate_columnar("*/*") is None
+    assert negotiate_columnar(None) is None
+
+    monkeypatch.setattr(serialization, "available_columnar_formats", lambda: {})
+    assert negotiate_columnar("application/vnd.apache.arrow.stream") is None
+
+
+@pytest.mark.parametrize("media_type", ["application/msgpack", "application/vnd.apache.arrow.stream"])
+def test_mentions_answer_in_the_negotiated_format(media_type):
+    name = serialization._COLUMNAR_ALIASES[media_type]
+
+    async def scenario():
+        async with brandwatch_api("--mentions", "20") as (client, stub, service):
+            response = await client.get(
+                "/projects/1/mentions", params={"query_id": 7, "limit": 20}, headers={"Accept": media_type}
+            )
+            assert response.status_code == 200
+            assert "Accept" in response.headers["vary"]
+            if name not in serialization.available_columnar_formats():
+                # Not installed: the client gets JSON
+                assert response.headers["content-type"] == "application/json"
+                assert len(response.json()) == 20
+            elif name == "msgpack":
+                assert response.headers["content-type"] == media_type
+                columns = serialization.msgpack.unpackb(response.content)
+                assert len(columns["id"]) == 20
+            else:
+                assert response.headers["content-type"] == media_type
+                table = serialization.pyarrow.ipc.open_stream(response.content).read_all()
+                assert table.num_rows == 20
+
+    asyncio.run(scenario())
@@ -0,0 +1,23 @@
+import asyncio
+import pytest
+from app import main
+
+
+def test_startup_fails_without_a_secret_key(monkeypatch):
+    monkeypatch.setattr(main.settings, "secret_key", None)
+
+    async def scenario():
+        async with main.app.router.lifespan_context(main.app):
+            pass
+
+    with pytest.raises(RuntimeError, match="SECRET_KEY"):
+        asyncio.run(scenario())
+    assert main.brandwatch.brandwatch_controller.service._session is None
+
+
+def test_startup_does_not_touch_the_database():
+    async def scenario():
+        async with main.app.router.lifespan_context(main.app):
+            assert main.brandwatch.brandwatch_controller.service.store._tables_ready is False
+
+    asyncio.run(scenario())
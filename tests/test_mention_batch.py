@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from app.core.serialization import dumps
+from app.models.brandwatch import BrandwatchMention
+from app.models.mention_batch import MentionBatch
+from app.models.validation import parse_models, validate_rows
+from app.presenters.brandwatch_presenter import MENTION_FIELDS, BrandwatchPresenter
+from tests.helpers import brandwatch_api, make_service, stub_brandwatch
+
+ROWS = [
+    {
+        "id": 1, "content": "naive", "author": "ann", "source": "twitter", "timestamp": "2024-01-01T10:00:00",
+        "queryId": 7, "projectId": 1, "language": "en", "sentiment": "positive", "reach": 10, "engagement": 1
+    },
+    {
+        "id": 2, "content": "utc", "author": "bob", "source": "news", "timestamp": "2024-01-01T10:00:00.250000Z",
+        "queryId": 7, "projectId": 1, "language": "de", "sentiment": None, "reach": None, "engagement": 3
+    },
+    {
+        "id": 3, "content": "east", "author": "ann", "source": "twitter", "timestamp": "2024-01-01T10:00:00+02:00",
+        "queryId": 7, "projectId": 1, "language": "en", "sentiment": "negative", "reach": 5, "engagement": None
+    },
+    {
+        "id": 4, "content": "west", "author": "cy", "source": "blog", "timestamp": "2023-12-31T23:30:00-05:30",
+        "queryId": 8, "projectId": 1, "language": "fr", "sentiment": "neutral", "reach": 0, "engagement": 0
+    }
+]
+
+
+def test_batch_output_matches_the_model_path_including_utc_offsets():
+    presenter = BrandwatchPresenter()
+    batch = MentionBatch.from_records(ROWS)
+    models = parse_models(BrandwatchMention, ROWS)
+    assert batch.isoformat_timestamps() == [
+        "2024-01-01T10:00:00", "2024-01-01T10:00:00.250000+00:00",
+        "2024-01-01T10:00:00+02:00", "2023-12-31T23:30:00-05:30"
+    ]
+    assert dumps(presenter.transform_batch(batch)) == dumps(presenter.transform_list(models))
+    fields = list(MENTION_FIELDS)
+    assert presenter.transform_batch(batch, fields) == presenter.transform_list(models, fields)
+
+
+def test_batch_pages_are_validated_unless_validation_is_off():
+    async def scenario():
+        async with stub_brandwatch("--mentions", "10") as (url, stub):
+            for mention in stub.mentions[:3]:
+                mention["reach"] = "many"
+            service = make_service(url)
+            try:
+                with pytest.raises(ValidationError):
+                    await service.get_mention_batch(1, query_id=7, limit=10)
+                with pytest.raises(ValidationError):
+                    await service.get_mentions(1, query_id=7, limit=10, refresh=True)
+
+                service.validate_responses = False
+                service.invalidate_cache()
+                with pytest.raises(ValueError):
+                    # Unvalidated, the bad value only fails once it is forced into a column
+                    await service.get_mention_batch(1, query_id=7, limit=10)
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_validated_rows_keep_their_offsets():
+    rows = validate_rows(BrandwatchMention, ROWS)
+    assert MentionBatch.from_records(rows).isoformat_timestamps() == MentionBatch.from_records(ROWS).isoformat_timestamps()
+
+
+def test_masks_and_take_select_rows_without_leaving_columns():
+    batch = MentionBatch.from_records(ROWS)
+    assert batch.equals("author", "ann").tolist() == [True, False, True, False]
+    assert not batch.equals("author", "nobody").any()
+    # 2024-01-01T10:00:00+02:00 is 08:00 UTC; naive bounds are UTC
+    window = batch.between(datetime(2024, 1, 1, 8), datetime(2024, 1, 1, 10))
+    assert window.tolist() == [True, False, True, False]
+
+    selected = batch.take(batch.equals("author", "ann") & window)
+    assert selected.ids.tolist() == [1, 3]
+    assert selected.decode("sentiment") == ["positive", "negative"]
+    assert selected.isoformat_timestamps() == ["2024-01-01T10:00:00", "2024-01-01T10:00:00+02:00"]
+    assert batch.take(np.array([3, 0])).ids.tolist() == [4, 1]
+
+
+def test_round_trips_through_models_and_columns():
+    batch = MentionBatch.from_records(ROWS)
+    models = parse_models(BrandwatchMention, ROWS)
+    assert batch.to_mentions() == models
+    assert [m.timestamp for m in MentionBatch.from_mentions(models).to_mentions()] == [m.timestamp for m in models]
+
+    columns = batch.to_columns()
+    assert list(columns) == list(MentionBatch.COLUMNS)
+    assert columns["timestamp"] == [m.timestamp.isoformat() for m in models]
+    assert columns["reach"] == [10, None, 5, 0]
+    assert batch.to_columns(["id", "sentiment"]) == {"id": [1, 2, 3, 4], "sentiment": ["positive", None, "negative", "neutral"]}
+
+
+def test_arrow_stream_carries_the_same_columns():
+    pa = pytest.importorskip("pyarrow")
+    batch = MentionBatch.from_records(ROWS)
+    models = parse_models(BrandwatchMention, ROWS)
+    columns = batch.to_columns()
+    table = pa.ipc.open_stream(batch.to_arrow()).read_all()
+    assert table.column_names == list(MentionBatch.COLUMNS)
+    assert table.column("id").to_pylist() == columns["id"]
+    assert table.column("author").to_pylist() == columns["author"]
+    assert table.column("engagement").to_pylist() == columns["engagement"]
+    assert table.column("timestamp").to_pylist() == [m.timestamp.astimezone(timezone.utc) if m.timestamp.tzinfo
+                                                     else m.timestamp.replace(tzinfo=timezone.utc) for m in models]
+
+
+def test_batches_false_builds_models_for_one_request():
+    async def scenario():
+        async with brandwatch_api("--mentions", "50") as (client, stub, service):
+            params = {"query_id": 7, "limit": 50}
+            batched = await client.get("/projects/1/mentions", params=params)
+            modelled = await client.get("/projects/1/mentions", params={**params, "batches": "false"})
+            assert batched.status_code == modelled.status_code == 200
+            assert len(batched.json()) == 50
+            assert modelled.content == batched.content
+
+    asyncio.run(scenario())
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.brandwatch_service import BrandwatchService
+from app.core.mention_store import MentionStore
+from app.models.brandwatch import BrandwatchMention
+from tests.helpers import brandwatch_api, stub_brandwatch
+
+MEMORY_URL = "sqlite+aiosqlite:///:memory:"
+
+
+def make_store():
+    engine = create_async_engine(MEMORY_URL)
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    return MentionStore(factory), engine
+
+
+def mention(mention_id: int, timestamp: str) -> BrandwatchMention:
+    return BrandwatchMention(
+        id=mention_id, content=f"mention {mention_id}", author="author", source="twitter",
+        timestamp=timestamp, queryId=7, projectId=1, language="en", sentiment="positive",
+        reach=10, engagement=1
+    )
+
+
+def test_store_creates_tables_on_first_use_and_tracks_coverage():
+    async def scenario():
+        store, engine = make_store()
+        try:
+            assert await store.get_sync_state(1, 7) is None
+            await store.save_mentions(1, 7, [mention(1, "2024-01-01T10:00:00"), mention(2, "2024-01-02T10:00:00")])
+            # Saving again updates rows in place
+            await store.save_mentions(1, 7, [mention(2, "2024-01-02T11:00:00+01:00")])
+            assert not await store.covers(1, 7, datetime(2024, 1, 1), datetime(2024, 1, 3))
+
+            await store.record_sync(1, 7, datetime(2024, 1, 1), datetime(2024, 1, 3), datetime(2024, 1, 2, 10))
+            assert await store.covers(1, 7, datetime(2024, 1, 1, 12), datetime(2024, 1, 3))
+            assert not await store.covers(1, 7, datetime(2023, 12, 31), datetime(2024, 1, 2))
+
+            mentions = await store.get_mentions(1, 7, datetime(2024, 1, 1), datetime(2024, 1, 3))
+            assert [m.id for m in mentions] == [2, 1]
+            assert mentions[0].timestamp == datetime(2024, 1, 2, 10)
+            batch = await store.get_mention_batch(1, 7, datetime(2024, 1, 1), datetime(2024, 1, 3), limit=1)
+            assert batch.ids.tolist() == [2]
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_sync_fetches_past_high_water_mark_and_serves_covered_ranges_locally():
+    async def scenario():
+        async with stub_brandwatch("--mentions", "2500") as (url, stub):
+            store, engine = make_store()
+            service = BrandwatchService()
+            service.api_url = url
+            service.store = store
+            try:
+                first = await service.sync_mentions(1, 7, start_date=datetime(2024, 1, 1))
+                newest = max(stub.mention_times)
+                assert first["fetched"] == 2500
+                assert first["high_water_mark"] == newest
+                calls = stub.requests
+
+                # A range inside the synced one never reaches Brandwatch
+                start, end = datetime(2024, 2, 1), datetime(2024, 2, 3)
+                mentions = await service.get_mentions(1, query_id=7, start_date=start, end_date=end, limit=1000)
+                batch = await service.get_mention_batch(1, query_id=7, start_date=start, end_date=end, limit=1000)
+                expected = [t for t in stub.mention_times if start <= datetime.fromisoformat(t) <= end]
+                assert stub.requests == calls
+                assert len(mentions) == len(expected) > 0
+                assert [m.timestamp.isoformat() for m in mentions] == sorted(expected, reverse=True)
+                assert batch.ids.tolist() == [m.id for m in mentions]
+
+                # The next sync only asks for mentions from the high-water mark on
+                second = await service.sync_mentions(1, 7)
+                assert stub.requests == calls + 1
+                assert second["fetched"] == stub.mention_times.count(newest)
+                assert second["high_water_mark"] == newest
+                assert (await service.get_sync_state(1, 7))["synced_from"] == "2024-01-01T00:00:00"
+
+                # Before the synced range, Brandwatch is asked as usual
+                await service.get_mentions(1, query_id=7, start_date=datetime(2023, 12, 1), end_date=datetime(2023, 12, 2))
+                assert stub.requests == calls + 2
+            finally:
+                await service.close()
+                await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_store_failures_map_to_503_while_reads_fall_back_to_brandwatch():
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite:////nonexistent/directory/mentions.db")
+        factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with brandwatch_api("--mentions", "100") as (client, stub, service):
+            service.store = MentionStore(factory)
+            try:
+                sync = await client.post("/projects/1/queries/7/sync")
+                assert sync.status_code == 503
+                assert sync.json()["detail"] == "Local mention store is unavailable"
+                state = await client.get("/projects/1/queries/7/sync")
+                assert state.status_code == 503
+
+                mentions = await client.get("/projects/1/mentions", params={
+                    "query_id": 7, "start_date": "2024-01-01T00:00:00", "end_date": "2024-04-01T00:00:00"
+                })
+                assert mentions.status_code == 200
+                assert len(mentions.json()) == 100
+            finally:
+                await engine.dispose()
+
+    asyncio.run(scenario())
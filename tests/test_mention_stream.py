@@ -0,0 +1,61 @@
+import asyncio
+import json
+from tests.helpers import brandwatch_api
+
+
+def test_ndjson_stream_walks_every_page_one_mention_per_line():
+    async def scenario():
+        async with brandwatch_api("--mentions", "250") as (client, stub, service):
+            response = await client.get("/projects/1/mentions/stream", params={"query_id": 7, "page_size": 100})
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            assert response.text.endswith("\n")
+            lines = response.text.splitlines()
+            mentions = [json.loads(line) for line in lines]
+            assert len(mentions) == 250
+            assert [m["timestamp"] for m in mentions] == stub.mention_times
+            # One request per page of 100, following nextCursor
+            assert stub.requests == 3
+
+    asyncio.run(scenario())
+
+
+def test_json_stream_is_one_array_and_stops_at_max_results():
+    async def scenario():
+        async with brandwatch_api("--mentions", "250") as (client, stub, service):
+            response = await client.get(
+                "/projects/1/mentions/stream",
+                params={"query_id": 7, "page_size": 100, "max_results": 150, "format": "json"}
+            )
+            assert response.status_code == 200
+            mentions = response.json()
+            assert len(mentions) == 150
+            # The third page is never requested
+            assert stub.requests == 2
+
+    asyncio.run(scenario())
+
+
+def test_a_failure_after_the_first_page_ends_the_stream_with_an_error_line():
+    async def scenario():
+        async with brandwatch_api("--mentions", "250", "--fail-after", "1") as (client, stub, service):
+            service.retry_attempts = 1
+            response = await client.get("/projects/1/mentions/stream", params={"query_id": 7, "page_size": 100})
+            assert response.status_code == 200
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert len(lines) == 101
+            assert lines[-1] == {"error": 'Brandwatch API error: {"error": "injected failure"}'}
+            assert all("id" in mention for mention in lines[:100])
+
+    asyncio.run(scenario())
+
+
+def test_a_failure_on_the_first_page_maps_to_a_status_code():
+    async def scenario():
+        async with brandwatch_api("--error-rate", "1") as (client, stub, service):
+            service.retry_attempts = 1
+            response = await client.get("/projects/1/mentions/stream", params={"query_id": 7})
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "1"
+
+    asyncio.run(scenario())
@@ -0,0 +1,32 @@
+import asyncio
+import httpx
+from fastapi import APIRouter, FastAPI
+from app.core.metrics import HTTP_REQUEST_SECONDS, MetricsMiddleware, registry
+
+
+def test_requests_are_labelled_with_the_route_template(monkeypatch):
+    monkeypatch.setattr(registry, "enabled", True)
+    router = APIRouter()
+
+    @router.post("/projects/{project_id}/queries/{query_id}/sync")
+    async def sync(project_id: int, query_id: int):
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/brandwatch")
+    app.add_middleware(MetricsMiddleware)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Equal parameter values must not be mistaken for each other
+            assert (await client.post("/api/brandwatch/projects/1/queries/1/sync")).status_code == 200
+            assert (await client.post("/api/brandwatch/projects/1/queries/2/sync")).status_code == 200
+            assert (await client.get("/api/brandwatch/nowhere/1")).status_code == 404
+
+    asyncio.run(scenario())
+    template = "/api/brandwatch/projects/{project_id}/queries/{query_id}/sync"
+    counts, _ = HTTP_REQUEST_SECONDS._values[("POST", template, 200)]
+    assert sum(counts) == 2
+    assert ("GET", "unmatched", 404) in HTTP_REQUEST_SECONDS._values
+    assert not any("/1" in labels[1] for labels in HTTP_REQUEST_SECONDS._values)
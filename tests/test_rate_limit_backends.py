@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from app.core.rate_limit_backends import RedisRateLimitBackend, SQLiteRateLimitBackend
+from app.core.rate_limiter import AsyncRateLimiter, RateLimitTimeout
+from benchmarks.local_redis import LocalRedis, SortedSetStore, connect_local_redis, serve_local_redis
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_backend(request, tmp_path):
+    """Factory for backends that all share one budget, as separate workers would"""
+    store = SortedSetStore()
+    backends = []
+
+    def make():
+        if request.param == "sqlite":
+            backend = SQLiteRateLimitBackend(str(tmp_path / "rate_limit.db"))
+        else:
+            backend = RedisRateLimitBackend(LocalRedis(store))
+        backends.append(backend)
+        return backend
+
+    yield make
+    for backend in backends:
+        asyncio.run(backend.close())
+
+
+def test_limiters_on_one_backend_share_the_budget(make_backend):
+    async def scenario():
+        first = AsyncRateLimiter(3, 60, backend=make_backend())
+        second = AsyncRateLimiter(3, 60, backend=make_backend())
+        await first.acquire()
+        await first.acquire()
+        await second.acquire()
+        assert await first.remaining() == 0
+        assert await second.remaining() == 0
+        with pytest.raises(RateLimitTimeout):
+            await second.acquire(timeout=0.05)
+
+    asyncio.run(scenario())
+
+
+def test_waiters_are_served_in_arrival_order(make_backend):
+    async def scenario():
+        limiter = AsyncRateLimiter(1, 0.05, backend=make_backend())
+        await limiter.acquire()
+        order = []
+
+        async def caller(number: int):
+            await limiter.acquire()
+            order.append(number)
+
+        tasks = []
+        for number in range(3):
+            tasks.append(asyncio.create_task(caller(number)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2]
+
+    asyncio.run(scenario())
+
+
+def test_calls_expire_out_of_the_window_and_refunds_free_a_slot(make_backend):
+    async def scenario():
+        limiter = AsyncRateLimiter(2, 0.2, backend=make_backend())
+        token = await limiter.acquire()
+        await limiter.acquire()
+        used, reset_in = await limiter.backend.usage(2, 0.2)
+        assert used == 2
+        assert 0 < reset_in <= 0.2
+
+        await limiter.refund(token)
+        assert await limiter.remaining() == 1
+        await asyncio.sleep(0.25)
+        assert await limiter.remaining() == 2
+
+    asyncio.run(scenario())
+
+
+def test_local_redis_is_shared_through_its_manager():
+    manager = serve_local_redis()
+    try:
+        async def scenario():
+            first = RedisRateLimitBackend(connect_local_redis(manager.address), key="shared")
+            second = RedisRateLimitBackend(connect_local_redis(manager.address), key="shared")
+            assert (await first.reserve(1, 60))[0] == 0
+            wait, token = await second.reserve(1, 60)
+            assert wait > 0 and token is None
+
+        asyncio.run(scenario())
+    finally:
+        manager.shutdown()
@@ -0,0 +1,82 @@
+import asyncio
+import time
+import pytest
+from app.core.rate_limiter import AsyncRateLimiter, RateLimitTimeout
+
+
+def test_waiters_are_served_in_arrival_order():
+    async def scenario():
+        limiter = AsyncRateLimiter(1, 0.05)
+        await limiter.acquire()
+        order = []
+
+        async def caller(number: int):
+            await limiter.acquire()
+            order.append(number)
+
+        tasks = []
+        for number in range(4):
+            tasks.append(asyncio.create_task(caller(number)))
+            await asyncio.sleep(0)  # let each caller queue before the next one starts
+        assert limiter.queue_depth == 4
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2, 3]
+        assert limiter.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_slots_free_up_as_calls_leave_the_window():
+    async def scenario():
+        limiter = AsyncRateLimiter(2, 0.2)
+        await limiter.acquire()
+        await limiter.acquire()
+        assert await limiter.remaining() == 0
+        status = await limiter.status()
+        assert status["used"] == 2
+        assert 0 < status["reset_in_seconds"] <= 0.2
+
+        started = time.monotonic()
+        await limiter.acquire()
+        assert 0.15 <= time.monotonic() - started < 0.5
+        # Both earlier calls expired together, so one slot is left beside the new call
+        assert await limiter.remaining() == 1
+
+    asyncio.run(scenario())
+
+
+def test_refund_returns_the_slot():
+    async def scenario():
+        limiter = AsyncRateLimiter(1, 60)
+        token = await limiter.acquire()
+        await limiter.refund(token)
+        assert await limiter.remaining() == 1
+
+    asyncio.run(scenario())
+
+
+def test_waiting_past_the_timeout_raises():
+    async def scenario():
+        limiter = AsyncRateLimiter(1, 60)
+        await limiter.acquire()
+        started = time.monotonic()
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire(timeout=0.05)
+        # A slot that cannot free up before the deadline fails at once instead of sleeping
+        assert time.monotonic() - started < 0.05
+        assert limiter.queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_timeout_while_queued_behind_other_callers():
+    async def scenario():
+        limiter = AsyncRateLimiter(1, 0.3)
+        await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire(timeout=0.1)
+        await first
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+import asyncio
+from app.core.rate_limiter import AsyncRateLimiter
+from app.core.scheduler import PrefetchScheduler
+from tests.helpers import make_service, stub_brandwatch
+
+
+def test_prefetch_stops_at_its_budget_share_in_demand_order():
+    async def scenario():
+        async with stub_brandwatch("--mentions", "50") as (url, stub):
+            service = make_service(url)
+            service.rate_limiter = AsyncRateLimiter(30, 600)
+            scheduler = PrefetchScheduler(service)
+            scheduler.budget_share = 0.5
+            service.project_hits.update({5: 10, 3: 4, 12: 1})
+            service.query_hits.update({(5, 7): 3})
+            try:
+                await scheduler.run_cycle()
+                # Jobs run while more than 15 of the 30 calls are left
+                assert stub.requests == 15
+                assert await service.rate_limiter.remaining() == 15
+                assert scheduler.last_status == "budget limited"
+
+                jobs = list(scheduler.jobs.values())
+                assert [job["name"] for job in jobs[:4]] == [
+                    "projects/summary", "projects/5/queries/summary",
+                    "projects/3/queries/summary", "projects/12/queries/summary"
+                ]
+                assert sum(job["status"] == "ok" for job in jobs) == 15
+                assert jobs[15]["status"] == "skipped: budget reserved for interactive requests"
+                # Demand decays between cycles
+                assert dict(service.project_hits) == {5: 5, 3: 2}
+                assert dict(service.query_hits) == {(5, 7): 1}
+
+                # With the whole budget every project and the hot query are refreshed
+                service.rate_limiter = AsyncRateLimiter(30, 600)
+                scheduler.budget_share = 1
+                await scheduler.run_cycle()
+                assert scheduler.last_status == "completed"
+                assert stub.requests == 15 + 1 + 20 + 1
+                assert scheduler.jobs["projects/5/mentions?queryId=7"]["status"] == "ok"
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
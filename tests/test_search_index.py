@@ -0,0 +1,25 @@
+from app.core.search_index import MentionSearchIndex
+from app.models.brandwatch import BrandwatchMention
+
+
+def mention(mention_id: int) -> BrandwatchMention:
+    return BrandwatchMention(
+        id=mention_id, content=f"launch day mention {mention_id}", author="author", source="twitter",
+        timestamp="2024-01-01T10:00:00", queryId=7, projectId=1, language="en", sentiment=None,
+        reach=None, engagement=None
+    )
+
+
+def test_segments_are_evicted_once_the_byte_budget_is_exceeded():
+    index = MentionSearchIndex(segment_size=10)
+    index.add(mention(i) for i in range(10))
+    segment_bytes = index.stats()["bytes"]
+    index.max_bytes = segment_bytes * 5 // 2
+
+    index.add(mention(i) for i in range(10, 30))
+    stats = index.stats()
+    assert stats["evicted_segments"] == 1
+    assert stats["mentions"] == 20
+    assert stats["bytes"] <= index.max_bytes
+    assert index.search(1, "launch")["total"] == 20
+    assert index.search(1, "0")["total"] == 0
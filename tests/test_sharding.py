@@ -0,0 +1,68 @@
+import asyncio
+import math
+from datetime import datetime
+from tests.helpers import make_service, stub_brandwatch
+
+START, END = datetime(2024, 1, 1), datetime(2024, 4, 1)
+
+
+def count_between(times, start: datetime, end: datetime) -> int:
+    """Stub mentions with start <= timestamp <= end, as the stub selects them"""
+    return sum(start <= datetime.fromisoformat(t) <= end for t in times)
+
+
+def test_shards_merge_into_one_ascending_copy_of_every_mention():
+    async def scenario():
+        async with stub_brandwatch("--mentions", "2000") as (url, stub):
+            service = make_service(url)
+            try:
+                mentions = await service.fetch_mentions_sharded(1, START, END, query_id=7, shards=4, page_size=1000)
+                assert [m.timestamp.isoformat() for m in mentions] == stub.mention_times
+                assert len({m.id for m in mentions}) == 2000
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_mentions_on_a_shard_edge_are_kept_once():
+    async def scenario():
+        async with stub_brandwatch("--mentions", "500") as (url, stub):
+            service = make_service(url)
+            try:
+                # Pick the range so the edge between the two shards is exactly a mention's timestamp
+                start = datetime.fromisoformat(stub.mention_times[0])
+                edge = datetime.fromisoformat(stub.mention_times[250])
+                end = edge + (edge - start)
+                mentions = await service.fetch_mentions_sharded(1, start, end, query_id=7, shards=2)
+                expected = count_between(stub.mention_times, start, end)
+                assert len(mentions) == expected
+                assert len({m.id for m in mentions}) == expected
+                assert sum(m.timestamp == edge for m in mentions) == stub.mention_times.count(stub.mention_times[250])
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
+
+
+def test_a_busy_shard_is_split_and_its_probe_page_reused():
+    async def scenario():
+        async with stub_brandwatch("--mentions", "2000") as (url, stub):
+            service = make_service(url)
+            service.shard_target = 200
+            service.shard_max_depth = 1
+            try:
+                mentions = await service.fetch_mentions_sharded(1, START, END, query_id=7, shards=1, page_size=250)
+                assert [m.timestamp.isoformat() for m in mentions] == stub.mention_times
+
+                # The probe page covers the first 250 mentions; the first half is only fetched from the
+                # probe's last timestamp on, and the second half in full
+                covered_until = datetime.fromisoformat(stub.mention_times[249])
+                middle = START + (END - START) / 2
+                first_half = count_between(stub.mention_times, covered_until, middle)
+                second_half = count_between(stub.mention_times, middle, END)
+                assert stub.requests == 1 + math.ceil(first_half / 250) + math.ceil(second_half / 250)
+            finally:
+                await service.close()
+
+    asyncio.run(scenario())
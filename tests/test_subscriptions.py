@@ -0,0 +1,61 @@
+import asyncio
+from app.core.rate_limiter import AsyncRateLimiter
+from app.core.subscriptions import MentionPoller, SubscriptionHub
+
+
+class FakeService:
+    """Upstream with pages_per_poll full pages of new mentions; each page read takes a limiter slot"""
+
+    def __init__(self, limit: int = 30, window: float = 600, pages_per_poll: int = 10):
+        self.rate_limiter = AsyncRateLimiter(limit, window)
+        self.pages_per_poll = pages_per_poll
+        self.polls = 0
+        self.pages = 0
+
+    async def fetch_new_mention_rows(self, project_id, query_id, since, page_size=1000, max_pages=5):
+        self.polls += 1
+        for _ in range(min(max_pages, self.pages_per_poll)):
+            await self.rate_limiter.acquire()
+            self.pages += 1
+        return []
+
+
+def test_default_pollers_fit_inside_the_rate_limit():
+    hub = SubscriptionHub(FakeService())
+    calls_per_window = hub.max_pollers * hub.max_pages * 600 / hub.poll_interval
+    assert calls_per_window <= 30 * hub.budget_share
+
+
+def test_interval_is_stretched_to_the_budget_share():
+    hub = SubscriptionHub(FakeService())
+    hub.max_pollers = 10
+    # Ten pollers sharing 7.5 calls per 600 seconds poll at most every 800 seconds
+    assert hub._budgeted_interval(60) == 800
+    # ... or every 2400 seconds when each poll may read three pages
+    hub.max_pages = 3
+    assert hub._budgeted_interval(60) == 2400
+
+
+def test_a_poll_reads_at_most_max_pages():
+    async def scenario():
+        service = FakeService()
+        poller = MentionPoller(service, 1, 7, interval=60, lookback=0, max_pages=2)
+        await poller.poll()
+        assert service.pages == 2
+        assert await service.rate_limiter.remaining() == 28
+
+    asyncio.run(scenario())
+
+
+def test_poller_skips_ticks_once_the_budget_share_is_spent():
+    async def scenario():
+        service = FakeService(limit=4, window=600)
+        poller = MentionPoller(service, 1, 7, interval=0.01, lookback=0, budget_share=0.5)
+        poller.start()
+        await asyncio.sleep(0.2)
+        await poller.stop()
+        assert service.polls == 2
+        assert poller.skipped > 0
+        assert await service.rate_limiter.remaining() == 2
+
+    asyncio.run(scenario())
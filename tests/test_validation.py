@@ -0,0 +1,26 @@
+from datetime import datetime
+from app.models.brandwatch import BrandwatchMention
+from app.models.validation import parse_models
+
+ROWS = [
+    {
+        "id": i, "content": f"mention {i}", "author": "author", "source": "twitter",
+        "timestamp": f"2024-01-0{i}T10:00:00", "queryId": 7, "projectId": 1,
+        "language": "en", "sentiment": None, "reach": 10, "engagement": None
+    }
+    for i in range(1, 4)
+]
+
+
+def test_unvalidated_models_match_validated_ones():
+    validated = parse_models(BrandwatchMention, ROWS)
+    trusted = parse_models(BrandwatchMention, ROWS, validate=False)
+    assert trusted == validated
+    assert trusted[0].timestamp == datetime(2024, 1, 1, 10)
+
+
+def test_unvalidated_partial_models_carry_only_the_requested_fields():
+    trusted = parse_models(BrandwatchMention, ROWS, fields=["id", "timestamp"], validate=False)
+    assert [m.id for m in trusted] == [1, 2, 3]
+    assert trusted[2].timestamp == datetime(2024, 1, 3, 10)
+    assert trusted[0].model_fields_set == {"id", "timestamp"}